@@ -0,0 +1,198 @@
+import os
+import time
+import uuid
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal, Qt
+
+from FigureForge import figure_io
+
+RECOVERY_DIR = "recovery"
+
+# How often to check whether autosave has been turned on while it is off, in ms
+IDLE_INTERVAL = 60_000
+
+# How soon to retry an autosave that was interrupted by an edit, in ms
+RETRY_INTERVAL = 5_000
+
+
+class Autosaver(QObject):
+    """
+    Periodically saves every figure with unsaved changes to a recovery directory, so
+    that it can be recovered if FigureForge does not close properly.
+
+    Figures are pickled and written on a background thread, so that autosaving never
+    holds up the GUI. A figure that is edited or rendered while it is being pickled
+    is retried shortly after, rather than saved in a possibly inconsistent state.
+    Recovery files are removed once their figure is saved or closed, and when
+    FigureForge exits normally.
+
+    Attributes:
+        preferences (Preferences): The application preferences.
+        figure_managers (list): The open FigureManagers, shared with the window.
+        directory (str): The directory recovery files are written to.
+    """
+
+    _finished = Signal(object, bool)
+
+    def __init__(self, preferences, figure_managers, parent=None) -> None:
+        """
+        Initializes a new instance of the Autosaver class.
+
+        Args:
+            preferences (Preferences): The application preferences.
+            figure_managers (list): The open FigureManagers. The list is read on
+                every autosave, so figures opened later are autosaved too.
+            parent (QObject): The parent object.
+        """
+        super().__init__(parent)
+        self.preferences = preferences
+        self.figure_managers = figure_managers
+        self.directory = os.path.join(preferences.config_dir, RECOVERY_DIR)
+        self._files = {}
+        self._saved = {}
+        self._thread = None
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.autosave)
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    def start(self) -> None:
+        """
+        Starts autosaving at the interval in the autosave_interval preference.
+        """
+        self._schedule()
+
+    def autosave(self) -> None:
+        """
+        Starts writing a recovery file for every figure changed since it was last
+        autosaved, and removes those of figures that have been saved since.
+        """
+        self._schedule()
+        if not self.preferences.get("autosave_interval"):
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        jobs = []
+        for fm in self.figure_managers:
+            if not fm.unsaved_changes:
+                self.discard(fm)
+            elif self._saved.get(fm) != fm.revision:
+                metadata = {"file_name": fm.file_name, "time": time.time()}
+                jobs.append((fm, fm.revision, self._file_name(fm), metadata))
+        if jobs:
+            self._thread = threading.Thread(target=self._run, args=(jobs,), daemon=True)
+            self._thread.start()
+
+    def discard(self, fm) -> None:
+        """
+        Removes the recovery file of a figure, if it has one.
+
+        Args:
+            fm (FigureManager): The manager of the figure.
+        """
+        self._saved.pop(fm, None)
+        file_name = self._files.pop(fm, None)
+        if file_name is not None:
+            _remove(file_name)
+
+    def clear(self) -> None:
+        """
+        Waits for any autosave in progress, then removes every recovery file written
+        in this session. Called when FigureForge exits normally.
+        """
+        self._timer.stop()
+        if self._thread is not None:
+            self._thread.join()
+        for fm in list(self._files):
+            self.discard(fm)
+
+    def recoverable(self) -> list:
+        """
+        Returns the figures left in the recovery directory by earlier sessions.
+
+        Returns:
+            A list of (file name, metadata) tuples, oldest first. The metadata holds
+            the name the figure was last saved under, if any, and the time it was
+            autosaved.
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        own = set(self._files.values())
+        recovered = []
+        for name in os.listdir(self.directory):
+            file_name = os.path.join(self.directory, name)
+            if file_name in own or not name.endswith(figure_io.EXTENSION):
+                continue
+            try:
+                metadata = figure_io.read_manifest(file_name).get("metadata", {})
+            except (OSError, ValueError):
+                continue
+            recovered.append((file_name, metadata))
+        return sorted(recovered, key=lambda item: item[1].get("time", 0))
+
+    def discard_recoverable(self) -> None:
+        """
+        Removes every file in the recovery directory left by earlier sessions,
+        including partially written ones.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        own = set(self._files.values())
+        for name in os.listdir(self.directory):
+            file_name = os.path.join(self.directory, name)
+            if file_name not in own:
+                _remove(file_name)
+
+    def _schedule(self, interval=None) -> None:
+        if interval is None:
+            interval = self.preferences.get("autosave_interval")
+            interval = interval * 1000 if interval else IDLE_INTERVAL
+        self._timer.start(interval)
+
+    def _file_name(self, fm) -> str:
+        if fm not in self._files:
+            self._files[fm] = os.path.join(
+                self.directory, uuid.uuid4().hex + figure_io.EXTENSION
+            )
+        return self._files[fm]
+
+    def _run(self, jobs) -> None:
+        """
+        Snapshots and writes figures. Runs on the autosave thread.
+        """
+        saved = {}
+        interrupted = False
+        for fm, revision, file_name, metadata in jobs:
+            blocks = fm.snapshot()
+            if blocks is None:
+                interrupted = True
+                continue
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                figure_io.write_snapshot(blocks, file_name, metadata)
+            except OSError as e:
+                if self.preferences.get("debug"):
+                    print(f"Autosave to {file_name} failed: {e}")
+                continue
+            saved[fm] = (revision, file_name)
+        self._finished.emit(saved, interrupted)
+
+    def _on_finished(self, saved, interrupted) -> None:
+        for fm, (revision, file_name) in saved.items():
+            if self._files.get(fm) != file_name:
+                # The figure was saved or closed while it was being autosaved
+                _remove(file_name)
+                continue
+            self._saved[fm] = revision
+            if self.preferences.get("debug"):
+                print(f"Autosaved {fm.file_name or 'New Figure'} to {file_name}")
+        if interrupted and self.preferences.get("autosave_interval"):
+            self._schedule(min(RETRY_INTERVAL, self._timer.remainingTime()))
+
+
+def _remove(file_name) -> None:
+    try:
+        os.remove(file_name)
+    except OSError:
+        pass
@@ -0,0 +1,358 @@
+"""
+Exports figure files to images from the command line, without opening the GUI.
+
+    FigureForge-export figures/ "results/*.ffig" -f png -f pdf -d 150 -d 300
+
+Every .pkl, .ffig and .ffproj file in the given directories, and every file matching
+the given paths or glob patterns, is exported to each format at each DPI. Files are
+exported in parallel by a pool of worker processes, one file per task, and the time
+taken by each file, or why it failed, is printed as it finishes.
+
+Exports are written next to their figure file, or to the output directory, as
+`<name>.<format>`, or `<name>-<dpi>dpi.<format>` when exporting at several DPIs.
+The figures of a project bundle are numbered, as `<name>-<index>`. Figure files
+that would be exported to the same directory under the same name, such as
+`a/fig.ffig` and `b/fig.ffig` with --output-dir, are named by their paths relative
+to the directory they have in common instead, as `a-fig` and `b-fig`.
+
+With --cache, exports are kept in a cache, so that exporting a figure that has not
+changed since it was last exported with the same settings copies the earlier export
+instead of rendering it again.
+
+With --pdf, the figures are instead exported as the pages of one PDF, in the order
+of the files, loading and rendering one figure at a time to keep memory low.
+
+    FigureForge-export figures/ --pdf figures.pdf
+"""
+
+import os
+import sys
+import glob
+import time
+import argparse
+import traceback
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# The extensions of the figure files found in directories
+FIGURE_EXTENSIONS = (".pkl", ".ffig", ".ffproj")
+
+
+def main(argv=None) -> int:
+    """
+    Entry point of the FigureForge-export script.
+
+    Args:
+        argv (list): The command line arguments, or None to use sys.argv.
+
+    Returns:
+        The exit status: 0 if every file was exported, 1 if any failed, and 2 if
+        no figure files were found, or several would be exported under one name.
+    """
+    parser = argparse.ArgumentParser(
+        prog="FigureForge-export",
+        description="Export FigureForge figure files without opening the GUI.",
+    )
+    parser.add_argument(
+        "inputs",
+        nargs="+",
+        help="Figure files, directories of figure files, or glob patterns.",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="formats",
+        action="append",
+        help="A format to export to, such as png, pdf or svg. May be repeated. "
+        "Defaults to png.",
+    )
+    parser.add_argument(
+        "-d",
+        "--dpi",
+        dest="dpis",
+        type=float,
+        action="append",
+        help="A resolution to export at. May be repeated. Defaults to the DPI "
+        "of each figure.",
+    )
+    parser.add_argument(
+        "-o",
+        "--output-dir",
+        help="The directory to write exports to. Defaults to the directory of "
+        "each figure file.",
+    )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Also export the figure files in subdirectories of directories.",
+    )
+    parser.add_argument(
+        "--cache",
+        nargs="?",
+        const="",
+        metavar="DIR",
+        help="Reuse exports of figures that have not changed since they were last "
+        "exported. Exports are cached in DIR, or in the user cache directory.",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        metavar="MB",
+        help="The most the cache may take up, in MB. Defaults to 1024.",
+    )
+    parser.add_argument(
+        "--pdf",
+        metavar="FILE",
+        help="Export every figure as a page of one PDF instead, one figure at a "
+        "time. --format and --cache are not used, and --dpi is only used for "
+        "rasterized artists.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="The number of worker processes. Defaults to the number of CPUs.",
+    )
+    args = parser.parse_args(argv)
+
+    files = find_figure_files(args.inputs, args.recursive)
+    if not files:
+        print("No figure files found.", file=sys.stderr)
+        return 2
+    if args.pdf is not None:
+        return export_pdf(files, args.pdf, args.dpis[0] if args.dpis else None)
+    formats = args.formats or ["png"]
+    dpis = args.dpis or [None]
+    names = output_names(files, args.output_dir)
+    collisions = _collisions(names, args.output_dir)
+    if collisions:
+        print("Several figure files would be exported as:", file=sys.stderr)
+        for output, colliding in collisions.items():
+            print(f"  {output}: {', '.join(colliding)}", file=sys.stderr)
+        return 2
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+    cache = None
+    if args.cache is not None:
+        from FigureForge.export_cache import ExportCache
+
+        cache = ExportCache(args.cache or None, args.cache_size * 1024 * 1024)
+
+    failures = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(args.jobs, len(files))), initializer=_init_worker
+    ) as pool:
+        futures = {
+            pool.submit(
+                export_file, file, formats, dpis, args.output_dir, cache, names[file]
+            ): file
+            for file in files
+        }
+        for future in as_completed(futures):
+            file = futures[future]
+            try:
+                outputs, elapsed = future.result()
+            except Exception as e:
+                # The worker process itself failed, such as by running out of memory
+                outputs, elapsed = e, 0.0
+            if isinstance(outputs, (str, BaseException)):
+                failures += 1
+                print(f"FAILED {file} ({elapsed:.2f} s)\n{_indent(outputs)}")
+            else:
+                print(f"{elapsed:7.2f} s  {file} -> {', '.join(outputs)}")
+
+    print(
+        f"Exported {len(files) - failures} of {len(files)} figure files in "
+        f"{time.perf_counter() - start:.2f} s"
+        + (f", {failures} failed." if failures else ".")
+    )
+    return 1 if failures else 0
+
+
+def find_figure_files(inputs, recursive=False) -> list:
+    """
+    Returns the figure files named by command line inputs, without duplicates.
+
+    Args:
+        inputs (list): Figure files, directories, or glob patterns.
+        recursive (bool): Whether to search subdirectories of directories.
+    """
+    files = []
+    for pattern in inputs:
+        for path in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+            if os.path.isdir(path):
+                walk = os.walk(path) if recursive else [next(os.walk(path))]
+                for directory, _, names in walk:
+                    files.extend(
+                        os.path.join(directory, name)
+                        for name in sorted(names)
+                        if name.endswith(FIGURE_EXTENSIONS)
+                    )
+            elif os.path.isfile(path):
+                files.append(path)
+    return list(dict.fromkeys(os.path.normpath(file) for file in files))
+
+
+def output_names(files, output_dir=None) -> dict:
+    """
+    Returns the names to export figure files under, without an extension: the
+    name of each file, or for files that would be exported to the same directory
+    under the same name, their paths relative to the directory they have in
+    common, joined with dashes, and with their extension if that still does not
+    tell them apart.
+
+    Args:
+        files (list): The figure files.
+        output_dir (str): The directory the files are exported to, or None for the
+            directory of each file.
+
+    Returns:
+        The names by file.
+    """
+    names = {file: os.path.splitext(os.path.basename(file))[0] for file in files}
+    groups = defaultdict(list)
+    for file in files:
+        groups[_output_path(file, names[file], output_dir)].append(file)
+    for group in groups.values():
+        if len(group) == 1:
+            continue
+        paths = [os.path.abspath(file) for file in group]
+        common = os.path.commonpath([os.path.dirname(path) for path in paths])
+        relative = [os.path.relpath(path, common) for path in paths]
+        stems = [os.path.splitext(path)[0] for path in relative]
+        if len(set(map(os.path.normcase, stems))) < len(stems):
+            stems = [
+                f"{stem}-{extension[1:]}"
+                for stem, extension in map(os.path.splitext, relative)
+            ]
+        for file, stem in zip(group, stems):
+            names[file] = stem.replace(os.sep, "-")
+    return names
+
+
+def _output_path(file_name, name, output_dir=None) -> str:
+    """
+    Returns the path a figure file is exported to, without an extension, in the
+    form it is compared in.
+    """
+    directory = output_dir or os.path.dirname(file_name)
+    return os.path.normcase(os.path.abspath(os.path.join(directory, name)))
+
+
+def _collisions(names, output_dir=None) -> dict:
+    """
+    Returns the figure files that would still be exported under the same name,
+    by the path they would be exported to, without an extension.
+    """
+    files = defaultdict(list)
+    for file, name in names.items():
+        files[_output_path(file, name, output_dir)].append(file)
+    return {output: group for output, group in files.items() if len(group) > 1}
+
+
+def export_pdf(files, file_name, dpi=None) -> int:
+    """
+    Exports the figures of figure files as the pages of one PDF, in this process.
+
+    Args:
+        files (list): The figure files.
+        file_name (str): The PDF to write.
+        dpi (float): The resolution of rasterized artists, or None for the DPI of
+            each figure.
+
+    Returns:
+        The exit status: 0 if the PDF was written, and 1 if it failed.
+    """
+    from FigureForge import export
+
+    _init_worker()
+    start = time.perf_counter()
+    try:
+        export.export_pages(
+            export.iter_figure_files(files), file_name, dpi=dpi or "figure"
+        )
+    except Exception:
+        print(f"FAILED {file_name}\n{_indent(traceback.format_exc())}")
+        return 1
+    print(
+        f"Exported {len(files)} figure files to {file_name} in "
+        f"{time.perf_counter() - start:.2f} s."
+    )
+    return 0
+
+
+def export_file(
+    file_name, formats, dpis, output_dir=None, cache=None, name=None
+) -> tuple:
+    """
+    Exports the figures of a figure file to each format at each DPI. Runs in a
+    worker process.
+
+    Args:
+        file_name (str): The figure file.
+        formats (list): The formats to export to.
+        dpis (list): The resolutions to export at, or [None] for the figure's own.
+        output_dir (str): The directory to write to, or None for the directory of
+            the figure file.
+        cache (ExportCache): The cache to copy exports from, or add them to, if
+            given.
+        name (str): The name to export under, without an extension, or None for
+            the name of the figure file. See `output_names`.
+
+    Returns:
+        The names of the exported files and the time taken, or the traceback of
+        the error and the time taken if it failed.
+    """
+    from FigureForge import figure_io, export
+    from FigureForge.figure_manager import read_figure
+
+    start = time.perf_counter()
+    try:
+        stem = name or os.path.splitext(os.path.basename(file_name))[0]
+        directory = output_dir or os.path.dirname(file_name)
+        if figure_io.is_bundle(file_name):
+            figures = [
+                (figure, f"{stem}-{index}")
+                for index, (figure, _) in enumerate(
+                    figure_io.load_bundle(file_name, memory_map=True), 1
+                )
+            ]
+        else:
+            figures = [(read_figure(file_name, memory_map=True), stem)]
+
+        outputs = []
+        for figure, name in figures:
+            digest = figure_io.digest(figure) if cache is not None else None
+            for dpi in dpis:
+                suffix = f"-{dpi:g}dpi" if len(dpis) > 1 else ""
+                for format in formats:
+                    output = os.path.join(directory, f"{name}{suffix}.{format}")
+                    export.export_figure(
+                        figure, output, dpi or "figure", cache=cache, digest=digest
+                    )
+                    outputs.append(output)
+    except Exception:
+        return traceback.format_exc(), time.perf_counter() - start
+    return outputs, time.perf_counter() - start
+
+
+def _init_worker() -> None:
+    """
+    Sets up a worker process to render without a display.
+    """
+    # Nothing is shown, so no GUI backend needs to be loaded
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _indent(error) -> str:
+    return "\n".join("    " + line for line in str(error).rstrip().splitlines())
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+import os
+import json
+
+from PySide6.QtWidgets import (
+    QDialog,
+    QVBoxLayout,
+    QHBoxLayout,
+    QPushButton,
+    QLabel,
+    QSpinBox,
+    QTableWidget,
+    QTableWidgetItem,
+    QHeaderView,
+    QFileDialog,
+    QAbstractItemView,
+)
+from PySide6.QtGui import QIcon
+
+from FigureForge.__init__ import ASSETS_DIR
+
+
+class DrawProfileDialog(QDialog):
+    def __init__(self, fm):
+        super().__init__()
+        self.setWindowTitle("Slowest Artists")
+        self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "logo.ico")))
+        self.setMinimumSize(600, 400)
+        self.fm = fm
+        self.profiler = fm.draw_profiler
+        self.init_ui()
+        self.update_table()
+
+        self.exec()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(
+            QLabel(f"Render time: {self.profiler.elapsed * 1000:.1f} ms")
+        )
+        header_layout.addStretch()
+        header_layout.addWidget(QLabel("Show:"))
+        self.count_spinbox = QSpinBox()
+        self.count_spinbox.setRange(1, 1000)
+        self.count_spinbox.setValue(20)
+        self.count_spinbox.valueChanged.connect(self.update_table)
+        header_layout.addWidget(self.count_spinbox)
+        layout.addLayout(header_layout)
+
+        self.table = QTableWidget(0, 5)
+        self.table.setHorizontalHeaderLabels(
+            ["Artist", "Label", "Self (ms)", "Total (ms)", "Calls"]
+        )
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSortingEnabled(True)
+        self.table.itemDoubleClicked.connect(self.select_artist)
+        self.table.setToolTip("Double-click an artist to select it.")
+        layout.addWidget(self.table)
+
+        button_layout = QHBoxLayout()
+        export_button = QPushButton("Export JSON...")
+        export_button.clicked.connect(self.export_json)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.accept)
+        button_layout.addWidget(export_button)
+        button_layout.addStretch()
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def update_table(self):
+        slowest = self.profiler.slowest(self.count_spinbox.value())
+        self.table.setSortingEnabled(False)
+        self.table.setRowCount(len(slowest))
+        for row, (artist, draw_time) in enumerate(slowest):
+            name = QTableWidgetItem(artist.__class__.__name__)
+            name.artist = artist
+            self.table.setItem(row, 0, name)
+            self.table.setItem(row, 1, QTableWidgetItem(str(artist.get_label() or "")))
+            for column, value in (
+                (2, draw_time.self_time * 1000),
+                (3, self.profiler.total_time(artist) * 1000),
+                (4, draw_time.calls),
+            ):
+                item = NumericItem(
+                    f"{value:.2f}" if isinstance(value, float) else str(value)
+                )
+                item.value = value
+                self.table.setItem(row, column, item)
+        self.table.setSortingEnabled(True)
+
+    def select_artist(self, item):
+        artist = self.table.item(item.row(), 0).artist
+        self.fm.refresh_tree(artist)
+        if artist.__class__.__name__ in self.fm.structure:
+            self.fm.on_item_selected(artist)
+
+    def export_json(self):
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export Draw Profile", "", "JSON Files (*.json)"
+        )
+        if file_name:
+            export_draw_profile(self.profiler, self.fm.figure, file_name)
+
+
+class NumericItem(QTableWidgetItem):
+    """A table item that sorts by its numeric value."""
+
+    def __lt__(self, other):
+        return self.value < other.value
+
+
+def export_draw_profile(profiler, figure, file_name) -> None:
+    """
+    Writes the last profile of a figure to a JSON file.
+
+    Args:
+        profiler (DrawProfiler): The profiler that timed the render.
+        figure (Figure): The profiled figure.
+        file_name (str): The name of the file to write.
+    """
+    with open(file_name, "w") as f:
+        json.dump(profiler.to_dict(figure), f, indent=4)
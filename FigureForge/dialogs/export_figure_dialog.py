@@ -1,5 +1,7 @@
 import os
+import math
 
+import numpy as np
 from PySide6.QtWidgets import (
     QDialog,
     QVBoxLayout,
@@ -14,24 +16,74 @@ from PySide6.QtWidgets import (
     QSizePolicy,
     QFormLayout,
     QCheckBox,
+    QComboBox,
 )
 from PySide6.QtGui import QIcon
 
+import matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
 from FigureForge.__init__ import ASSETS_DIR
 from FigureForge.widgets.custom_spinbox import SpinBox
+from FigureForge import export, figure_io
+from FigureForge.file_worker import FileWorker
+from FigureForge.dialogs.open_figure_dialog import format_size
+from FigureForge.rendering.redraw_scheduler import RedrawScheduler
+
+# The most pixels the preview is rendered with, however large the export
+PREVIEW_PIXELS = 1_000_000
 
 
 class ExportFigureDialog(QDialog):
-    def __init__(self, preferences, figure):
+    """
+    Lets the user choose where and how to export a figure, either to a single
+    file or to the targets of an export profile. The export itself is started by
+    the caller once the dialog is accepted, so that it can run in the background.
+
+    The preview is rendered at the export's resolution only up to PREVIEW_PIXELS,
+    and below it otherwise, and it is redrawn once changes to the options have
+    paused. The pixel dimensions and estimated size of every file to export are
+    listed beside it. The sizes of vector exports are counted by exporting a copy
+    of the figure on a file worker, and shown once counted.
+
+    Attributes:
+        file_name (str): The name of the files to export to, without an extension.
+        targets (list): The export targets. See FigureForge.export.
+        open_file (bool): Whether to open the file once it is exported.
+    """
+
+    def __init__(self, preferences, blocks):
+        """
+        Args:
+            preferences (Preferences): The preferences.
+            blocks (list): A snapshot of the figure to export, from
+                figure_io.snapshot. The preview and size counts are restored from
+                it, leaving the figure being edited alone.
+        """
         super().__init__()
         self.setWindowTitle("Export Figure")
         self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "logo.ico")))
         self.setMinimumSize(800, 600)
         self.preferences = preferences
-        self.figure = figure
+        self.blocks = blocks
+        self.figure = figure_io.restore(blocks)
+        self.figure_dpi = self.figure.get_dpi()
+        self.figure_size = tuple(self.figure.get_size_inches())
+        self.estimator = None
+        # The sizes of vector exports by format, once counted on the worker
+        self.vector_sizes = {}
+        self.size_worker = None
+        self._preview = None
+        self.preview_scheduler = RedrawScheduler(
+            self.update_preview,
+            preferences.get("redraw_interval"),
+            preferences.get("redraw_max_delay"),
+            self,
+        )
         self.last_export_path = preferences.get("last_export_path")
+        self.file_name = None
+        self.targets = None
+        self.open_file = False
         self.init_ui()
 
         self.exec()
@@ -46,6 +98,7 @@ class ExportFigureDialog(QDialog):
 
         self.path_edit = QLineEdit()
         self.path_edit.setText(self.last_export_path)
+        self.path_edit.textChanged.connect(self.preview_scheduler.request)
         browse_button = QPushButton("Browse")
         browse_button.clicked.connect(self.browse)
 
@@ -54,18 +107,28 @@ class ExportFigureDialog(QDialog):
         path_layout.addWidget(browse_button)
         form_layout.addRow(QLabel("Path:"), path_layout)
 
+        self.profile_combo = QComboBox()
+        self.profile_combo.addItem("None")
+        self.profile_combo.addItems(list(self.preferences.get("export_profiles")))
+        self.profile_combo.setToolTip(
+            "Export to every format and size of a profile at once. Profiles are "
+            "set up in the preferences."
+        )
+        self.profile_combo.currentIndexChanged.connect(self.profile_changed)
+        form_layout.addRow(QLabel("Profile:"), self.profile_combo)
+
         self.dpi_spinbox = QSpinBox()
         self.dpi_spinbox.setRange(10, 1000)
         self.dpi_spinbox.setValue(self.figure.get_dpi())
-        self.dpi_spinbox.valueChanged.connect(self.dpi_changed)
+        self.dpi_spinbox.valueChanged.connect(self.preview_scheduler.request)
         form_layout.addRow(QLabel("DPI:"), self.dpi_spinbox)
 
         self.width_edit = SpinBox()
         self.width_edit.setValue(self.figure.get_size_inches()[0])
-        self.width_edit.valueChanged.connect(self.size_changed)
+        self.width_edit.valueChanged.connect(self.preview_scheduler.request)
         self.height_edit = SpinBox()
         self.height_edit.setValue(self.figure.get_size_inches()[1])
-        self.height_edit.valueChanged.connect(self.size_changed)
+        self.height_edit.valueChanged.connect(self.preview_scheduler.request)
         size_layout = QHBoxLayout()
         size_layout.addWidget(self.width_edit)
         size_layout.addWidget(self.height_edit)
@@ -73,6 +136,11 @@ class ExportFigureDialog(QDialog):
 
         options_layout.addLayout(form_layout)
 
+        self.info_label = QLabel()
+        self.info_label.setWordWrap(True)
+        options_layout.addWidget(self.info_label)
+        options_layout.addStretch()
+
         self.open_file_checkbox = QCheckBox("Open file after export")
         options_layout.addWidget(self.open_file_checkbox)
 
@@ -104,6 +172,7 @@ class ExportFigureDialog(QDialog):
         main_layout.addWidget(self.scroll_area)
 
         self.setLayout(main_layout)
+        self.update_preview()
 
     def browse(self):
         file_dialog = QFileDialog(self)
@@ -119,17 +188,18 @@ class ExportFigureDialog(QDialog):
 
     def export_figure(self):
         path = self.path_edit.text()
-        dpi = self.dpi_spinbox.value()
-        width = self.width_edit.text()
-        height = self.height_edit.text()
 
         try:
-            if width and height:
-                size = (float(width), float(height))
-                self.figure.set_size_inches(size)
-            self.figure.savefig(path, dpi=dpi)
-            if self.open_file_checkbox.isChecked():
-                os.startfile(path)
+            if not os.path.basename(path):
+                raise ValueError("No file name given.")
+            targets = self.current_targets()
+            supported = self.canvas.get_supported_filetypes()
+            for target in targets:
+                if target["format"] not in supported:
+                    raise ValueError(f"Unsupported file type: {target['format']}")
+            self.file_name = os.path.splitext(path)[0]
+            self.targets = targets
+            self.open_file = self.open_file_checkbox.isChecked()
             self.preferences.set("last_export_path", path)
             self.accept()
         except Exception as e:
@@ -143,15 +213,135 @@ class ExportFigureDialog(QDialog):
             error_dialog.setLayout(error_layout)
             error_dialog.exec()
 
-    def dpi_changed(self, value):
-        self.figure.set_dpi(value)
-        self.canvas.draw()
+    def current_targets(self) -> list:
+        """
+        Returns the targets of the chosen profile, or the target set by the
+        options if no profile is chosen.
+        """
+        if self.profile_combo.currentIndex() > 0:
+            return self.preferences.get("export_profiles")[
+                self.profile_combo.currentText()
+            ]
+        extension = os.path.splitext(self.path_edit.text())[1]
+        return [
+            {
+                "format": extension[1:].lower()
+                or matplotlib.rcParams["savefig.format"],
+                "dpi": self.dpi_spinbox.value(),
+                "size": [self.width_edit.value(), self.height_edit.value()],
+            }
+        ]
+
+    def profile_changed(self, index):
+        # A profile sets the resolutions and sizes itself
+        self.dpi_spinbox.setEnabled(index == 0)
+        self.width_edit.setEnabled(index == 0)
+        self.height_edit.setEnabled(index == 0)
+        self.preview_scheduler.request()
+
+    def update_preview(self):
+        """
+        Renders the preview, at the export's resolution or the highest resolution
+        within PREVIEW_PIXELS, and lists the files to export.
+        """
+        size = (self.width_edit.value(), self.height_edit.value())
+        if min(size) <= 0:
+            self.info_label.setText("The width and height must be positive.")
+            return
+        dpi = min(self.dpi_spinbox.value(), math.sqrt(PREVIEW_PIXELS / math.prod(size)))
+        if (size, dpi) != self._preview:
+            self.figure.set_size_inches(size)
+            self.figure.set_dpi(dpi)
+            self.canvas.draw()
+            self.canvas.resize(self.canvas.sizeHint())
+            # The canvas reuses its buffer for the next draw
+            image = np.array(self.canvas.buffer_rgba())
+            self.estimator = export.SizeEstimator(self.figure, image)
+            self._preview = (size, dpi)
+        self.update_info()
+
+    def update_info(self):
+        """
+        Lists the pixel dimensions and estimated size of every file to export.
+        """
+        supported = self.canvas.get_supported_filetypes()
+        lines = []
+        uncounted = {}
+        for target in self.current_targets():
+            format = target["format"]
+            dpi = target["dpi"] or self.figure_dpi
+            width, height = target["size"] or self.figure_size
+            if format not in supported:
+                lines.append(f"{format.upper()}: unsupported file type")
+                continue
+            if format in export.RASTER_FORMATS:
+                pixels = f"{int(width * dpi)} × {int(height * dpi)} px"
+                dimensions = f"{dpi:g} DPI, {pixels}"
+            else:
+                dimensions = f"{width:g} × {height:g} in"
+            if format not in export.RASTER_FORMATS:
+                if format not in self.vector_sizes:
+                    uncounted.setdefault(format, dpi)
+                    lines.append(f"{format.upper()}: {dimensions}, estimating…")
+                    continue
+                estimate = self.vector_sizes[format]
+                estimate = "unknown size" if estimate is None else format_size(estimate)
+                lines.append(f"{format.upper()}: {dimensions}, about {estimate}")
+                continue
+            try:
+                estimate = self.estimator.estimate(format, dpi, (width, height))
+                estimate = format_size(estimate)
+            except Exception as e:
+                if self.preferences.get("debug"):
+                    print(f"Failed to estimate the size of {format} exports: {e}")
+                estimate = "unknown size"
+            lines.append(f"{format.upper()}: {dimensions}, about {estimate}")
+        self.info_label.setText("\n".join(lines))
+        if uncounted:
+            self.count_sizes(uncounted)
+
+    def count_sizes(self, formats):
+        """
+        Counts the sizes of vector exports on a file worker, as they take as long
+        as the exports themselves, and lists them once counted. Formats still to
+        count when the worker is busy are counted once it has finished.
+
+        Args:
+            formats (dict): The resolutions to export at, by format.
+        """
+        if self.size_worker is not None:
+            return
+        blocks = self.blocks
+
+        def task(progress):
+            # A copy of its own, as the preview is drawn meanwhile
+            figure = figure_io.restore(blocks)
+            return {
+                format: export.export_size(figure, format, dpi, progress)
+                for format, dpi in formats.items()
+            }
+
+        worker = FileWorker()
+        self.size_worker = worker
+        worker.finished.connect(lambda: self.on_sizes_counted(worker, formats))
+        worker.start(task)
 
-    def size_changed(self, value):
-        width = self.width_edit.value()
-        height = self.height_edit.value()
-        size = (width, height)
-        self.figure.set_size_inches(size)
-        self.canvas.draw()
+    def on_sizes_counted(self, worker, formats):
+        worker.deleteLater()
+        self.size_worker = None
+        if worker.cancelled:
+            return
+        if worker.error is not None:
+            if self.preferences.get("debug"):
+                print(f"Failed to estimate the size of exports: {worker.error}")
+            # Not counted again, but listed as of unknown size
+            self.vector_sizes.update(dict.fromkeys(formats))
+        else:
+            self.vector_sizes.update(worker.result)
+        self.update_info()
 
-        self.scroll_area.widget().resize(self.canvas.sizeHint())
+    def done(self, result):
+        # The sizes are no longer needed once the dialog is closed
+        if self.size_worker is not None:
+            self.size_worker.cancel()
+        super().done(result)
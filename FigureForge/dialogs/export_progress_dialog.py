@@ -0,0 +1,55 @@
+import os
+
+from PySide6.QtWidgets import QProgressDialog
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt, QTimer
+
+from FigureForge.__init__ import ASSETS_DIR
+from FigureForge.dialogs.file_progress_dialog import SHOW_DELAY
+
+
+class ExportProgressDialog(QProgressDialog):
+    """
+    Shows the progress of an export running on a FileWorker, without blocking the
+    rest of the application. It appears once the export has taken longer than
+    SHOW_DELAY, and closes itself when the export ends.
+    """
+
+    def __init__(self, label, worker, parent=None):
+        super().__init__(label, "Cancel", 0, 1000, parent)
+        self.setWindowTitle("Export Figure")
+        self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "logo.ico")))
+        self.setWindowModality(Qt.NonModal)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        # Shown by the timer below instead
+        self.setMinimumDuration(2**31 - 1)
+        self.worker = worker
+        self.ended = False
+        worker.progress.connect(self.update_progress)
+        worker.finished.connect(self.on_finished)
+        self.canceled.connect(self.cancel_task)
+        QTimer.singleShot(int(SHOW_DELAY * 1000), self.show_if_running)
+
+    def show_if_running(self):
+        if not self.ended:
+            self.show()
+
+    def update_progress(self, progress):
+        if progress < 0:
+            self.setRange(0, 0)
+        else:
+            self.setRange(0, 1000)
+            self.setValue(progress)
+
+    def cancel_task(self):
+        # Closing the dialog also emits canceled
+        if self.ended:
+            return
+        self.setLabelText("Cancelling...")
+        self.worker.cancel()
+
+    def on_finished(self):
+        self.ended = True
+        self.close()
+        self.deleteLater()
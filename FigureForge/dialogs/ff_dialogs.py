@@ -5,3 +5,11 @@ from FigureForge.dialogs.about_dialog import AboutDialog
 from FigureForge.dialogs.save_work_dialog import SaveWorkDialog
 from FigureForge.dialogs.update_check import check_for_updates
 from FigureForge.dialogs.welcome_dialog import WelcomeDialog
+from FigureForge.dialogs.draw_profile_dialog import DrawProfileDialog
+from FigureForge.dialogs.file_progress_dialog import run_file_task
+from FigureForge.dialogs.export_progress_dialog import ExportProgressDialog
+from FigureForge.dialogs.open_figure_dialog import (
+    OpenFigureDialog,
+    preview_pixmap,
+    preview_text,
+)
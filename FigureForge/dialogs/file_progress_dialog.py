@@ -0,0 +1,70 @@
+import os
+
+from PySide6.QtWidgets import QProgressDialog
+from PySide6.QtGui import QIcon
+from PySide6.QtCore import Qt
+
+from FigureForge.__init__ import ASSETS_DIR
+from FigureForge.file_worker import FileWorker, FileCancelled
+
+# How long a file task may take before its progress is shown, in seconds
+SHOW_DELAY = 0.2
+
+
+class FileProgressDialog(QProgressDialog):
+    def __init__(self, label, worker):
+        super().__init__(label, "Cancel", 0, 1000)
+        self.setWindowTitle("FigureForge")
+        self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "logo.ico")))
+        self.setWindowModality(Qt.ApplicationModal)
+        self.setMinimumDuration(0)
+        self.setAutoClose(False)
+        self.setAutoReset(False)
+        self.worker = worker
+        worker.progress.connect(self.update_progress)
+        worker.finished.connect(self.accept)
+        self.canceled.connect(self.cancel_task)
+        if worker.wait(0):
+            return
+
+        self.exec()
+
+    def update_progress(self, progress):
+        if progress < 0:
+            self.setRange(0, 0)
+        else:
+            self.setRange(0, 1000)
+            self.setValue(progress)
+
+    def cancel_task(self):
+        self.setLabelText("Cancelling...")
+        self.worker.cancel()
+
+
+def run_file_task(label, task):
+    """
+    Runs a file task on a FileWorker, showing its progress in a dialog if it takes
+    longer than SHOW_DELAY. The GUI is blocked until then, so that short tasks do
+    not flash a dialog.
+
+    Args:
+        label (str): The text to show in the dialog.
+        task (callable): The task. See FileWorker.start.
+
+    Returns:
+        The value returned by the task.
+
+    Raises:
+        FileCancelled: If the task was cancelled.
+        Exception: Any exception raised by the task.
+    """
+    worker = FileWorker()
+    worker.start(task)
+    if not worker.wait(SHOW_DELAY):
+        FileProgressDialog(label, worker)
+    worker.wait()
+    if worker.cancelled:
+        raise FileCancelled()
+    if worker.error is not None:
+        raise worker.error
+    return worker.result
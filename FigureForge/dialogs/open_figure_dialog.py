@@ -0,0 +1,108 @@
+import os
+
+from PySide6.QtWidgets import QFileDialog, QWidget, QVBoxLayout, QLabel
+from PySide6.QtGui import QIcon, QPixmap
+from PySide6.QtCore import Qt
+
+from FigureForge.__init__ import ASSETS_DIR
+from FigureForge import figure_io
+
+
+class OpenFigureDialog(QFileDialog):
+    """
+    A file dialog for opening figures, which previews the selected figure from the
+    header of its file, without loading it.
+
+    Attributes:
+        file_name (str): The name of the chosen file, or None if the dialog was
+            cancelled.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(
+            parent,
+            "Open File",
+            "",
+            "Figure Files (*.pkl *.ffig *.ffproj);;All Files (*)",
+        )
+        self.setWindowIcon(QIcon(os.path.join(ASSETS_DIR, "logo.ico")))
+        # The preview is added to the layout of Qt's own dialog
+        self.setOption(QFileDialog.DontUseNativeDialog)
+        self.setFileMode(QFileDialog.ExistingFile)
+        self.file_name = None
+
+        self.preview = FigurePreview(self)
+        layout = self.layout()
+        layout.addWidget(self.preview, 0, layout.columnCount(), layout.rowCount(), 1)
+        self.currentChanged.connect(self.preview.show_file)
+
+        if self.exec():
+            self.file_name = self.selectedFiles()[0]
+
+
+class FigurePreview(QWidget):
+    """
+    Shows the thumbnail and description of a figure file.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFixedWidth(figure_io.THUMBNAIL_SIZE)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.thumbnail_label = QLabel(self)
+        self.thumbnail_label.setAlignment(Qt.AlignCenter)
+        self.thumbnail_label.setMinimumHeight(figure_io.THUMBNAIL_SIZE)
+        layout.addWidget(self.thumbnail_label)
+        self.info_label = QLabel(self)
+        self.info_label.setWordWrap(True)
+        self.info_label.setAlignment(Qt.AlignTop)
+        layout.addWidget(self.info_label, 1)
+
+    def show_file(self, file_name):
+        preview = None
+        if os.path.isfile(file_name):
+            try:
+                preview = figure_io.read_preview(file_name)
+            except OSError:
+                pass
+        self.thumbnail_label.setPixmap(preview_pixmap(preview))
+        if preview is not None:
+            self.info_label.setText(preview_text(preview))
+        elif os.path.isfile(file_name):
+            self.info_label.setText("No preview available.")
+        else:
+            self.info_label.clear()
+
+
+def preview_pixmap(preview) -> QPixmap:
+    """
+    Returns the thumbnail of a preview read by figure_io.read_preview, or an empty
+    pixmap if it has none.
+    """
+    pixmap = QPixmap()
+    if preview is not None and preview["thumbnail"] is not None:
+        pixmap.loadFromData(preview["thumbnail"], "PNG")
+    return pixmap
+
+
+def preview_text(preview) -> str:
+    """
+    Returns a description of the figure in a preview read by
+    figure_io.read_preview.
+    """
+    lines = [preview["title"]] if preview["title"] else []
+    lines.append(f"{preview['axes']} Axes, {preview['artists']} artists")
+    lines.append(f"{format_size(preview['data_bytes'])} of data")
+    return "\n".join(lines)
+
+
+def format_size(size) -> str:
+    """
+    Returns a number of bytes in bytes, KB, MB or GB, whichever is most readable.
+    """
+    for unit in ["bytes", "KB", "MB", "GB"]:
+        if size < 1000 or unit == "GB":
+            break
+        size /= 1000
+    return f"{size:.0f} {unit}" if unit == "bytes" else f"{size:.1f} {unit}"
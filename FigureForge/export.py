@@ -0,0 +1,472 @@
+"""
+Exporting figures to image and document files.
+
+An export target is a dict with the "format" to export to, and the "dpi" and
+"size" (width and height in inches) to export at, each None for the figure's own.
+Export profiles, stored in the export_profiles preference, are named lists of
+targets. They are written as text as `format[@dpi][:WIDTHxHEIGHT]`, for example
+"png@300, pdf, svg:7x5".
+
+Several figures, such as every open tab or a set of figure files, may be exported
+as the pages of one PDF with `export_pages`, which renders them one at a time.
+"""
+
+import io
+import os
+import gc
+import re
+import math
+
+import numpy as np
+import matplotlib
+import matplotlib.image
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+
+from FigureForge import figure_io
+from FigureForge.rendering.export_progress import ExportProgress
+from FigureForge.rendering.frozen_layout import FrozenLayout
+
+# The formats exported as images
+RASTER_FORMATS = {
+    "png",
+    "jpg",
+    "jpeg",
+    "tif",
+    "tiff",
+    "webp",
+    "gif",
+    "avif",
+    "raw",
+    "rgba",
+}
+
+_TARGET = re.compile(
+    r"([a-z0-9]+)(?:@(\d+(?:\.\d+)?))?(?::(\d+(?:\.\d+)?)x(\d+(?:\.\d+)?))?",
+    re.IGNORECASE,
+)
+
+
+def export_figure(
+    figure, file_name, dpi="figure", progress=None, cache=None, digest=None, **kwargs
+) -> str:
+    """
+    Exports a figure with savefig, in the format given by the extension of the file
+    name. The export is written to a temporary file that only replaces `file_name`
+    once it is complete, so a failed or cancelled export leaves no partial file.
+
+    With a cache, an export of a figure that has not changed since it was last
+    exported with the same settings is copied from the cache instead.
+
+    Args:
+        figure (Figure): The figure to export. While it is exported, its artists
+            are patched to report progress, so it should not be rendered elsewhere
+            meanwhile; export a figure restored from a snapshot to keep editing.
+        file_name (str): The name of the file to write. Without an extension, the
+            savefig.format rcParam is used, and its extension appended.
+        dpi (float): The resolution to export at, or "figure" for the figure's own.
+        progress (callable): Called with the number of artists drawn so far and
+            the number of artists of the figure, if given. See ExportProgress.
+        cache (ExportCache): The cache to copy the export from, or add it to, if
+            given.
+        digest (str): The hash of the figure from figure_io.digest, if it is
+            already known. Only used with a cache.
+        **kwargs: Passed on to savefig.
+
+    Returns:
+        The name of the file written.
+    """
+    format = os.path.splitext(file_name)[1][1:].lower()
+    if not format:
+        format = matplotlib.rcParams["savefig.format"]
+        file_name += f".{format}"
+
+    if cache is not None:
+        key = cache.key(
+            digest or figure_io.digest(figure),
+            format,
+            figure.dpi if dpi == "figure" else dpi,
+            figure.get_size_inches(),
+            **kwargs,
+        )
+        if cache.fetch(key, file_name):
+            return file_name
+
+    with figure_io.atomic_write(file_name) as f:
+        if progress is None:
+            figure.savefig(f, format=format, dpi=dpi, **kwargs)
+        else:
+            with ExportProgress(progress).apply(figure):
+                figure.savefig(f, format=format, dpi=dpi, **kwargs)
+    if cache is not None:
+        cache.store(key, file_name)
+    return file_name
+
+
+def export_targets(figure, file_name, targets, progress=None, cache=None) -> list:
+    """
+    Exports a figure to several targets in one job, such as the targets of an
+    export profile.
+
+    The layout engine runs once per size rather than once per target, as the
+    layout of a figure does not depend on the resolution it is drawn at.
+
+    Args:
+        figure (Figure): The figure to export. It is resized for targets with a
+            size, so export a figure restored from a snapshot.
+        file_name (str): The name of the files to write, without an extension.
+            See `target_name`.
+        targets (list): The export targets.
+        progress (callable): Called with the number of artists drawn so far over
+            all targets and the total, if given. See ExportProgress.
+        cache (ExportCache): The cache to copy exports from, or add them to, if
+            given.
+
+    Returns:
+        The names of the files written.
+    """
+    original_size = tuple(figure.get_size_inches())
+    # Hashed once, before the figure is resized and drawn
+    digest = figure_io.digest(figure) if cache is not None else None
+    # Targets of the same size are exported one after another, to share layouts
+    ordered = sorted(targets, key=lambda target: tuple(target["size"] or original_size))
+    layout = FrozenLayout(per_dpi=False)
+    files = []
+    with layout.apply(figure):
+        for index, target in enumerate(ordered):
+            figure.set_size_inches(target["size"] or original_size)
+            report = None
+            if progress is not None:
+
+                def report(done, total, index=index):
+                    progress(index * total + done, len(ordered) * total)
+
+            files.append(
+                export_figure(
+                    figure,
+                    target_name(file_name, target, targets),
+                    target["dpi"] or "figure",
+                    report,
+                    cache,
+                    digest,
+                )
+            )
+    return files
+
+
+def export_pages(figures, file_name, count=None, progress=None, **kwargs) -> str:
+    """
+    Exports figures as the pages of one PDF, one page at a time. Figures are taken
+    from `figures` only once the previous page is written, and let go of after
+    their page, so with a generator that loads them, such as `iter_figure_files`,
+    only about one figure is held in memory at a time. Matplotlib keeps the
+    images drawn on the pages until the PDF is complete, though, as it writes them
+    at the end of the file.
+
+    Like `export_figure`, the PDF only replaces `file_name` once it is complete.
+
+    Args:
+        figures (iterable): The figures to export, in the order of the pages. They
+            are patched to report progress while they are exported, so export
+            figures restored from snapshots or loaded for the export.
+        file_name (str): The name of the PDF to write. ".pdf" is appended if it
+            has no extension.
+        count (int): The number of figures, for reporting progress, if known.
+        progress (callable): Called with the number of artists drawn so far over
+            all pages and the total, if given. Progress is only reported once the
+            number of figures is known, from `count` or the length of `figures`.
+        **kwargs: Passed on to savefig.
+
+    Returns:
+        The name of the file written.
+    """
+    if not os.path.splitext(file_name)[1]:
+        file_name += ".pdf"
+    if count is None and hasattr(figures, "__len__"):
+        count = len(figures)
+
+    with figure_io.atomic_write(file_name) as f, PdfPages(f) as pdf:
+        # Not counted by enumerate, which would hold on to the previous figure
+        # while the next is loaded
+        index = 0
+        for figure in figures:
+            if progress is None or not count:
+                pdf.savefig(figure, **kwargs)
+            else:
+
+                def report(done, total, index=index):
+                    progress(index * total + done, count * total)
+
+                with ExportProgress(report).apply(figure):
+                    pdf.savefig(figure, **kwargs)
+            # Let go of the page's figure before the next one is loaded
+            del figure
+            index += 1
+    return file_name
+
+
+def iter_figure_files(file_names, memory_map=True):
+    """
+    Loads the figures of figure files one at a time, for `export_pages`. The
+    memory of each figure is reclaimed when the next one is loaded; the figures of
+    a project bundle are loaded together.
+
+    Args:
+        file_names (list): The .pkl, .ffig and .ffproj files.
+        memory_map (bool): Whether to memory-map the data of .ffig files and
+            bundles, so that it is read as it is drawn.
+
+    Yields:
+        The figures, in the order of the files.
+    """
+    from FigureForge.figure_manager import read_figure
+
+    for file_name in file_names:
+        if figure_io.is_bundle(file_name):
+            figures = [
+                figure
+                for figure, _ in figure_io.load_bundle(file_name, memory_map=memory_map)
+            ]
+        else:
+            figures = [read_figure(file_name, memory_map=memory_map)]
+        while figures:
+            figure = figures.pop(0)
+            yield figure
+            del figure
+            # Figures hold reference cycles, which would otherwise keep the arrays
+            # of several of them alive until the garbage collector next runs
+            gc.collect()
+
+
+class SizeEstimator:
+    """
+    Estimates the sizes of the files exports of a figure would write, without
+    exporting at the full resolution.
+
+    Images are estimated from a rendering of the figure at a lower resolution,
+    such as an export preview, and from an export at half that resolution. The
+    growth of the encoded size between the two is extrapolated to the resolution
+    of the export. It is only an estimate: images whose data is coarser than the
+    export stop growing, which the renderings are too small to show. Other formats
+    are not estimated, as their size hardly depends on the size or resolution of
+    the figure: count the size of one export to them with `export_size` instead,
+    such as on a file worker, as it takes as long as the export itself.
+
+    Attributes:
+        figure (Figure): The figure to export.
+        image (np.ndarray): An RGBA rendering of the figure at its size.
+    """
+
+    def __init__(self, figure, image) -> None:
+        """
+        Initializes a new instance of the SizeEstimator class.
+
+        Args:
+            figure (Figure): The figure to export. It must not be changed while the
+                estimator is used.
+            image (np.ndarray): An RGBA rendering of the figure at its size, such
+                as a copy of the buffer of its canvas.
+        """
+        self.figure = figure
+        self.image = image
+        self._growth = {}
+
+    def estimate(self, format, dpi, size=None) -> int:
+        """
+        Estimates the size of the file an image export would write. Only the first
+        estimate for a format exports the figure, at half the resolution of the
+        image.
+
+        Args:
+            format (str): The format to export to, one of RASTER_FORMATS.
+            dpi (float): The resolution to export at.
+            size (tuple): The size to export at, in inches, or None for the size of
+                the figure.
+
+        Returns:
+            The estimated size, in bytes.
+        """
+        if format not in RASTER_FORMATS:
+            raise ValueError(f"Only image sizes are estimated, not {format} sizes")
+        width, height = np.multiply(size or self.figure.get_size_inches(), dpi)
+        pixels = int(width) * int(height)
+        if format in ("raw", "rgba"):
+            return pixels * 4
+
+        if format not in self._growth:
+            self._growth[format] = self._measure(format)
+        size, growth = self._growth[format]
+        image_pixels = self.image.shape[0] * self.image.shape[1]
+        return round(size * (pixels / image_pixels) ** growth)
+
+    def _measure(self, format) -> tuple:
+        """
+        Returns the encoded size of the image, and the growth of the encoded size
+        with the number of pixels.
+        """
+        stream = io.BytesIO()
+        matplotlib.image.imsave(stream, self.image, format=format)
+        width, height = self.figure.get_size_inches()
+        # The dpi of the image, which may differ from the figure's on high-DPI screens
+        dpi = self.image.shape[1] / width
+        half = io.BytesIO()
+        _print_figure(self.figure, half, format, dpi / 2)
+        ratio = (self.image.shape[0] * self.image.shape[1]) / (
+            int(width * dpi / 2) * int(height * dpi / 2) or 1
+        )
+        growth = 1.0
+        if ratio > 1 and half.tell() > 0:
+            growth = math.log(stream.tell() / half.tell()) / math.log(ratio)
+        # Between the growth of line art, with its length, and of noise, with its area
+        return stream.tell(), min(max(growth, 0.5), 1.0)
+
+
+def export_size(figure, format, dpi="figure", progress=None) -> int:
+    """
+    Returns the size of the file an export of a figure would write, without
+    writing it.
+
+    Args:
+        figure (Figure): The figure to export.
+        format (str): The format to export to.
+        dpi (float): The resolution to export at, or "figure" for the figure's own.
+        progress (callable): Called with the number of artists drawn so far and
+            the number of artists of the figure, if given. See ExportProgress.
+
+    Returns:
+        The size, in bytes.
+    """
+    counter = _ByteCounter()
+    if progress is None:
+        _print_figure(figure, counter, format, dpi)
+    else:
+        with ExportProgress(progress).apply(figure):
+            _print_figure(figure, counter, format, dpi)
+    return counter.tell()
+
+
+def target_name(file_name, target, targets) -> str:
+    """
+    Returns the name of the file to export a target to, with the extension of its
+    format, and its resolution and size appended only where they are needed to
+    tell it apart from the other targets, as in `<name>-300dpi-7x5in.png`.
+
+    Args:
+        file_name (str): The name of the files, without an extension.
+        target (dict): The target.
+        targets (list): All targets exported together.
+    """
+    same_format = [other for other in targets if other["format"] == target["format"]]
+    if len({other["dpi"] for other in same_format}) > 1 and target["dpi"]:
+        file_name += f"-{target['dpi']:g}dpi"
+    if len({_size(other) for other in same_format}) > 1 and target["size"]:
+        file_name += "-{:g}x{:g}in".format(*target["size"])
+    return f"{file_name}.{target['format']}"
+
+
+def parse_targets(text) -> list:
+    """
+    Parses export targets written as `format[@dpi][:WIDTHxHEIGHT]`, separated by
+    commas or spaces. Anything else is skipped.
+
+    Args:
+        text (str): The targets, such as "png@300, pdf, svg:7x5".
+
+    Returns:
+        The targets.
+    """
+    targets = []
+    for word in re.split(r"[,\s]+", text.strip()):
+        match = _TARGET.fullmatch(word)
+        if match is None:
+            continue
+        format, dpi, width, height = match.groups()
+        targets.append(
+            {
+                "format": format.lower(),
+                "dpi": float(dpi) if dpi else None,
+                "size": [float(width), float(height)] if width else None,
+            }
+        )
+    return targets
+
+
+def format_targets(targets) -> str:
+    """
+    Returns export targets as text that `parse_targets` reads back.
+
+    Args:
+        targets (list): The targets.
+    """
+    words = []
+    for target in targets:
+        word = target["format"]
+        if target["dpi"]:
+            word += f"@{target['dpi']:g}"
+        if target["size"]:
+            word += ":{:g}x{:g}".format(*target["size"])
+        words.append(word)
+    return ", ".join(words)
+
+
+def _size(target):
+    return tuple(target["size"]) if target["size"] else None
+
+
+def _print_figure(figure, file, format, dpi) -> None:
+    """
+    Exports a figure with a canvas of its own, leaving the rendering held by its
+    canvas alone.
+    """
+    canvas = figure.canvas
+    try:
+        FigureCanvasAgg(figure).print_figure(file, format=format, dpi=dpi)
+    finally:
+        figure.set_canvas(canvas)
+
+
+def render_image(figure, dpi="figure") -> np.ndarray:
+    """
+    Renders a figure with Agg, with a canvas of its own, and returns the RGBA
+    buffer of the renderer itself rather than an encoded or copied image.
+
+    Args:
+        figure (Figure): The figure to render.
+        dpi (float): The resolution to render at, or "figure" for the figure's own.
+
+    Returns:
+        The image, as an array of shape (height, width, 4) backed by the renderer.
+    """
+    canvas = figure.canvas
+    figure_dpi = figure.dpi
+    try:
+        if dpi != "figure":
+            figure.dpi = dpi
+        agg = FigureCanvasAgg(figure)
+        agg.draw()
+        # Keeps the renderer, and so its buffer, alive
+        return np.asarray(agg.buffer_rgba())
+    finally:
+        figure.dpi = figure_dpi
+        figure.set_canvas(canvas)
+
+
+class _ByteCounter(io.RawIOBase):
+    """
+    A file that counts the bytes written to it, and discards them.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._size = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = memoryview(data).nbytes
+        self._size += size
+        return size
+
+    def tell(self) -> int:
+        return self._size
@@ -0,0 +1,195 @@
+"""
+A cache of exported files, so that exporting a figure that has not changed since
+it was last exported with the same settings copies the earlier export rather than
+rendering it again.
+
+Exports are keyed by a hash of the state of the figure, from figure_io.digest, and
+of everything else the output depends on: the format, resolution, size and savefig
+options of the export, the matplotlib version and the rcParams. Each export is
+stored in the cache directory as a file named by its key, and the modification time
+of the file records when it was last used. Once the cache outgrows its maximum
+size, the exports used longest ago are removed.
+
+Several processes may share a cache directory, as exports are written to the cache
+and copied out of it atomically.
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import filecmp
+
+import matplotlib
+from appdirs import user_cache_dir
+
+from FigureForge import figure_io
+
+# The default maximum size of the cache, in bytes
+DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+
+# Part of every key, to be increased whenever exports are keyed differently
+CACHE_VERSION = 2
+
+# The rcParams that do not affect exports, and differ between the GUI and scripts
+_IGNORED_PARAMS = {"backend", "backend_fallback", "interactive"}
+
+_ENTRY = re.compile(r"[0-9a-f]{32}")
+
+
+def default_directory() -> str:
+    """
+    Returns the directory exports are cached in by default.
+    """
+    return os.path.join(user_cache_dir("FigureForge", "FigureForge"), "exports")
+
+
+class ExportCache:
+    """
+    A directory of exported files keyed by what they were exported from, with the
+    exports used longest ago removed once it exceeds its maximum size.
+
+    Pass a cache to export.export_figure or export.export_targets to use it.
+
+    Attributes:
+        directory (str): The directory the exports are stored in.
+        max_size (int): The most the exports may take up together, in bytes.
+    """
+
+    def __init__(self, directory=None, max_size=DEFAULT_MAX_SIZE) -> None:
+        """
+        Initializes a new instance of the ExportCache class.
+
+        Args:
+            directory (str): The directory to store the exports in, created if
+                needed, or None for `default_directory()`.
+            max_size (int): The most the exports may take up together, in bytes.
+        """
+        self.directory = directory or default_directory()
+        self.max_size = max_size
+
+    def key(self, digest, format, dpi, size, **kwargs) -> str:
+        """
+        Returns the key of an export.
+
+        Args:
+            digest (str): The hash of the figure, from figure_io.digest.
+            format (str): The format exported to.
+            dpi (float): The resolution exported at.
+            size (tuple): The size exported at, in inches.
+            **kwargs: The other options passed to savefig.
+        """
+        params = {
+            key: value
+            for key, value in matplotlib.rcParams.items()
+            if key not in _IGNORED_PARAMS
+        }
+        settings = [
+            CACHE_VERSION,
+            matplotlib.__version__,
+            digest,
+            format,
+            float(dpi),
+            [float(length) for length in size],
+            sorted(kwargs.items()),
+            sorted(params.items()),
+        ]
+        text = json.dumps(settings, default=repr)
+        return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+    def fetch(self, key, file_name) -> bool:
+        """
+        Copies a cached export to a file, unless the file already holds it.
+
+        Args:
+            key (str): The key of the export.
+            file_name (str): The file to copy it to.
+
+        Returns:
+            Whether the export was cached.
+        """
+        entry = os.path.join(self.directory, key)
+        try:
+            # Marks the export as used
+            os.utime(entry)
+            if not (
+                os.path.isfile(file_name)
+                and filecmp.cmp(entry, file_name, shallow=False)
+            ):
+                with open(entry, "rb") as source, figure_io.atomic_write(
+                    file_name
+                ) as f:
+                    shutil.copyfileobj(source, f)
+        except FileNotFoundError:
+            # Not cached, or removed by another process meanwhile
+            return False
+        return True
+
+    def store(self, key, file_name) -> None:
+        """
+        Adds an export to the cache, then removes the exports used longest ago
+        while the cache exceeds its maximum size.
+
+        Args:
+            key (str): The key of the export.
+            file_name (str): The exported file.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with open(file_name, "rb") as source, figure_io.atomic_write(
+            os.path.join(self.directory, key)
+        ) as f:
+            shutil.copyfileobj(source, f)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the exports used longest ago while the cache exceeds its maximum
+        size.
+        """
+        entries = self._entries()
+        size = sum(stat.st_size for _, stat in entries)
+        for entry, stat in sorted(entries, key=lambda item: item[1].st_mtime):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(entry)
+            except OSError:
+                # Removed by another process, or in use on Windows
+                continue
+            size -= stat.st_size
+
+    def clear(self) -> None:
+        """
+        Removes every export from the cache.
+        """
+        for entry, _ in self._entries():
+            try:
+                os.remove(entry)
+            except OSError:
+                pass
+
+    def size(self) -> int:
+        """
+        Returns the size of the cached exports together, in bytes.
+        """
+        return sum(stat.st_size for _, stat in self._entries())
+
+    def _entries(self) -> list:
+        """
+        Returns the path and stat of every cached export.
+        """
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if not _ENTRY.fullmatch(name):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                entries.append((path, os.stat(path)))
+            except FileNotFoundError:
+                pass
+        return entries
@@ -9,18 +9,30 @@ from PySide6.QtWidgets import (
     QPushButton,
     QHBoxLayout,
 )
-from PySide6.QtCore import Signal
+from PySide6.QtCore import Signal, Qt
 from PySide6.QtGui import QIcon
 
 from FigureForge.__init__ import CURRENT_DIR
 
 
+class ArtistItem(QTreeWidgetItem):
+    """A tree item that sorts numerically by draw time."""
+
+    def __lt__(self, other):
+        column = self.treeWidget().sortColumn()
+        if column == 1:
+            return (self.data(1, Qt.UserRole) or 0) < (other.data(1, Qt.UserRole) or 0)
+        return self.text(column) < other.text(column)
+
+
 class FigureExplorer(QWidget):
     itemSelected = Signal(object)
     refreshTree = Signal()
 
     def __init__(self):
         super().__init__()
+        self.profiler = None
+        self.last_figure = None
         self.init_ui()
 
     def init_ui(self):
@@ -44,13 +56,62 @@ class FigureExplorer(QWidget):
         self.setLayout(layout)
 
     def build_tree(self, figure, last_obj=None):
+        self.last_figure = figure
+        self.tree.setSortingEnabled(False)
         self.tree.clear()
-        self.tree.addTopLevelItem(QTreeWidgetItem(["Figure"]))
+        self.tree.addTopLevelItem(ArtistItem(["Figure"]))
         root = self.tree.topLevelItem(0)
         root.reference = figure
+        self.set_draw_time(root)
         for i, item in enumerate(root.reference.get_children()):
             self.add_item(root, item, last_obj)
         self.tree.expandItem(root)
+        if self.profiler is not None:
+            self.tree.setSortingEnabled(True)
+
+    def show_draw_times(self, profiler):
+        """
+        Shows the draw times of the last profiled render next to each artist, sorted
+        slowest first.
+
+        Args:
+            profiler (DrawProfiler): The profiler that timed the render.
+        """
+        first_time = self.profiler is None
+        self.profiler = profiler
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Artist", "Draw Time"])
+        self.tree.header().show()
+        if self.last_figure is not None:
+            current = self.tree.currentItem()
+            self.build_tree(
+                self.last_figure, current.reference if current is not None else None
+            )
+        if first_time:
+            self.tree.sortByColumn(1, Qt.DescendingOrder)
+
+    def clear_draw_times(self):
+        """
+        Hides the draw times and restores the draw order of the tree.
+        """
+        self.profiler = None
+        self.tree.setSortingEnabled(False)
+        self.tree.setColumnCount(1)
+        self.tree.header().hide()
+        if self.last_figure is not None:
+            current = self.tree.currentItem()
+            self.build_tree(
+                self.last_figure, current.reference if current is not None else None
+            )
+
+    def set_draw_time(self, item):
+        if self.profiler is None:
+            return
+        total = self.profiler.total_time(item.reference) * 1000
+        self_time = self.profiler.self_time(item.reference) * 1000
+        item.setText(1, f"{total:.1f} ms")
+        item.setData(1, Qt.UserRole, total)
+        item.setToolTip(1, f"Total: {total:.2f} ms\nSelf: {self_time:.2f} ms")
 
     def add_item(self, parent, child, last_obj):
         class_name = child.__class__.__name__
@@ -58,9 +119,10 @@ class FigureExplorer(QWidget):
             label = f"{class_name} - {child.get_label()}"
         else:
             label = class_name
-        parent.addChild(QTreeWidgetItem([label]))
-        root = parent.child(parent.childCount() - 1)
+        root = ArtistItem([label])
+        parent.addChild(root)
         root.reference = child
+        self.set_draw_time(root)
 
         if last_obj is not None and last_obj == child:
             self.tree.setCurrentItem(root)
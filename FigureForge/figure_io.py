@@ -0,0 +1,1170 @@
+"""
+Reading and writing figures in the FigureForge container format (.ffig).
+
+A container holds a pickled figure with its large arrays stored separately:
+
+    header      FFIG magic, format version, flags, manifest length (16 bytes)
+    manifest    UTF-8 JSON describing the blocks of the data section
+    data        an optional PNG thumbnail, the pickled figure, then one raw block
+                per array, each block aligned to ALIGNMENT bytes from the start of
+                the file
+
+The figure is pickled with protocol 5, which hands contiguous NumPy arrays to the
+writer as out-of-band buffers instead of copying them into the pickle. Views, such
+as the x and y columns matplotlib keeps of a line's data, are stored as a reference
+to the array they view, so shared data is written once and stays shared after
+loading. The pickle itself therefore only holds the artist state, and the arrays
+are written and read as raw bytes, so saving and loading scale with the size of the
+data at disk speed. Alternatively, the data section can be memory-mapped, so that
+arrays are only paged in from the file when they are used.
+
+The manifest may also hold a preview of the figure: its title, the number of Axes
+and artists, the size of its data, and the thumbnail, which is written first so
+that the whole preview is at the start of the file. `read_preview` reads only that
+much, so figures can be previewed instantly however large they are.
+
+A project bundle (.ffproj) holds several figures in one container, such as every
+open tab. Its data section holds the pickled state of each figure and the arrays of
+all of them, with arrays of identical contents, keyed by their BLAKE2 hash, stored
+once. When a bundle is loaded, such arrays are views of the same memory, so
+figures of the same dataset share it in memory as well as on disk. Bundles are
+version 2 of the format, and single figures are still written as version 1, so that
+earlier versions of FigureForge can read them.
+
+Figure files, containers or plain pickles, may also be compressed as a whole with
+gzip, bz2 or lzma. They are compressed and decompressed as they are written and
+read, without holding the whole file in memory, and the codec is recognised from
+the magic bytes at the start of the file. Compressed containers cannot be
+memory-mapped.
+
+Files are saved by writing a new file and moving it over the old one, which leaves
+figures memory-mapped from the old file intact. Windows refuses to replace a file
+that is mapped, though, so figures that may be saved over the file they were read
+from should only be memory-mapped where CAN_REPLACE_MAPPED is true.
+"""
+
+import io
+import os
+import gc
+import bz2
+import gzip
+import lzma
+import hashlib
+import mmap
+import types
+import copyreg
+import secrets
+import json
+import pickle
+import struct
+import functools
+from contextlib import contextmanager
+
+import numpy as np
+import matplotlib
+import matplotlib.image
+from matplotlib.axis import Axis
+from matplotlib.collections import Collection, _CollectionWithSizes
+from matplotlib.colors import Colormap
+from matplotlib.figure import Figure
+from matplotlib.legend import Legend
+from matplotlib.lines import Line2D
+from matplotlib.layout_engine import ConstrainedLayoutEngine, TightLayoutEngine
+from matplotlib.offsetbox import AnnotationBbox, OffsetBox
+from matplotlib.patches import FancyArrowPatch
+from matplotlib.spines import Spine
+from matplotlib.text import Annotation, Text
+from matplotlib.transforms import Affine2D, Bbox, BboxBase, TransformNode
+
+from FigureForge import __version__
+
+MAGIC = b"FFIG"
+ALIGNMENT = 64
+EXTENSION = ".ffig"
+BUNDLE_EXTENSION = ".ffproj"
+
+# The newest version of the format, and the versions figures and bundles are
+# written as
+VERSION = 2
+FIGURE_VERSION = 1
+BUNDLE_VERSION = 2
+
+# The size of the hashes arrays are deduplicated by in bundles, in bytes
+DIGEST_SIZE = 16
+
+# Magic, format version, flags, manifest length
+HEADER = struct.Struct("<4sHHQ")
+
+# The largest read or write made between two progress reports, in bytes
+CHUNK_SIZE = 4 * 1024 * 1024
+
+# The magic bytes at the start of files compressed with each supported codec
+COMPRESSIONS = {
+    "gzip": b"\x1f\x8b",
+    "bz2": b"BZh",
+    "lzma": b"\xfd7zXZ\x00",
+}
+
+# The gzip level, trading size for speed as zlib does by default
+GZIP_LEVEL = 6
+
+# The longest side of the thumbnails stored in containers, in pixels
+THUMBNAIL_SIZE = 256
+
+# The most times figures with a tight layout are laid out to settle before hashed
+TIGHT_LAYOUT_PASSES = 10
+
+# Arrays smaller than this, in bytes, are copied into the pickled state rather than
+# shared with snapshots. These are mostly the matrices of transforms and the points
+# of bounding boxes, which matplotlib modifies in place, such as on resizing.
+SHARED_ARRAY_SIZE = 4096
+
+# Whether a file may be replaced while it is memory-mapped, which Windows refuses
+CAN_REPLACE_MAPPED = os.name != "nt"
+
+
+def is_container(file_name) -> bool:
+    """
+    Returns whether a file is a FigureForge container, judging by its contents.
+
+    Args:
+        file_name (str): The name of the file to check.
+    """
+    try:
+        with open_read(file_name) as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except (OSError, EOFError, lzma.LZMAError):
+        return False
+
+
+def compression(file_name):
+    """
+    Returns the codec a file is compressed with, judging by its magic bytes, or None
+    if it is not compressed.
+
+    Args:
+        file_name (str): The name of the file to check.
+    """
+    with open(file_name, "rb") as f:
+        return _detect(f)
+
+
+def save_figure(figure, file_name, progress=None, compression=None, image=None) -> None:
+    """
+    Saves a figure as a FigureForge container, with a preview.
+
+    Args:
+        figure (Figure): The figure to save.
+        file_name (str): The name of the file to write.
+        progress (callable): Called with the number of bytes written so far and
+            the size of the file, if given. See ProgressFile.
+        compression (str): The codec to compress the file with, one of
+            COMPRESSIONS, or None to leave it uncompressed.
+        image (np.ndarray): An RGBA rendering of the figure to make the thumbnail
+            from, if any. See `describe`.
+    """
+    write_snapshot(
+        snapshot(figure),
+        file_name,
+        progress=progress,
+        compression=compression,
+        preview=describe(figure, image),
+    )
+
+
+def restore(blocks):
+    """
+    Recreates a figure from a snapshot returned by `snapshot`. The arrays of the
+    figure are views of those of the snapshot, rather than copies, except for
+    arrays smaller than SHARED_ARRAY_SIZE. Figures restored from the same snapshot
+    can therefore be resized and otherwise changed independently.
+
+    Args:
+        blocks (list): The snapshot.
+
+    Returns:
+        The Figure.
+    """
+    return _loads(blocks[0], blocks[1:])
+
+
+def describe(figure, image=None) -> dict:
+    """
+    Returns the preview of a figure to store in its container.
+
+    Args:
+        figure (Figure): The figure to describe.
+        image (np.ndarray): An RGBA rendering of the figure, such as the buffer of
+            its canvas, to make the thumbnail from. The figure is not rendered for
+            the preview, so it has no thumbnail without one.
+
+    Returns:
+        A dict with the title of the figure, its number of Axes and of artists, and
+        its thumbnail as PNG data, or None.
+    """
+    title = figure.get_suptitle()
+    for ax in figure.axes:
+        title = title or ax.get_title()
+    artists = 0
+    stack = [figure]
+    while stack:
+        artists += 1
+        stack.extend(stack.pop().get_children())
+    return {
+        "title": title,
+        "axes": len(figure.axes),
+        "artists": artists,
+        "thumbnail": _thumbnail(image) if image is not None else None,
+    }
+
+
+def snapshot(figure) -> list:
+    """
+    Pickles the state of a figure without copying its arrays, so that it can be
+    written out later, or on another thread.
+
+    This only takes as long as pickling the artists themselves, however large their
+    data. Arrays of at least SHARED_ARRAY_SIZE bytes are referenced rather than
+    copied, so they must not be modified in place until the snapshot has been
+    written. matplotlib replaces data arrays rather than modifying them when
+    artists are edited.
+
+    Args:
+        figure (Figure): The figure to snapshot.
+
+    Returns:
+        The blocks of the container's data section: the pickled state, then one
+        block per array.
+    """
+    buffers = []
+    stream = io.BytesIO()
+    pickler = _Pickler(stream, buffer_callback=buffers.append)
+    # Pickling allocates enough to set off full garbage collections, which are slow
+    # for large figures and would also stall every other thread
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        pickler.dump(figure)
+        pickler.release()
+    finally:
+        if collecting:
+            gc.enable()
+    return [stream.getbuffer()] + [buffer.raw() for buffer in buffers]
+
+
+def digest(figure) -> str:
+    """
+    Returns a hash of the state of a figure, which is the same for figures in the
+    same state, whichever process they were created or loaded in.
+
+    The figure is pickled as by `snapshot`, and the pickle and arrays are hashed
+    as they are produced. The figure is first brought up to date as a draw would,
+    without rendering it: laid out, autoscaled and ticked. State that only links
+    objects, or that a draw recomputes, is left out, so that the hash does not
+    change when the figure is drawn, laid out again, resized and resized back, or
+    snapshot and restored: the parents of transforms, which are keyed by their
+    ids, callbacks, whether artists are stale, what transforms, bounding boxes,
+    lines, collections and colormaps cache, and the positions set by the layout
+    engine, Axes locators and aspect ratios, and of text, boxes and annotation
+    arrows placed when drawn, and the ticks of axes that are no longer in use. So
+    is whether and how pyplot manages the figure.
+
+    Args:
+        figure (Figure): The figure to hash.
+
+    Returns:
+        The hash, as a hexadecimal string.
+    """
+    derived = _derived_state(figure)
+    hasher = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    buffers = []
+    pickler = _DigestPickler(
+        _HashWriter(hasher), buffer_callback=buffers.append, derived=derived
+    )
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        pickler.dump(figure)
+        pickler.release()
+    finally:
+        if collecting:
+            gc.enable()
+    for buffer in buffers:
+        data = buffer.raw()
+        hasher.update(struct.pack("<Q", data.nbytes))
+        hasher.update(data)
+    return hasher.hexdigest()
+
+
+def write_snapshot(
+    blocks, file_name, metadata=None, progress=None, compression=None, preview=None
+) -> None:
+    """
+    Writes a snapshot returned by `snapshot` as a FigureForge container.
+
+    Args:
+        blocks (list): The snapshot to write.
+        file_name (str): The name of the file to write.
+        metadata (dict): JSON-serializable data to store in the manifest, if any.
+        progress (callable): Called with the number of bytes written so far and
+            the size of the file before compression, if given. See ProgressFile.
+        compression (str): The codec to compress the file with, one of
+            COMPRESSIONS, or None to leave it uncompressed.
+        preview (dict): The preview of the figure returned by `describe`, if any.
+    """
+    thumbnail = preview and preview["thumbnail"]
+    data = ([memoryview(thumbnail)] if thumbnail else []) + blocks
+    state = len(data) - len(blocks)
+    offsets = _layout(data)
+
+    manifest = {
+        "version": FIGURE_VERSION,
+        "figureforge": __version__,
+        "matplotlib": matplotlib.__version__,
+        "state": {"offset": offsets[state], "length": blocks[0].nbytes},
+        "buffers": [
+            {"offset": offset, "length": block.nbytes}
+            for offset, block in zip(offsets[state + 1 :], blocks[1:])
+        ],
+    }
+    if metadata is not None:
+        manifest["metadata"] = metadata
+    if preview is not None:
+        manifest["preview"] = {
+            **preview,
+            "data_bytes": sum(block.nbytes for block in blocks[1:]),
+            "thumbnail": (
+                {"offset": offsets[0], "length": len(thumbnail)} if thumbnail else None
+            ),
+        }
+    _write_container(file_name, manifest, data, offsets, progress, compression)
+
+
+def write_bundle(snapshots, file_name, progress=None, compression=None) -> None:
+    """
+    Writes the snapshots of several figures as a project bundle, storing arrays
+    with identical contents once.
+
+    Args:
+        snapshots (list): A (blocks, metadata) tuple per figure, with a snapshot
+            returned by `snapshot` and JSON-serializable data to store with it.
+        file_name (str): The name of the file to write.
+        progress (callable): Called with the number of bytes written so far and
+            the size of the file before compression, if given, and with 0 and 0
+            while arrays are being hashed. See ProgressFile.
+        compression (str): The codec to compress the file with, one of
+            COMPRESSIONS, or None to leave it uncompressed.
+    """
+    data = []
+    indices = {}
+    figures = []
+    for blocks, metadata in snapshots:
+        refs = []
+        for block in blocks:
+            if progress is not None:
+                progress(0, 0)
+            digest = hashlib.blake2b(block, digest_size=DIGEST_SIZE).digest()
+            key = (block.nbytes, digest)
+            if key not in indices:
+                indices[key] = len(data)
+                data.append(block)
+            refs.append(indices[key])
+        figures.append({"state": refs[0], "buffers": refs[1:], "metadata": metadata})
+    offsets = _layout(data)
+
+    manifest = {
+        "version": BUNDLE_VERSION,
+        "figureforge": __version__,
+        "matplotlib": matplotlib.__version__,
+        "blocks": [
+            {"offset": offset, "length": block.nbytes}
+            for offset, block in zip(offsets, data)
+        ],
+        "figures": figures,
+    }
+    _write_container(
+        file_name, manifest, data, offsets, progress, compression, BUNDLE_VERSION
+    )
+
+
+def load_figure(file_name, memory_map=False, progress=None):
+    """
+    Loads a figure from a FigureForge container.
+
+    By default the data section is read into memory in a single read. With
+    `memory_map`, it is mapped copy-on-write instead, so the operating system only
+    reads the parts of it that are used, and may drop them again under memory
+    pressure. Either way, the figure's arrays are views into the data rather than
+    copies, and modifying them never changes the file. Compressed containers are
+    always decompressed into memory.
+
+    Args:
+        file_name (str): The name of the file to read.
+        memory_map (bool): Whether to memory-map the data instead of reading it.
+        progress (callable): Called with the number of bytes read so far and the
+            size of the file, if given. See ProgressFile. For compressed files,
+            these are the compressed bytes.
+
+    Returns:
+        The loaded Figure.
+
+    Raises:
+        ValueError: If the file is not a container, is a project bundle, is
+            truncated, or was written by a newer version of the format.
+    """
+    with open_read(file_name, progress) as f:
+        manifest, data_start = _read_manifest(f)
+        if "figures" in manifest:
+            raise ValueError("The file is a project bundle, not a single figure.")
+        blocks = [manifest["state"]] + manifest["buffers"]
+        view = _read_data(f, file_name, data_start, blocks, memory_map)
+
+    state = manifest["state"]
+    buffers = [
+        view[block["offset"] : block["offset"] + block["length"]]
+        for block in manifest["buffers"]
+    ]
+    return _loads(view[state["offset"] : state["offset"] + state["length"]], buffers)
+
+
+def load_bundle(file_name, memory_map=False, progress=None) -> list:
+    """
+    Loads the figures of a project bundle. Arrays stored once for several figures
+    are views of the same memory in each of them, so they must not be modified in
+    place. matplotlib replaces arrays rather than modifying them when artists are
+    edited.
+
+    Args:
+        file_name (str): The name of the file to read.
+        memory_map (bool): Whether to memory-map the data instead of reading it.
+            See `load_figure`.
+        progress (callable): Called with the number of bytes read so far and the
+            size of the file, if given. See ProgressFile.
+
+    Returns:
+        A (Figure, metadata) tuple per figure, in the order they were written.
+
+    Raises:
+        ValueError: If the file is not a project bundle, is truncated, or was
+            written by a newer version of the format.
+    """
+    with open_read(file_name, progress) as f:
+        manifest, data_start = _read_manifest(f)
+        if "figures" not in manifest:
+            raise ValueError("Not a FigureForge project bundle.")
+        view = _read_data(f, file_name, data_start, manifest["blocks"], memory_map)
+
+    blocks = [
+        view[block["offset"] : block["offset"] + block["length"]]
+        for block in manifest["blocks"]
+    ]
+    return [
+        (
+            _loads(
+                blocks[figure["state"]],
+                [_shared(blocks[index]) for index in figure["buffers"]],
+            ),
+            figure["metadata"],
+        )
+        for figure in manifest["figures"]
+    ]
+
+
+def _shared(block):
+    """
+    Returns a block of a bundle to share with every array stored in it, or a copy
+    for a small one. Bundles written before small arrays were kept out of
+    snapshots, such as those of transforms, which are modified in place, may
+    store them once for several arrays.
+    """
+    return block if len(block) >= SHARED_ARRAY_SIZE else bytearray(block)
+
+
+def unpickle(file, buffers=()):
+    """
+    Unpickles a figure from a binary file. Unlike with pickle.load, figures pickled
+    from pyplot are not registered with pyplot again, which would create a pyplot
+    window for them on the calling thread, such as a file worker, that is never
+    closed.
+
+    Args:
+        file: The file to read, opened for binary reading.
+        buffers (list): The out-of-band buffers of the pickle, if any.
+
+    Returns:
+        The Figure.
+    """
+    return _Unpickler(file, buffers=buffers).load()
+
+
+def is_bundle(file_name) -> bool:
+    """
+    Returns whether a file is a project bundle, judging by its contents.
+
+    Args:
+        file_name (str): The name of the file to check.
+    """
+    try:
+        return "figures" in read_manifest(file_name)
+    except (OSError, ValueError, EOFError, lzma.LZMAError):
+        return False
+
+
+class ProgressFile:
+    """
+    Wraps a binary file, and reports the number of bytes read from or written to it
+    through a callback. Large reads and writes are split into chunks of at most
+    CHUNK_SIZE bytes, with a report after each, so that the callback can follow the
+    progress of a long read or write and cancel it by raising an exception.
+
+    Any other attribute is looked up on the wrapped file.
+    """
+
+    def __init__(self, file, total, progress) -> None:
+        """
+        Initializes a new instance of the ProgressFile class.
+
+        Args:
+            file: The binary file to wrap.
+            total (int): The expected number of bytes, or 0 if unknown.
+            progress (callable): Called with the number of bytes read or written so
+                far and `total`.
+        """
+        self._file = file
+        self.total = total
+        self.done = 0
+        self._progress = progress
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+    def read(self, size=-1) -> bytes:
+        if 0 <= size <= CHUNK_SIZE:
+            return self._advance(self._file.read(size))
+        data = bytearray()
+        while size < 0 or len(data) < size:
+            limit = CHUNK_SIZE if size < 0 else min(CHUNK_SIZE, size - len(data))
+            chunk = self._advance(self._file.read(limit))
+            if not chunk:
+                break
+            data += chunk
+        return bytes(data)
+
+    def readinto(self, buffer) -> int:
+        view = memoryview(buffer).cast("B")
+        position = 0
+        while position < len(view):
+            count = self._file.readinto(view[position : position + CHUNK_SIZE])
+            if not count:
+                break
+            position += count
+            self._report(count)
+        return position
+
+    def readline(self, size=-1) -> bytes:
+        return self._advance(self._file.readline(size))
+
+    def write(self, data) -> int:
+        view = memoryview(data).cast("B")
+        for position in range(0, len(view), CHUNK_SIZE):
+            chunk = view[position : position + CHUNK_SIZE]
+            self._file.write(chunk)
+            self._report(len(chunk))
+        return len(view)
+
+    def _advance(self, data) -> bytes:
+        self._report(len(data))
+        return data
+
+    def _report(self, count) -> None:
+        self.done += count
+        self._progress(self.done, self.total)
+
+
+@contextmanager
+def atomic_write(file_name, compression=None):
+    """
+    A context that opens a temporary file for binary writing next to `file_name`,
+    and moves it over `file_name` once the context exits without an error.
+
+    Writing a new file rather than truncating the existing one keeps the old file
+    intact if saving fails, and keeps the data of figures memory-mapped from it
+    valid.
+
+    Args:
+        file_name (str): The name of the file to write.
+        compression (str): The codec to compress the data with as it is written,
+            one of COMPRESSIONS, or None to write it as is.
+    """
+    directory = os.path.dirname(os.path.abspath(file_name))
+    temp_name = os.path.join(
+        directory, f".{os.path.basename(file_name)}.{secrets.token_hex(4)}.tmp"
+    )
+    # Unlike tempfile.mkstemp, this creates the file with the permissions of any
+    # other new file, which it keeps once it replaces `file_name`
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    fd = os.open(temp_name, flags, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            if compression is None:
+                yield f
+            else:
+                with _compressor(f, compression, os.path.basename(file_name)) as c:
+                    yield c
+        os.replace(temp_name, file_name)
+    except BaseException:
+        os.remove(temp_name)
+        raise
+
+
+@contextmanager
+def open_read(file_name, progress=None):
+    """
+    A context that opens a file for binary reading, decompressing it as it is read
+    if it starts with the magic bytes of one of COMPRESSIONS.
+
+    Args:
+        file_name (str): The name of the file to read.
+        progress (callable): Called with the number of bytes read from the file so
+            far and its size, if given. See ProgressFile.
+    """
+    with open(file_name, "rb") as f:
+        codec = _detect(f)
+        if progress is not None:
+            f = ProgressFile(f, os.fstat(f.fileno()).st_size, progress)
+        if codec is None:
+            yield f
+        else:
+            with _decompressor(f, codec) as d:
+                yield d
+
+
+def read_manifest(file_name) -> dict:
+    """
+    Returns the manifest of a FigureForge container without loading the figure.
+
+    Args:
+        file_name (str): The name of the file to read.
+    """
+    with open_read(file_name) as f:
+        return _read_manifest(f)[0]
+
+
+def read_preview(file_name):
+    """
+    Returns the preview stored in a container, reading only the start of the file.
+
+    Args:
+        file_name (str): The name of the file to read.
+
+    Returns:
+        The preview returned by `describe` when the figure was saved, with the
+        total size of its arrays in bytes as "data_bytes", or None if the file is
+        not a container or has no preview.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open_read(file_name) as f:
+        try:
+            manifest, data_start = _read_manifest(f)
+        except (ValueError, EOFError, lzma.LZMAError):
+            return None
+        preview = manifest.get("preview")
+        if preview is None:
+            return None
+        thumbnail = preview["thumbnail"]
+        if thumbnail is not None:
+            f.read(data_start + thumbnail["offset"] - f.tell())
+            preview["thumbnail"] = f.read(thumbnail["length"])
+    return preview
+
+
+def _read_manifest(f) -> tuple:
+    """
+    Reads the header and manifest from the start of an open container, and returns
+    the manifest and the offset of the data section.
+    """
+    header = f.read(HEADER.size)
+    if len(header) < HEADER.size:
+        raise ValueError("Not a FigureForge figure file.")
+    magic, version, _, length = HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("Not a FigureForge figure file.")
+    if version > VERSION:
+        raise ValueError(
+            f"The file uses version {version} of the figure format, but this "
+            f"version of FigureForge only supports up to version {VERSION}."
+        )
+    manifest = json.loads(f.read(length).decode("utf-8"))
+    return manifest, _align(HEADER.size + length)
+
+
+def _layout(blocks) -> list:
+    """
+    Returns the offsets of blocks in the data section of a container, relative to
+    its start.
+    """
+    offsets = []
+    position = 0
+    for block in blocks:
+        offsets.append(position)
+        position = _align(position + block.nbytes)
+    return offsets
+
+
+def _write_container(
+    file_name,
+    manifest,
+    blocks,
+    offsets,
+    progress=None,
+    compression=None,
+    version=FIGURE_VERSION,
+) -> None:
+    """
+    Writes a container with a manifest, and blocks at offsets returned by
+    `_layout`.
+    """
+    manifest = json.dumps(manifest).encode("utf-8")
+    data_start = _align(HEADER.size + len(manifest))
+    size = data_start + offsets[-1] + blocks[-1].nbytes
+
+    with atomic_write(file_name, compression) as f:
+        if progress is not None:
+            f = ProgressFile(f, size, progress)
+        f.write(HEADER.pack(MAGIC, version, 0, len(manifest)))
+        f.write(manifest)
+        for offset, block in zip(offsets, blocks):
+            f.write(bytes(data_start + offset - f.tell()))
+            f.write(block)
+
+
+def _read_data(f, file_name, data_start, blocks, memory_map) -> memoryview:
+    """
+    Reads or memory-maps the data section of a container opened by `open_read`,
+    after its manifest has been read, and returns it.
+    """
+    if memory_map and compression(file_name) is None:
+        # The mapping stays valid after the file is closed, for as long as the
+        # arrays viewing it are alive
+        view = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY))
+        return view[data_start:]
+
+    # Skip the padding by reading it, as compressed streams can only be read in
+    # order anyway
+    f.read(data_start - f.tell())
+    size = max(block["offset"] + block["length"] for block in blocks)
+    view = memoryview(bytearray(size))
+    position = 0
+    while position < size:
+        count = f.readinto(view[position:])
+        if not count:
+            raise ValueError("The figure file is truncated.")
+        position += count
+    return view
+
+
+def _thumbnail(image) -> bytes:
+    """
+    Scales down an RGBA image to fit in THUMBNAIL_SIZE, averaging the pixels of
+    each block, and returns it as PNG data.
+    """
+    step = -(-max(image.shape[:2]) // THUMBNAIL_SIZE)
+    height, width = image.shape[0] // step, image.shape[1] // step
+    image = image[: height * step, : width * step]
+    image = image.reshape(height, step, width, step, 4).mean(axis=(1, 3))
+    stream = io.BytesIO()
+    matplotlib.image.imsave(stream, image.astype(np.uint8), format="png")
+    return stream.getvalue()
+
+
+def _detect(f):
+    """
+    Returns the codec an open file is compressed with, or None, leaving the file
+    at its start.
+    """
+    start = f.read(max(len(magic) for magic in COMPRESSIONS.values()))
+    f.seek(0)
+    for codec, magic in COMPRESSIONS.items():
+        if start.startswith(magic):
+            return codec
+    return None
+
+
+def _compressor(f, codec, name):
+    """
+    Returns a file that compresses the data written to it into an open file.
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(name, "wb", compresslevel=GZIP_LEVEL, fileobj=f)
+    if codec == "bz2":
+        return bz2.BZ2File(f, "wb")
+    if codec == "lzma":
+        return lzma.LZMAFile(f, "wb")
+    raise ValueError(f"Unknown compression: {codec}")
+
+
+def _decompressor(f, codec):
+    """
+    Returns a file that decompresses the data read from an open file.
+    """
+    if codec == "gzip":
+        return gzip.GzipFile(fileobj=f, mode="rb")
+    if codec == "bz2":
+        return bz2.BZ2File(f, "rb")
+    return lzma.LZMAFile(f, "rb")
+
+
+class _Pickler(pickle.Pickler):
+    """
+    Pickles views of NumPy arrays as views, rather than as copies of their data.
+
+    The pickler also keeps the reductions of the objects it pickles, such as the
+    state of every artist, so that `release` can free them one at a time. Otherwise
+    they would all be freed by a single call when the pickler is discarded, which
+    holds the GIL for as long as that takes and stalls every other thread.
+    """
+
+    def __init__(self, file, buffer_callback) -> None:
+        super().__init__(file, protocol=5, buffer_callback=buffer_callback)
+        self._reductions = []
+
+    def reducer_override(self, obj):
+        if type(obj) is np.ndarray:
+            return self._reduce_array(obj)
+        if isinstance(obj, _GLOBALS) or type(obj) in copyreg.dispatch_table:
+            return NotImplemented
+        reduction = obj.__reduce_ex__(5)
+        if isinstance(reduction, str):
+            return NotImplemented
+        self._reductions.append(reduction)
+        return reduction
+
+    def release(self) -> None:
+        """
+        Frees the objects created while pickling, one at a time.
+        """
+        self.clear_memo()
+        while self._reductions:
+            self._reductions.pop()
+
+    def _reduce_array(self, obj):
+        if not isinstance(obj.base, np.ndarray):
+            if obj.nbytes < SHARED_ARRAY_SIZE:
+                # Pickled in-band, as protocol 4 would
+                return obj.__reduce__()
+            return NotImplemented
+        base = obj.base
+        while isinstance(base.base, np.ndarray):
+            base = base.base
+        if type(base) is not np.ndarray or not (
+            base.flags.c_contiguous or base.flags.f_contiguous
+        ):
+            return NotImplemented
+        offset = (
+            obj.__array_interface__["data"][0] - base.__array_interface__["data"][0]
+        )
+        return _array_view, (base, offset, obj.shape, obj.strides, obj.dtype)
+
+
+class _Unpickler(pickle.Unpickler):
+    """
+    Unpickles figures without registering them with pyplot. See `unpickle`.
+    """
+
+    def find_class(self, module, name):
+        cls = super().find_class(module, name)
+        if isinstance(cls, type) and issubclass(cls, Figure):
+            return _unregistered(cls)
+        return cls
+
+
+@functools.cache
+def _unregistered(cls) -> type:
+    """
+    Returns a subclass of a Figure class whose instances turn into instances of
+    that class as they are unpickled, ignoring whether pyplot managed them.
+    """
+
+    def __setstate__(self, state):
+        state["_restore_to_pylab"] = False
+        self.__class__ = cls
+        cls.__setstate__(self, state)
+
+    return type(cls.__name__, (cls,), {"__setstate__": __setstate__})
+
+
+def _loads(data, buffers=()):
+    return unpickle(io.BytesIO(data), buffers)
+
+
+class _DigestPickler(_Pickler):
+    """
+    Pickles a figure for `digest`, leaving out the state that changes whenever the
+    figure is drawn.
+    """
+
+    def __init__(self, file, buffer_callback, derived) -> None:
+        """
+        Args:
+            derived (dict): The keys of the state of particular objects to leave
+                out, by the id of the object. See `_derived_state`.
+        """
+        super().__init__(file, buffer_callback)
+        self._derived = derived
+
+    def reducer_override(self, obj):
+        if isinstance(obj, matplotlib.cbook.CallbackRegistry):
+            return type(None), ()
+        if isinstance(obj, matplotlib.cbook.Grouper):
+            # The groups are pickled as sets, in the order of the ids of their
+            # members, so they are hashed as lists in the order they were joined
+            return type(obj), (), {"groups": list(obj)}
+        if isinstance(obj, np.ma.MaskedArray):
+            # The fill value is left unset until first gotten, and is set once
+            # unpickled, and the mask may or may not be expanded to an array
+            return type(obj), (obj.data, np.ma.getmaskarray(obj), obj.fill_value)
+        reduction = super().reducer_override(obj)
+        if (
+            isinstance(reduction, tuple)
+            and len(reduction) > 2
+            and isinstance(reduction[2], dict)
+        ):
+            state = reduction[2]
+            unhashed = _UNHASHED | self._derived.get(id(obj), set())
+            unhashed = unhashed | _cached_state(type(obj))
+            if not unhashed.isdisjoint(state):
+                state = {
+                    key: value for key, value in state.items() if key not in unhashed
+                }
+            if isinstance(obj, Axis) and "majorTicks" in state:
+                # Ticks are added as more are needed, but never removed, so only
+                # those in use are hashed, as listed by get_children
+                state = {
+                    **state,
+                    "majorTicks": obj.get_major_ticks(),
+                    "minorTicks": obj.get_minor_ticks(),
+                }
+            if state is not reduction[2]:
+                reduction = reduction[:2] + (state,) + reduction[3:]
+        return reduction
+
+    def _reduce_array(self, obj):
+        if obj.dtype.hasobject:
+            return NotImplemented
+        # Arrays are hashed by their contents, whichever memory they share. The
+        # reduction is only hashed, never unpickled.
+        data = np.ascontiguousarray(obj).view(np.uint8)
+        digest = hashlib.blake2b(data, digest_size=DIGEST_SIZE).digest()
+        return np.ndarray, (obj.shape, obj.dtype), digest
+
+    def persistent_id(self, obj):
+        # Pickles equal strings, tuples and dtypes alike, whether or not they are
+        # the same object, as the pickle memo would otherwise tell them apart
+        if type(obj) is str:
+            return obj.encode("utf-8", "surrogatepass")
+        if type(obj) is tuple:
+            return list(obj)
+        if isinstance(obj, np.dtype):
+            return [repr(obj)]
+        return None
+
+
+def _derived_state(figure) -> dict:
+    """
+    Brings a figure up to date as drawing it would, without rendering it: lays it
+    out with its layout engine, autoscales its view limits, applies the aspect
+    ratios and locators of its Axes, updates its ticks and maps the data of its
+    collections to colors. Returns the keys of the state of
+    objects that are only placed by a draw, by the id of the object.
+    """
+    engine = figure.get_layout_engine()
+    laid_out = isinstance(engine, (ConstrainedLayoutEngine, TightLayoutEngine))
+    if isinstance(engine, TightLayoutEngine):
+        # Each layout starts from the last, so the figure is laid out until it
+        # settles, for it to be drawn the same however often it was drawn before
+        for _ in range(TIGHT_LAYOUT_PASSES):
+            params = _subplot_params(figure)
+            engine.execute(figure)
+            if np.allclose(params, _subplot_params(figure), rtol=0, atol=1e-4):
+                break
+    elif laid_out:
+        # The ticks depend on the size the layout gives the axes
+        engine.execute(figure)
+    derived = {}
+
+    def derive(obj, keys):
+        derived[id(obj)] = derived.get(id(obj), frozenset()) | keys
+
+    if isinstance(engine, TightLayoutEngine):
+        derive(figure.subplotpars, _SUBPLOT_PARAMS)
+    axes = list(figure.axes)
+    while axes:
+        ax = axes.pop()
+        axes.extend(ax.child_axes)
+        # Getting the view limits autoscales them if needed
+        ax.viewLim
+        locator = ax.get_axes_locator()
+        ax.apply_aspect(locator(ax, figure._get_renderer()) if locator else None)
+        if laid_out or locator is not None:
+            derive(ax._originalPosition, _BBOX_POINTS)
+            derive(ax._position, _BBOX_POINTS)
+        elif ax.get_aspect() != "auto":
+            # The position is shrunk to the aspect ratio from the original one
+            derive(ax._position, _BBOX_POINTS)
+        for axis in ax._axis_map.values():
+            # Creates and places the ticks for the view limits, as a draw would
+            axis._update_ticks()
+            if axis.axis_name == "x" and not hasattr(axis, "_tick_position"):
+                # Defaulted when the offset text is first placed
+                axis._tick_position = "bottom"
+            if axis._autolabelpos:
+                derive(axis.label, _TEXT_POSITION)
+            # Set from the formatter whenever the axis is drawn
+            derive(axis.offsetText, _OFFSET_TEXT)
+    for artist in figure.findobj():
+        # Transforms left unset are set to defaults when first gotten
+        artist.get_transform()
+        if isinstance(artist, Collection):
+            artist.get_offset_transform()
+            artist.update_scalarmappable()
+        elif isinstance(artist, Legend):
+            derive(artist.legendPatch, _PATCH_BOUNDS)
+        elif isinstance(artist, OffsetBox):
+            # Boxes are offset by their parents, legends' by a function of theirs
+            if not callable(artist._offset):
+                derive(artist, _OFFSET)
+            for transform in (
+                getattr(artist, "offset_transform", None),
+                getattr(artist, "ref_offset_transform", None),
+                getattr(artist, "dpi_transform", None),
+            ):
+                if transform is not None:
+                    derive(transform, _MATRIX)
+        elif isinstance(artist, Text) and artist.get_bbox_patch() is not None:
+            # Fitted around the text when it is drawn
+            derive(artist.get_bbox_patch(), _PATCH_BOUNDS | _TRANSFORM)
+        if isinstance(artist, AnnotationBbox):
+            derive(artist.patch, _PATCH_BOUNDS)
+        if isinstance(artist, Annotation):
+            # Placed by its text coordinates when drawn
+            derive(artist, _TRANSFORM)
+        if isinstance(artist, (Annotation, AnnotationBbox)) and artist.arrow_patch:
+            # Drawn from the annotated point to the text or box, where they are
+            artist.arrow_patch.get_transform()
+            derive(artist.arrow_patch, _ARROW_POSITIONS)
+            if isinstance(artist, Annotation) and "arrowstyle" not in artist.arrowprops:
+                # Styled from the width and shrink of the arrow, and from where
+                # the text is, when drawn
+                derive(artist, _ARROW_ANCHOR)
+                derive(artist.arrow_patch, _ARROW_STYLE)
+    return derived
+
+
+def _subplot_params(figure) -> list:
+    """
+    Returns the subplot parameters of a figure, as set by the tight layout.
+    """
+    return [getattr(figure.subplotpars, key) for key in sorted(_SUBPLOT_PARAMS)]
+
+
+@functools.cache
+def _cached_state(cls) -> frozenset:
+    """
+    Returns the keys of the state of a class that cache what its methods compute
+    from the rest of its state: the matrices and points of transforms and bounding
+    boxes computed from others, the paths of lines computed from their data, the
+    marker transforms of collections computed from their sizes and arrows scaled
+    to the resolution, and the lookup tables of colormaps.
+    """
+    keys = set()
+    if issubclass(cls, TransformNode):
+        keys.update(("_inverted", "_affine"))
+        if getattr(cls, "get_matrix", None) is not Affine2D.get_matrix:
+            keys.add("_mtx")
+        if issubclass(cls, BboxBase) and cls.get_points is not Bbox.get_points:
+            keys.update(_BBOX_POINTS)
+    if issubclass(cls, Line2D):
+        keys.update(_LINE_CACHE)
+    if issubclass(cls, _CollectionWithSizes):
+        # Scaled from the sizes to the resolution drawn at
+        keys.add("_transforms")
+    if issubclass(cls, FancyArrowPatch):
+        # Scaled to the resolution drawn at
+        keys.add("_dpi_cor")
+    if issubclass(cls, Spine):
+        # Spines are fitted to the view limits or axes when drawn
+        keys.add("_path")
+    if issubclass(cls, Colormap):
+        keys.update(("_lut", "_isinit"))
+    return frozenset(keys)
+
+
+class _HashWriter:
+    """
+    A file that hashes what is written to it.
+    """
+
+    def __init__(self, hasher) -> None:
+        self._hasher = hasher
+
+    def write(self, data) -> int:
+        self._hasher.update(data)
+        return len(data)
+
+
+def _array_view(base, offset, shape, strides, dtype) -> np.ndarray:
+    """
+    Recreates a view of an array. Used when unpickling.
+    """
+    return np.ndarray(shape, dtype, buffer=base, offset=offset, strides=strides)
+
+
+# Objects pickled by reference, which the pickler reduces itself
+_GLOBALS = (type, types.FunctionType, types.BuiltinFunctionType)
+
+# The attributes left out of digests, as they change whenever a figure is drawn, or
+# with whether and how pyplot manages the figure. See also _derived_state and
+# _cached_state.
+_UNHASHED = {
+    "_parents",
+    "_invalid",
+    "_transformed_path",
+    "stale",
+    "_stale",
+    "_number",
+    "_restore_to_pylab",
+}
+
+# The state of bounding boxes and text positioned by a draw
+_BBOX_POINTS = frozenset({"_points", "_minpos"})
+_TEXT_POSITION = frozenset({"_x", "_y"})
+_OFFSET_TEXT = _TEXT_POSITION | {"_text"}
+_PATCH_BOUNDS = frozenset({"_x", "_y", "_width", "_height", "_mutation_scale"})
+_SUBPLOT_PARAMS = frozenset({"left", "bottom", "right", "top", "wspace", "hspace"})
+_TRANSFORM = frozenset({"_transform", "_transformSet"})
+_ARROW_POSITIONS = frozenset({"_posA_posB", "_mutation_scale", "patchA"})
+_ARROW_STYLE = frozenset({"_arrow_transmuter", "shrinkA", "shrinkB"})
+_ARROW_ANCHOR = frozenset({"_arrow_relpos"})
+_OFFSET = frozenset({"_offset"})
+_MATRIX = frozenset({"_mtx"})
+
+# The state of lines computed from their data when they are drawn
+_LINE_CACHE = frozenset(
+    {
+        "_xy",
+        "_x",
+        "_y",
+        "_x_filled",
+        "_path",
+        "_invalidx",
+        "_invalidy",
+        "_subslice",
+        "ind_offset",
+    }
+)
+
+
+def _align(position) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
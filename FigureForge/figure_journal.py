@@ -0,0 +1,301 @@
+"""
+An append-only journal of the edits made to a saved figure.
+
+Rather than rewriting a whole figure file on every save, the edits made since the
+last full save are appended to a sidecar file next to it (`<file name>.journal`),
+and replayed on top of the figure when it is next opened:
+
+    header      FFJL magic, format version, and the size and modification time of
+                the figure file the journal applies to
+    entries     one length-prefixed pickled entry per edit
+
+Artists are identified in entries by their path from the figure, as the class name
+and index of each artist among the siblings of its class, following
+`get_children`. Since entries are replayed in the order they were made, each path
+resolves against the figure as it was when the edit was made.
+
+A journal only applies to the exact figure file it was started for. If the file
+is replaced without removing the journal, the journal is ignored.
+"""
+
+import os
+import pickle
+import struct
+
+MAGIC = b"FFJL"
+VERSION = 1
+SUFFIX = ".journal"
+
+# Magic, format version, figure file size, figure file modification time (ns)
+HEADER = struct.Struct("<4sHQq")
+LENGTH = struct.Struct("<I")
+
+
+class FigureJournal:
+    """
+    Records the edits made to a figure since it was last fully saved.
+
+    Attributes:
+        file_name (str): The name of the figure file the entries apply to, or None
+            if the figure has not been saved.
+        entries (list): The edits recorded since the journal was last written.
+        complete (bool): Whether the recorded entries describe every change made
+            since the last save. Changes that cannot be journaled, such as plugin
+            runs, clear this, so that the next save rewrites the whole figure.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the FigureJournal class.
+        """
+        self.file_name = None
+        self.entries = []
+        self.complete = True
+        self._version = None
+
+    def record_set(self, figure, obj, attr_path, value) -> None:
+        """
+        Records that a property of an artist was set.
+
+        Args:
+            figure (Figure): The figure the artist belongs to.
+            obj: The artist.
+            attr_path (str): The attribute or setter the value was passed to, as
+                given to `FigureManager.set_value`.
+            value: The value that was set.
+        """
+        self._record(("set", figure, obj, attr_path, value))
+
+    def record_delete(self, figure, obj) -> None:
+        """
+        Records that an artist was removed. Must be called before it is removed.
+
+        Args:
+            figure (Figure): The figure the artist belongs to.
+            obj: The artist.
+        """
+        self._record(("delete", figure, obj))
+
+    def invalidate(self) -> None:
+        """
+        Marks the figure as changed in a way the journal cannot record, so that
+        the next save must rewrite the whole figure.
+        """
+        self.entries = []
+        self.complete = False
+
+    def reset(self, file_name=None) -> None:
+        """
+        Discards the recorded entries, after the figure was saved, loaded or created.
+
+        Args:
+            file_name (str): The name of the figure file, if any.
+        """
+        self.file_name = file_name
+        self._version = _version(file_name) if file_name is not None else None
+        self.entries = []
+        self.complete = True
+
+    def can_append(self, file_name) -> bool:
+        """
+        Returns whether the recorded edits can be saved by appending them to the
+        journal of a figure file, instead of rewriting the file. This requires the
+        file to be unchanged since the figure was loaded from or saved to it.
+
+        Args:
+            file_name (str): The name of the figure file being saved.
+        """
+        return (
+            self.complete
+            and file_name == self.file_name
+            and self._version is not None
+            and _version(file_name) == self._version
+        )
+
+    def append(self, file_name) -> None:
+        """
+        Appends the recorded entries to the journal of a figure file, and clears
+        them.
+
+        Args:
+            file_name (str): The name of the figure file.
+        """
+        journal_name = file_name + SUFFIX
+        if not _matches(file_name):
+            with open(journal_name, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, *_version(file_name)))
+        with open(journal_name, "r+b") as f:
+            # Drop any entry cut short by an interrupted save before appending
+            spans = _scan(f)
+            f.truncate(spans[-1][0] + spans[-1][1] if spans else HEADER.size)
+            f.seek(0, os.SEEK_END)
+            for entry in self.entries:
+                data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+                f.write(LENGTH.pack(len(data)) + data)
+            f.flush()
+            os.fsync(f.fileno())
+        self.entries = []
+
+    def _record(self, edit) -> None:
+        if not self.complete:
+            return
+        kind, figure, obj, *args = edit
+        path = artist_path(figure, obj)
+        if path is None:
+            self.invalidate()
+        else:
+            self.entries.append((kind, path, *args))
+
+
+def discard(file_name) -> None:
+    """
+    Removes the journal of a figure file, if it has one.
+
+    Args:
+        file_name (str): The name of the figure file.
+    """
+    try:
+        os.remove(file_name + SUFFIX)
+    except FileNotFoundError:
+        pass
+
+
+def read_entries(file_name) -> list:
+    """
+    Returns the entries of the journal of a figure file, or an empty list if it has
+    no journal or the journal belongs to a different version of the file. An entry
+    cut short by an interrupted save is ignored.
+
+    Args:
+        file_name (str): The name of the figure file.
+    """
+    if not _matches(file_name):
+        return []
+    with open(file_name + SUFFIX, "rb") as f:
+        entries = []
+        for offset, length in _scan(f):
+            f.seek(offset)
+            entries.append(pickle.loads(f.read(length)))
+    return entries
+
+
+def replay(figure, entries, set_value) -> None:
+    """
+    Applies journal entries to a figure, in order.
+
+    Args:
+        figure (Figure): The figure to apply the entries to.
+        entries (list): The entries, as returned by `read_entries`.
+        set_value (callable): Sets a value on an artist, with the signature of
+            `FigureManager.set_value`.
+
+    Raises:
+        ValueError: If an entry refers to an artist the figure does not have.
+    """
+    for kind, path, *args in entries:
+        obj = resolve_path(figure, path)
+        if kind == "set":
+            set_value(obj, *args)
+        elif kind == "delete":
+            try:
+                obj.remove()
+            except NotImplementedError:
+                # The artist could not be deleted when the edit was made either
+                pass
+
+
+def artist_path(figure, obj):
+    """
+    Returns the path of an artist from the figure, as a tuple of (class name, index)
+    steps, or None if the artist is not part of the figure.
+
+    Args:
+        figure (Figure): The figure.
+        obj: The artist.
+    """
+    if obj is figure:
+        return ()
+    for step, artist in _indexed_children(figure):
+        path = artist_path(artist, obj)
+        if path is not None:
+            return (step, *path)
+    return None
+
+
+def resolve_path(figure, path):
+    """
+    Returns the artist at a path returned by `artist_path`.
+
+    Args:
+        figure (Figure): The figure.
+        path (tuple): The path of the artist.
+
+    Raises:
+        ValueError: If the figure has no artist at the path.
+    """
+    artist = figure
+    for step in path:
+        children = dict(_indexed_children(artist))
+        if step not in children:
+            raise ValueError(f"The figure has no artist at {path}.")
+        artist = children[step]
+    return artist
+
+
+def _indexed_children(artist):
+    """
+    Yields the children of an artist with their (class name, index) steps.
+    """
+    counts = {}
+    for child in artist.get_children():
+        name = child.__class__.__name__
+        index = counts.get(name, 0)
+        counts[name] = index + 1
+        yield (name, index), child
+
+
+def _scan(f) -> list:
+    """
+    Returns the (offset, length) of the data of every complete entry of an open
+    journal.
+    """
+    end = os.fstat(f.fileno()).st_size
+    spans = []
+    offset = HEADER.size
+    while offset + LENGTH.size <= end:
+        f.seek(offset)
+        length = LENGTH.unpack(f.read(LENGTH.size))[0]
+        if offset + LENGTH.size + length > end:
+            break
+        spans.append((offset + LENGTH.size, length))
+        offset += LENGTH.size + length
+    return spans
+
+
+def _version(file_name):
+    """
+    Returns the size and modification time of a file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def _matches(file_name) -> bool:
+    """
+    Returns whether a figure file has a journal that was started for its current
+    contents.
+    """
+    try:
+        with open(file_name + SUFFIX, "rb") as f:
+            header = f.read(HEADER.size)
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, version, size, mtime = HEADER.unpack(header)
+    return (
+        magic == MAGIC and version <= VERSION and (size, mtime) == _version(file_name)
+    )
@@ -1,6 +1,8 @@
 import os
 import pickle
 import json
+import threading
+from contextlib import contextmanager, ExitStack
 
 from PySide6.QtWidgets import (
     QWidget,
@@ -8,14 +10,38 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Signal
 
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 import matplotlib.pyplot as plt
 from matplotlib.figure import Figure
+from matplotlib.axes import Axes
 import numpy as np
 
 from FigureForge.__init__ import CURRENT_DIR
+from FigureForge import figure_io
+from FigureForge import figure_journal
+from FigureForge.figure_journal import FigureJournal
 from FigureForge.property_inspector import PropertyInspector
 from FigureForge.figure_explorer import FigureExplorer
+from FigureForge.rendering.redraw_scheduler import RedrawScheduler
+from FigureForge.rendering.blit_manager import BlitManager
+from FigureForge.rendering.axes_raster_cache import AxesRasterCache
+from FigureForge.rendering.render_worker import (
+    RenderWorker,
+    render_figure,
+    render_scaled,
+)
+from FigureForge.rendering.level_of_detail import LevelOfDetail
+from FigureForge.rendering.collection_raster import CollectionRaster
+from FigureForge.rendering.draw_profiler import DrawProfiler
+from FigureForge.rendering.frozen_layout import FrozenLayout
+from FigureForge.rendering.preview_canvas import PreviewCanvas
+
+
+# How many times to try pickling a figure that keeps being rendered while saving
+SAVE_ATTEMPTS = 10
+
+
+class FigureChanged(Exception):
+    """Raised when a figure was edited or rendered while it was being read."""
 
 
 class FigureManager(QWidget):
@@ -27,10 +53,26 @@ class FigureManager(QWidget):
         pi (PropertyInspector): An instance of the PropertyInspector class.
         fe (FigureExplorer): An instance of the FigureExplorer class.
         figure (Figure): The matplotlib Figure object.
-        canvas (FigureCanvas): The canvas for displaying the figure.
+        canvas (PreviewCanvas): The canvas for displaying the figure.
         unsaved_changes (bool): A flag indicating whether there are unsaved changes.
         file_name (str): The name of the file associated with the figure.
         structure (dict): The JSON figure property structure.
+        redraw_scheduler (RedrawScheduler): Coalesces redraw requests from edits.
+        blit_manager (BlitManager): Redraws single edited artists over a cached
+            background.
+        axes_cache (AxesRasterCache): Caches a raster per Axes so that edits only
+            re-render the Axes they touch.
+        render_worker (RenderWorker): Renders the figure on a background thread.
+        level_of_detail (LevelOfDetail): Decimates large lines in preview renders.
+        collection_raster (CollectionRaster): Draws large scatter plots from cached
+            images in preview renders.
+        frozen_layout (FrozenLayout): Reuses the layout across preview renders.
+        draw_profiler (DrawProfiler): Times the draw of every artist.
+        profiling (bool): Whether renders are profiled.
+        batch_depth (int): The number of nested `batch` blocks currently open.
+        journal (FigureJournal): Records edits for incremental saves.
+        revision (int): Incremented whenever the figure is edited or replaced.
+        render_count (int): Incremented whenever the figure starts rendering.
 
     Signals:
         itemSelected: A signal emitted when an item is selected in the FigureExplorer.
@@ -48,16 +90,45 @@ class FigureManager(QWidget):
         self.fe = FigureExplorer()
 
         # Setup the figure and canvas
+        self.level_of_detail = LevelOfDetail(self.preferences.get("lod_threshold"))
+        self.collection_raster = CollectionRaster(
+            self.preferences.get("raster_threshold")
+        )
+        self.frozen_layout = FrozenLayout()
         self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
+        self.canvas = PreviewCanvas(self.figure, self.preview)
         self.unsaved_changes = False
         self.file_name = None
+        self.journal = FigureJournal()
+        self.revision = 0
+        self.render_count = 0
+        self.redraw_scheduler = RedrawScheduler(
+            self.render,
+            self.preferences.get("redraw_interval"),
+            self.preferences.get("redraw_max_delay"),
+            self,
+        )
+        self.dirty_artists = set()
+        self.full_redraw = False
+        self.blit_manager = BlitManager(self.canvas)
+        self.axes_cache = AxesRasterCache(self.canvas)
+        self.render_worker = RenderWorker(self)
+        self.render_worker.rendered.connect(self.on_rendered)
+        self.render_worker.failed.connect(self.on_render_failed)
+        self._render_lock = threading.RLock()
+        self.draw_profiler = DrawProfiler()
+        self.profiling = False
+        self.batch_depth = 0
+        self._pending_label = None
+        self._pending_tree = None
+        self._pending_progressive = False
+        # The callback registry the resize callback is connected to
+        self._resize_callbacks = None
 
-        self.new_figure()
         if figure is not None:
-            self.figure.__dict__.update(figure.__dict__)
+            self.set_figure(figure)
         else:
-            self.figure.__dict__.update(create_default_figure().__dict__)
+            self.set_figure(create_default_figure())
         self.canvas.draw()
         self.fe.build_tree(self.figure)
 
@@ -80,54 +151,290 @@ class FigureManager(QWidget):
         if self.preferences.get("debug"):
             print(f"Loaded structure: {json_file}")
 
-    def load_figure(self, file_name) -> None:
+    def load_figure(self, file_name, memory_map=None) -> None:
         """
         Loads a figure from a file.
 
         Args:
             file_name (str): The name of the file to load the figure from.
+            memory_map (bool): Whether to memory-map the data of .ffig files, or
+                None to follow the memory_map preference.
         """
         if file_name is None:
             return
-        self.new_figure()
-        with open(file_name, "rb") as f:
-            data = pickle.load(f)
-        self.figure.__dict__.update(data.__dict__)
-        self.canvas.draw()
-        self.unsaved_changes = False
-        self.updateLabel.emit(
-            file_name.split("/")[-1] if self.file_name is not None else "New Figure"
-        )
-        self.fe.build_tree(self.figure)
-        self.pi.clear_properties()
-        self.file_name = file_name
+        self.show_figure(self.read_figure(file_name, memory_map), file_name)
+
+    def read_figure(self, file_name, memory_map=None, progress=None):
+        """
+        Reads a figure from a file, with the edits saved in its journal applied.
+        The managed figure is not changed, so this may be called from any thread.
+
+        Args:
+            file_name (str): The name of the file to read.
+            memory_map (bool): Whether to memory-map the data of .ffig files, or
+                None to follow the memory_map preference where the file can still
+                be saved over while mapped.
+            progress (callable): Called with the number of bytes read so far and
+                the size of the file, if given. See figure_io.ProgressFile.
+
+        Returns:
+            The Figure read from the file.
+        """
+        if memory_map is None:
+            memory_map = (
+                self.preferences.get("memory_map") and figure_io.CAN_REPLACE_MAPPED
+            )
+        return read_figure(file_name, memory_map, progress, self.set_value)
+
+    def show_figure(self, figure, file_name) -> None:
+        """
+        Makes a figure read by `read_figure` the managed figure, and renders it.
+
+        Args:
+            figure (Figure): The figure read from the file.
+            file_name (str): The name of the file it was read from, or None if it
+                was not read from a figure file of its own.
+        """
+        with self.batch():
+            self.new_figure()
+            self.set_figure(figure)
+            self.journal.reset(file_name)
+            self.render_progressive()
+            self.unsaved_changes = False
+            self.set_label(
+                file_name.split("/")[-1] if file_name is not None else "New Figure"
+            )
+            self.refresh_tree()
+            self.pi.clear_properties()
+            self.file_name = file_name
         if self.preferences.get("debug"):
             print(f"Loaded figure from {file_name}")
 
-    def save_figure(self, file_name) -> None:
+    def set_figure(self, figure) -> None:
+        """
+        Replaces the state of the managed figure with that of another figure, and
+        binds the result to this manager's canvas.
+
+        Args:
+            figure (Figure): The figure whose state to adopt.
+        """
+        self.figure.__dict__.update(figure.__dict__)
+        self.revision += 1
+        self.figure.set_canvas(self.canvas)
+        self.blit_manager.connect()
+        self.axes_cache.invalidate()
+        self.frozen_layout.invalidate()
+        # A resize redraws the canvas synchronously, superseding any background
+        # render. Connected once per callback registry, which is replaced along
+        # with the figure's state unless the new state shares it
+        if self.canvas.callbacks is not self._resize_callbacks:
+            self._resize_callbacks = self.canvas.callbacks
+            self.canvas.mpl_connect(
+                "resize_event", lambda _: self.render_worker.cancel()
+            )
+
+    def save_figure(self, file_name, compact=False) -> None:
         """
         Saves the figure to a file.
 
         Args:
             file_name (str): The name of the file to save the figure to.
+            compact (bool): Whether to always write the whole figure. See
+                `write_figure`.
+        """
+        self.mark_saved(file_name, self.write_figure(file_name, compact))
+
+    def write_figure(self, file_name, compact=False, progress=None) -> bool:
+        """
+        Writes the figure to a file. May be called from any thread, as long as the
+        figure is not edited meanwhile. Call `mark_saved` on the GUI thread once it
+        returns.
+
+        If the figure was loaded from or last saved to the same file, and every
+        change since then was journaled, only the new edits are appended to the
+        file's journal. Otherwise the whole figure is written, and the journal is
+        removed.
+
+        Args:
+            file_name (str): The name of the file to save the figure to.
+            compact (bool): Whether to always write the whole figure, folding the
+                journal into it.
+            progress (callable): Called with the number of bytes written so far and
+                the size of the file, or 0 if it is not known in advance, if given.
+                See figure_io.ProgressFile.
+
+        Returns:
+            Whether the whole figure was written, rather than only the new edits.
+        """
+        compression = self.preferences.get("compression")
+        if compression == "none":
+            compression = None
+        if (
+            not compact
+            and self.preferences.get("incremental_saves")
+            and self.journal.can_append(file_name)
+        ):
+            self.journal.append(file_name)
+            return False
+
+        if file_name.endswith(figure_io.EXTENSION):
+            blocks, preview = self._retry(
+                lambda: self._while_unchanged(
+                    lambda: (figure_io.snapshot(self.figure), self.describe())
+                ),
+                progress,
+            )
+            figure_io.write_snapshot(
+                blocks,
+                file_name,
+                progress=progress,
+                compression=compression,
+                preview=preview,
+            )
+        else:
+
+            def write():
+                with figure_io.atomic_write(file_name, compression) as f:
+                    if progress is not None:
+                        f = figure_io.ProgressFile(f, 0, progress)
+                    self._while_unchanged(lambda: pickle.dump(self.figure, f))
+
+            self._retry(write, progress)
+        figure_journal.discard(file_name)
+        return True
+
+    def mark_saved(self, file_name, full=True) -> None:
         """
-        with open(file_name, "wb") as f:
-            pickle.dump(self.figure, f)
+        Records that the figure was saved to a file by `write_figure`.
+
+        Args:
+            file_name (str): The name of the file the figure was saved to.
+            full (bool): Whether the whole figure was written.
+        """
+        if full:
+            self.journal.reset(file_name)
+        self.file_name = file_name
         self.unsaved_changes = False
-        self.updateLabel.emit(file_name.split("/")[-1])
+        self.set_label(file_name.split("/")[-1])
         if self.preferences.get("debug"):
-            print(f"Saved figure to {file_name}")
+            if full:
+                print(f"Saved figure to {file_name}")
+            else:
+                print(f"Appended edits to the journal of {file_name}")
+
+    def snapshot(self):
+        """
+        Pickles the figure with `figure_io.snapshot` for an autosave. May be called
+        from any thread.
+
+        Pickling a large figure takes much longer than a frame, so this does not
+        stop the figure from being edited or rendered meanwhile. Instead, the
+        snapshot is discarded if that happened, since it may then be inconsistent.
+
+        Returns:
+            The snapshot, or None if the figure was edited or rendered while it was
+            being pickled, or is being rendered.
+        """
+        try:
+            return self._while_unchanged(lambda: figure_io.snapshot(self.figure))
+        except FigureChanged:
+            return None
+        except Exception as e:
+            if self.preferences.get("debug"):
+                print(f"Snapshot failed: {e}")
+            return None
+
+    def take_snapshot(self, progress=None) -> list:
+        """
+        Pickles the figure with `figure_io.snapshot` to write it out. Unlike
+        `snapshot`, this waits for any render in progress, and tries again if the
+        figure is rendered while it is being pickled. May be called from any
+        thread, as long as the figure is not edited meanwhile.
+
+        Args:
+            progress (callable): Called with 0 and 0 while waiting, if given, so
+                that the wait can be cancelled. See figure_io.ProgressFile.
+
+        Returns:
+            The snapshot.
+        """
+        return self._retry(
+            lambda: self._while_unchanged(lambda: figure_io.snapshot(self.figure)),
+            progress,
+        )
+
+    def describe(self) -> dict:
+        """
+        Returns the preview of the figure stored in .ffig files, with a thumbnail of
+        what the canvas currently shows. See figure_io.describe.
+        """
+        # The canvas may be resized meanwhile, which replaces its renderer, so
+        # only use the current one rather than creating one
+        renderer = getattr(self.canvas, "renderer", None)
+        image = np.asarray(renderer.buffer_rgba()) if renderer is not None else None
+        return figure_io.describe(self.figure, image)
+
+    def _retry(self, attempt, progress=None):
+        """
+        Calls `attempt`, which reads the figure with `_while_unchanged`, until it
+        no longer raises FigureChanged, and returns its result.
+
+        Raises:
+            RuntimeError: If the figure changed during each of SAVE_ATTEMPTS tries.
+        """
+        for _ in range(SAVE_ATTEMPTS):
+            # Renders temporarily patch artists, so wait for any render in
+            # progress, and keep reporting progress so that saving can be cancelled
+            while not self._render_lock.acquire(timeout=0.1):
+                if progress is not None:
+                    progress(0, 0)
+            self._render_lock.release()
+            try:
+                return attempt()
+            except FigureChanged:
+                # A render started while pickling; try again once it has finished
+                continue
+        raise RuntimeError("The figure kept changing while it was being saved.")
+
+    def _while_unchanged(self, read):
+        """
+        Calls `read`, which reads the figure, and returns its result, provided that
+        the figure was neither edited nor rendered meanwhile.
+
+        Args:
+            read (callable): Reads the figure.
+
+        Raises:
+            FigureChanged: If the figure is being rendered, or was edited or
+                rendered while `read` ran.
+        """
+        # Renders temporarily patch artists, so none may be in progress
+        if not self._render_lock.acquire(blocking=False):
+            raise FigureChanged()
+        revision, render_count = self.revision, self.render_count
+        self._render_lock.release()
+        try:
+            result = read()
+        except Exception:
+            if (self.revision, self.render_count) != (revision, render_count):
+                raise FigureChanged()
+            raise
+        if (self.revision, self.render_count) != (revision, render_count):
+            raise FigureChanged()
+        return result
 
     def new_figure(self) -> None:
         """
         Creates a new empty figure.
         """
+        self.render_worker.cancel()
         self.figure.clear()
         self.file_name = None
+        self.journal.reset()
         self.unsaved_changes = False
-        self.updateLabel.emit("New Figure")
-        self.canvas.draw()
-        self.fe.build_tree(self.figure)
+        self.set_label("New Figure")
+        self.request_redraw()
+        self.refresh_tree()
         if self.preferences.get("debug"):
             print("Created new figure")
 
@@ -174,13 +481,16 @@ class FigureManager(QWidget):
         if "set_parameter" in prop:
             parameter = prop["set_parameter"]
             value = {parameter: value}
-        self.set_value(obj, set_method, value)
+        with self.batch():
+            self.journal.record_set(self.figure, obj, set_method, value)
+            self.set_value(obj, set_method, value)
 
-        self.canvas.draw()
-        self.unsaved_changes = True
-        self.updateLabel.emit(
-            f"{self.file_name.split('/')[-1] if self.file_name is not None else 'New Figure'} *"
-        )
+            # Properties flagged in the structure affect more than the artist itself
+            redraw = prop.get("redraw")
+            if redraw == "layout":
+                self.frozen_layout.invalidate()
+            self.request_redraw(None if redraw else obj)
+            self.mark_unsaved()
 
         if self.preferences.get("debug"):
             print(f"Changed {property_name} to {value} on {obj_class}")
@@ -192,18 +502,328 @@ class FigureManager(QWidget):
         if self.selected_obj is None:
             return
 
-        self.attempt_delete(self.selected_obj)
-        self.canvas.draw()
+        with self.batch():
+            self.journal.record_delete(self.figure, self.selected_obj)
+            self.attempt_delete(self.selected_obj)
+            self.frozen_layout.invalidate()
+            self.request_redraw()
+            self.mark_unsaved()
+            self.refresh_tree()
+        self.selected_obj = None
+
+        if self.preferences.get("debug"):
+            print(f"Attempting to delete {self.selected_obj}")
+
+    @contextmanager
+    def batch(self):
+        """
+        A context that defers redraws, FigureExplorer rebuilds and label updates
+        until the outermost batch exits, then performs each of them once. Batches
+        may be nested.
+
+        Example:
+            with fm.batch():
+                ax.set_title("Title")
+                ax.set_xlabel("Time")
+                fm.relayout()
+                fm.refresh_tree()
+        """
+        self.batch_depth += 1
+        try:
+            yield
+        finally:
+            self.batch_depth -= 1
+            if self.batch_depth == 0:
+                self.flush_batch()
+
+    def flush_batch(self) -> None:
+        """
+        Performs the updates deferred by a batch.
+        """
+        label, self._pending_label = self._pending_label, None
+        tree, self._pending_tree = self._pending_tree, None
+        progressive, self._pending_progressive = self._pending_progressive, False
+        if label is not None:
+            self.updateLabel.emit(label)
+        if tree is not None:
+            self.fe.build_tree(self.figure, tree[0])
+        if progressive:
+            self.render_progressive()
+        elif self.full_redraw or self.dirty_artists:
+            self.redraw_scheduler.request()
+
+    def set_label(self, label) -> None:
+        """
+        Emits updateLabel, or defers it until the current batch exits.
+
+        Args:
+            label (str): The new label of the figure.
+        """
+        if self.batch_depth:
+            self._pending_label = label
+        else:
+            self.updateLabel.emit(label)
+
+    def mark_unsaved(self) -> None:
+        """
+        Flags the figure as having unsaved changes and updates its label.
+        """
         self.unsaved_changes = True
-        self.updateLabel.emit(
+        self.revision += 1
+        self.set_label(
             f"{self.file_name.split('/')[-1] if self.file_name is not None else 'New Figure'} *"
         )
 
-        self.fe.build_tree(self.figure)
-        self.selected_obj = None
+    def refresh_tree(self, last_obj=None) -> None:
+        """
+        Rebuilds the FigureExplorer tree, or defers it until the current batch
+        exits.
+
+        Args:
+            last_obj: The object to select in the rebuilt tree, if any.
+        """
+        if self.batch_depth:
+            self._pending_tree = (last_obj,)
+        else:
+            self.fe.build_tree(self.figure, last_obj)
 
+    def apply_preferences(self) -> None:
+        """
+        Applies the preferences read when the figure was opened, once they have
+        been changed in the PreferencesDialog: the redraw delay.
+        """
+        self.redraw_scheduler.interval = self.preferences.get("redraw_interval")
+        self.redraw_scheduler.max_delay = self.preferences.get("redraw_max_delay")
+
+    def relayout(self) -> None:
+        """
+        Recomputes the layout of the figure and redraws it.
+        """
+        self.frozen_layout.invalidate()
+        self.request_redraw()
+
+    def request_redraw(self, artist=None) -> None:
+        """
+        Schedules a redraw of the canvas. Requests made in quick succession are
+        merged into a single render by the redraw scheduler.
+
+        Args:
+            artist: The only artist whose appearance changed, or None if the whole
+                figure needs to be redrawn.
+        """
+        if artist is None:
+            self.full_redraw = True
+        else:
+            self.dirty_artists.add(artist)
+        if not self.batch_depth:
+            self.redraw_scheduler.request()
+
+    def render(self) -> None:
+        """
+        Renders the pending changes to the canvas. Called by the redraw scheduler
+        once a burst of redraw requests has settled. A change confined to a single
+        artist is blitted over a cached background; other changes re-render only the
+        Axes they touch, and anything else is redrawn in full. Unless blitted, the
+        render runs on the render worker if background rendering is enabled.
+        """
+        artists = self.dirty_artists
+        full_redraw = self.full_redraw
+        self.dirty_artists = set()
+        self.full_redraw = False
+        background = self.preferences.get("background_rendering")
+
+        if self.profiling:
+            self.profile_render()
+            return
+
+        # Blitting draws on this thread, so it must not overlap a background render
+        if (
+            not full_redraw
+            and len(artists) == 1
+            and self.preferences.get("blit_edits")
+            and not self.render_worker.busy
+        ):
+            (artist,) = artists
+            if self.blit_manager.can_blit(artist):
+                with self.preview():
+                    self.blit_manager.blit(artist)
+                # The cached raster of the artist's Axes no longer matches
+                self.axes_cache.mark_dirty(artist)
+                if self.preferences.get("debug"):
+                    print(f"Blitted {artist.__class__.__name__}")
+                return
+
+        if self.preferences.get("cache_axes"):
+            if full_redraw:
+                self.axes_cache.invalidate()
+            for artist in artists:
+                self.axes_cache.mark_dirty(artist)
+            if background and self.figure.get_visible():
+                self.submit_render(self.axes_cache.render_buffer)
+            else:
+                with self.preview():
+                    self.axes_cache.render()
+                self.blit_manager.invalidate()
+        elif background:
+            self.submit_render(
+                lambda width, height, dpi, cancelled: render_figure(
+                    self.figure, width, height, dpi, cancelled
+                )
+            )
+        else:
+            self.canvas.draw_idle()
         if self.preferences.get("debug"):
-            print(f"Attempting to delete {self.selected_obj}")
+            print("Rendered figure")
+
+    def set_profiling(self, enabled) -> None:
+        """
+        Turns profiling on or off. While profiling, every render is a full render on
+        this thread that times the draw of every artist, and the times are shown in
+        the FigureExplorer.
+
+        Args:
+            enabled (bool): Whether to profile renders.
+        """
+        self.profiling = enabled
+        if enabled:
+            self.profile_render()
+        else:
+            self.fe.clear_draw_times()
+
+    def profile_render(self) -> None:
+        """
+        Renders the whole figure at full fidelity while timing the draw of every
+        artist, and shows the result on the canvas and the times in the
+        FigureExplorer.
+        """
+        self.render_worker.cancel()
+        renderer = self.canvas.get_renderer()
+        width, height, dpi = int(renderer.width), int(renderer.height), renderer.dpi
+        with self._render_lock, self.draw_profiler.profile(self.figure):
+            self.render_count += 1
+            buffer = render_figure(self.figure, width, height, dpi)
+        np.asarray(self.canvas.get_renderer().buffer_rgba())[...] = buffer
+        self.axes_cache.invalidate()
+        self.blit_manager.invalidate()
+        self.canvas.update()
+        self.fe.show_draw_times(self.draw_profiler)
+        if self.preferences.get("debug"):
+            print(f"Profiled render: {self.draw_profiler.elapsed * 1000:.1f} ms")
+
+    def render_progressive(self) -> None:
+        """
+        Renders the whole figure, first at the reduced resolutions in the
+        progressive_steps preference, each painted as soon as it is ready, and then
+        at full resolution in the background. The reduced passes change the
+        figure's dpi, so they are rendered on this thread. Inside a batch, the
+        render is deferred until the batch exits.
+        """
+        if self.batch_depth:
+            self._pending_progressive = True
+            return
+        self.redraw_scheduler.cancel()
+        self.dirty_artists = set()
+        self.full_redraw = False
+        self.axes_cache.invalidate()
+        if self.profiling:
+            self.profile_render()
+            return
+        if not (
+            self.preferences.get("background_rendering") and self.figure.get_visible()
+        ):
+            self.canvas.draw()
+            return
+
+        renderer = self.canvas.get_renderer()
+        width, height, dpi = int(renderer.width), int(renderer.height), renderer.dpi
+        steps = sorted(
+            step / 100
+            for step in self.preferences.get("progressive_steps") or []
+            if 0 < step < 100
+        )
+        for scale in steps:
+            with self.preview():
+                buffer = render_scaled(self.figure, width, height, dpi, scale)
+            np.asarray(self.canvas.get_renderer().buffer_rgba())[...] = buffer
+            self.canvas.repaint()
+            if self.preferences.get("debug"):
+                print(f"Painted figure at {scale:.0%} resolution")
+
+        if self.preferences.get("cache_axes"):
+            self.submit_render(self.axes_cache.render_buffer)
+        else:
+            self.submit_render(
+                lambda width, height, dpi, cancelled: render_figure(
+                    self.figure, width, height, dpi, cancelled
+                )
+            )
+
+    def submit_render(self, render) -> None:
+        """
+        Submits a render to the render worker, cancelling any render in progress.
+
+        Args:
+            render (callable): Called on the worker thread with the width, height and
+                dpi of the canvas and a cancellation event; returns the RGBA buffer.
+        """
+        renderer = self.canvas.get_renderer()
+        width, height, dpi = int(renderer.width), int(renderer.height), renderer.dpi
+
+        def job(cancelled):
+            with self.preview():
+                return render(width, height, dpi, cancelled)
+
+        self.render_worker.submit(job)
+
+    @contextmanager
+    def preview(self):
+        """
+        A context for rendering the editor's preview of the figure, in which large
+        artists may be drawn from cheaper stand-ins. Exports and saved files are
+        never rendered in this context. Renders in this context never overlap, so
+        the figure is never drawn from two threads at once.
+        """
+        with self._render_lock, ExitStack() as stack:
+            self.render_count += 1
+            if self.preferences.get("level_of_detail"):
+                stack.enter_context(self.level_of_detail.apply(self.figure))
+            if self.preferences.get("collection_raster"):
+                stack.enter_context(self.collection_raster.apply(self.figure))
+            if self.preferences.get("freeze_layout"):
+                stack.enter_context(self.frozen_layout.apply(self.figure))
+            yield
+
+    def on_rendered(self, job_id, buffer) -> None:
+        """
+        Shows a buffer rendered by the render worker on the canvas.
+
+        Args:
+            job_id (int): The ID of the render job.
+            buffer (np.ndarray): The rendered RGBA buffer.
+        """
+        target = np.asarray(self.canvas.get_renderer().buffer_rgba())
+        if target.shape != buffer.shape:
+            # The canvas was resized while rendering
+            self.request_redraw()
+            return
+        target[...] = buffer
+        self.blit_manager.invalidate()
+        self.canvas.update()
+        if self.preferences.get("debug"):
+            print(f"Showing background render {job_id}")
+
+    def on_render_failed(self, job_id, error) -> None:
+        """
+        Falls back to drawing on the GUI thread when a background render fails.
+
+        Args:
+            job_id (int): The ID of the render job.
+            error (str): The error message.
+        """
+        if self.preferences.get("debug"):
+            print(f"Background render {job_id} failed: {error}")
+        self.axes_cache.invalidate()
+        self.canvas.draw_idle()
 
     def attempt_delete(self, obj) -> None:
         """
@@ -217,6 +837,20 @@ class FigureManager(QWidget):
         except NotImplementedError:
             QMessageBox.critical(self, "Error", "Cannot delete this item.")
 
+    def get_axes(self, obj):
+        """
+        Gets the Axes an object belongs to.
+
+        Args:
+            obj: The object.
+
+        Returns:
+            The Axes containing the object (or the object itself, if it is an Axes),
+            or None if the object does not belong to an Axes.
+        """
+        ax = getattr(obj, "axes", None)
+        return ax if isinstance(ax, Axes) else None
+
     def get_value(self, obj, attr_path: str, index: None | int = None):
         """
         Gets the value of an attribute of an object.
@@ -257,23 +891,67 @@ class FigureManager(QWidget):
             attr_path (str): The path to the attribute.
             value: The new value of the attribute.
         """
-        attrs = attr_path.split(".")
-        for attr in attrs[:-1]:
-            obj = getattr(obj, attr)
-            if callable(obj):
-                obj = obj()
-        if type(value) == dict:
-            if self.preferences.get("debug"):
-                print(f"Calling {attr_path}({value}) on {obj}")
-            getattr(obj, attrs[-1])(**value)
-        elif callable(getattr(obj, attrs[-1])):
-            if self.preferences.get("debug"):
-                print(f"Calling {attr_path}({value}) on {obj}")
-            getattr(obj, attrs[-1])(value)
-        else:
-            if self.preferences.get("debug"):
-                print(f"Setting {attr_path} to {value} on {obj}")
-            setattr(obj, attrs[-1], value)
+        set_value(obj, attr_path, value, self.preferences.get("debug"))
+
+
+def read_figure(file_name, memory_map=False, progress=None, setter=None):
+    """
+    Reads a figure from a .ffig or pickle file, with the edits saved in its journal
+    applied. Does not need a FigureManager, so it may be used without a GUI.
+
+    Args:
+        file_name (str): The name of the file to read.
+        memory_map (bool): Whether to memory-map the data of .ffig files.
+        progress (callable): Called with the number of bytes read so far and the
+            size of the file, if given. See figure_io.ProgressFile.
+        setter (callable): Applies the journaled edits, with the signature of
+            `set_value` without `debug`. Defaults to `set_value`.
+
+    Returns:
+        The Figure read from the file.
+    """
+    if figure_io.is_container(file_name):
+        figure = figure_io.load_figure(
+            file_name, memory_map=memory_map, progress=progress
+        )
+    else:
+        with figure_io.open_read(file_name, progress) as f:
+            figure = figure_io.unpickle(f)
+    # Apply the edits saved incrementally since the file was last written
+    figure_journal.replay(
+        figure, figure_journal.read_entries(file_name), setter or set_value
+    )
+    return figure
+
+
+def set_value(obj, attr_path: str, value, debug=False) -> None:
+    """
+    Sets the value of an attribute of an object. Attempts to discern whether
+    `attr_path` is is an attribute or setter method.
+
+    Args:
+        obj: The object.
+        attr_path (str): The path to the attribute.
+        value: The new value of the attribute.
+        debug (bool): Whether to print what is set.
+    """
+    attrs = attr_path.split(".")
+    for attr in attrs[:-1]:
+        obj = getattr(obj, attr)
+        if callable(obj):
+            obj = obj()
+    if type(value) == dict:
+        if debug:
+            print(f"Calling {attr_path}({value}) on {obj}")
+        getattr(obj, attrs[-1])(**value)
+    elif callable(getattr(obj, attrs[-1])):
+        if debug:
+            print(f"Calling {attr_path}({value}) on {obj}")
+        getattr(obj, attrs[-1])(value)
+    else:
+        if debug:
+            print(f"Setting {attr_path} to {value} on {obj}")
+        setattr(obj, attrs[-1], value)
 
 
 def create_default_figure():
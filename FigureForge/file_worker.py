@@ -0,0 +1,95 @@
+import threading
+
+from PySide6.QtCore import QObject, Signal, Qt
+
+
+class FileCancelled(Exception):
+    """Raised inside a file task that has been cancelled."""
+
+
+class FileWorker(QObject):
+    """
+    Runs a file task, such as opening or saving a figure, on a background thread,
+    so that the GUI stays responsive while large files are read or written.
+
+    The task is called with a progress callback, which it must call with the number
+    of bytes done and the total number of bytes (or 0 if unknown) as it goes. Once
+    the worker is cancelled, the callback raises FileCancelled, which ends the task.
+
+    Attributes:
+        result: The value returned by the task, once it has finished.
+        error (Exception): The exception raised by the task, if any.
+        cancelled (bool): Whether the task was cancelled.
+
+    Signals:
+        progress: Emitted with the progress of the task, in thousandths, or -1 if
+            the total is not known.
+        finished: Emitted on the GUI thread once the task has ended.
+    """
+
+    progress = Signal(int)
+    finished = Signal()
+    _finished = Signal()
+
+    def __init__(self, parent=None) -> None:
+        """
+        Initializes a new instance of the FileWorker class.
+        """
+        super().__init__(parent)
+        self.result = None
+        self.error = None
+        self.cancelled = False
+        self._cancelled = threading.Event()
+        self._thread = None
+        self._reported = None
+        self._finished.connect(self.finished, Qt.QueuedConnection)
+
+    def start(self, task) -> None:
+        """
+        Starts running a task.
+
+        Args:
+            task (callable): Called on the worker thread with the progress callback.
+        """
+        self._thread = threading.Thread(target=self._run, args=(task,), daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout=None) -> bool:
+        """
+        Waits for the task to end.
+
+        Args:
+            timeout (float): The longest time to wait, in seconds, or None to wait
+                until the task ends.
+
+        Returns:
+            Whether the task has ended.
+        """
+        self._thread.join(timeout)
+        return not self._thread.is_alive()
+
+    def cancel(self) -> None:
+        """
+        Cancels the task. It ends at its next progress report.
+        """
+        self._cancelled.set()
+
+    def _run(self, task) -> None:
+        try:
+            self.result = task(self._report)
+        except FileCancelled:
+            self.cancelled = True
+        except Exception as e:
+            self.error = e
+        self._finished.emit()
+
+    def _report(self, done, total) -> None:
+        """
+        The progress callback passed to the task.
+        """
+        if self._cancelled.is_set():
+            raise FileCancelled()
+        progress = done * 1000 // total if total else -1
+        if progress != self._reported:
+            self._reported = progress
+            self.progress.emit(progress)
@@ -8,6 +8,7 @@ from copy import deepcopy
 
 from PySide6.QtWidgets import (
     QApplication,
+    QDialog,
     QWidget,
     QSplitter,
     QFileDialog,
@@ -17,8 +18,8 @@ from PySide6.QtWidgets import (
     QMenu,
     QTabWidget,
 )
-from PySide6.QtCore import Qt, QUrl
-from PySide6.QtGui import QDesktopServices, QIcon, QAction, QPixmap
+from PySide6.QtCore import Qt, QUrl, QMimeData
+from PySide6.QtGui import QDesktopServices, QIcon, QAction, QImage
 
 import qdarktheme
 
@@ -36,9 +37,24 @@ from FigureForge.dialogs.ff_dialogs import (
     AboutDialog,
     SaveWorkDialog,
     WelcomeDialog,
+    DrawProfileDialog,
+    ExportProgressDialog,
+    OpenFigureDialog,
+    preview_pixmap,
+    preview_text,
+    run_file_task,
 )
+from FigureForge import figure_io
+from FigureForge import export
+from FigureForge.export_cache import ExportCache
+from FigureForge.file_worker import FileWorker, FileCancelled
 from FigureForge.figure_manager import FigureManager
+from FigureForge.autosave import Autosaver
 from FigureForge.preferences import Preferences, PreferencesDialog
+from FigureForge.rendering.frozen_layout import layout_state
+
+# The MIME types of the vector formats figures may be copied to the clipboard in
+VECTOR_MIME_TYPES = {"svg": "image/svg+xml", "pdf": "application/pdf"}
 
 
 class MainWindow(QMainWindow):
@@ -55,8 +71,19 @@ class MainWindow(QMainWindow):
 
         self.create_menus()
         self.init_ui(figure)
+        self.autosaver = Autosaver(self.preferences, self.figure_managers, self)
+        # The copy in progress, and the rendering the clipboard image refers to
+        self.copy_worker = None
+        self.clipboard_image = None
+        # The previews of recent files by name, with the modification time of the
+        # file they were read from, and the actions of the Open Recent menu
+        self.recent_previews = {}
+        self.recent_actions = {}
+        self.recent_preview_worker = None
 
         self.show()
+        self.offer_recovery()
+        self.autosaver.start()
         if self.preferences.get("show_welcome"):
             res = WelcomeDialog()
             if res.display_at_startup.isChecked():
@@ -92,8 +119,11 @@ class MainWindow(QMainWindow):
         file_menu.addAction(open_action)
 
         self.open_recent_menu = QMenu("Open Recent", self)
+        self.open_recent_menu.setToolTipsVisible(True)
+        self.open_recent_menu.setStyleSheet("QMenu { icon-size: 48px; }")
+        # Built when shown, so that the previews are up to date
+        self.open_recent_menu.aboutToShow.connect(self.get_recent_files)
         file_menu.addMenu(self.open_recent_menu)
-        self.get_recent_files()
 
         save_action = QAction("Save", self)
         save_action.setIcon(QIcon(os.path.join(ICONS_DIR, "save_icon.png")))
@@ -107,6 +137,20 @@ class MainWindow(QMainWindow):
         save_as_action.triggered.connect(self.save_as_file)
         file_menu.addAction(save_as_action)
 
+        compact_action = QAction("Compact", self)
+        compact_action.setToolTip(
+            "Rewrite the whole figure file, folding in the edits saved since."
+        )
+        compact_action.triggered.connect(self.compact_file)
+        file_menu.addAction(compact_action)
+
+        save_project_action = QAction("Save Project...", self)
+        save_project_action.setToolTip(
+            "Save every open figure into one project file, storing shared data once."
+        )
+        save_project_action.triggered.connect(self.save_project)
+        file_menu.addAction(save_project_action)
+
         file_menu.addSeparator()
 
         export_action = QAction("Export", self)
@@ -115,6 +159,13 @@ class MainWindow(QMainWindow):
         export_action.setShortcut("Ctrl+E")
         file_menu.addAction(export_action)
 
+        export_pages_action = QAction("Export All to PDF...", self)
+        export_pages_action.setToolTip(
+            "Export every open figure as the pages of one PDF."
+        )
+        export_pages_action.triggered.connect(self.export_pages)
+        file_menu.addAction(export_pages_action)
+
         file_menu.addSeparator()
 
         quit_action = QAction("Quit", self)
@@ -142,10 +193,30 @@ class MainWindow(QMainWindow):
         delete_item_action.setShortcut("Del")
         edit_menu.addAction(delete_item_action)
 
-        preferences_action = QAction("Preferences", self)
-        preferences_action.triggered.connect(
-            lambda: PreferencesDialog(self.preferences, self)
+        relayout_action = QAction("Relayout", self)
+        relayout_action.triggered.connect(lambda: self.fm.relayout())
+        relayout_action.setShortcut("Ctrl+L")
+        relayout_action.setToolTip("Recompute the positions of the Axes.")
+        edit_menu.addAction(relayout_action)
+
+        edit_menu.addSeparator()
+
+        self.profile_action = QAction("Profile Draw Times", self)
+        self.profile_action.setCheckable(True)
+        self.profile_action.setToolTip(
+            "Time the draw of every artist and show the times in the Figure Explorer."
         )
+        self.profile_action.toggled.connect(lambda on: self.fm.set_profiling(on))
+        edit_menu.addAction(self.profile_action)
+
+        slowest_artists_action = QAction("Slowest Artists...", self)
+        slowest_artists_action.triggered.connect(self.show_slowest_artists)
+        edit_menu.addAction(slowest_artists_action)
+
+        edit_menu.addSeparator()
+
+        preferences_action = QAction("Preferences", self)
+        preferences_action.triggered.connect(self.edit_preferences)
         preferences_action.setIcon(
             QIcon(os.path.join(ICONS_DIR, "preferences_icon.png"))
         )
@@ -240,6 +311,38 @@ class MainWindow(QMainWindow):
         main_layout = QVBoxLayout(main_widget)
         main_layout.addWidget(splitter)
         self.setCentralWidget(main_widget)
+        # Created up front, as adding it later resizes and redraws the canvas
+        self.statusBar()
+
+    def offer_recovery(self):
+        recovered = self.autosaver.recoverable()
+        if not recovered:
+            return
+        res = QMessageBox.question(
+            self,
+            "Recover Figures",
+            "FigureForge did not close properly. Recover the "
+            f"{len(recovered)} figure(s) with unsaved changes?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if res == QMessageBox.Yes:
+            for file_name, metadata in recovered:
+                self.new_file()
+                try:
+                    # Not mapped, so that the recovery file can be removed
+                    self.fm.load_figure(file_name, memory_map=False)
+                except Exception as e:
+                    msgbox = QMessageBox()
+                    msgbox.setIcon(QMessageBox.Critical)
+                    msgbox.setWindowTitle("File Error")
+                    msgbox.setText("Failed to recover a figure.")
+                    msgbox.setInformativeText(str(e))
+                    msgbox.exec_()
+                    continue
+                self.fm.file_name = metadata.get("file_name")
+                self.fm.journal.reset()
+                self.fm.mark_unsaved()
+        self.autosaver.discard_recoverable()
 
     def new_file(self):
         new_fm = FigureManager(self.preferences, None)
@@ -256,34 +359,138 @@ class MainWindow(QMainWindow):
     def open_file(self):
         if not self.check_for_save(self.fm):
             return
+        file_name = OpenFigureDialog(self).file_name
+        if file_name:
+            self.open_figure(file_name)
+
+    def open_figure(self, file_name):
+        """Reads a figure on a file worker, then shows it in the current tab."""
+        if figure_io.is_bundle(file_name):
+            self.open_project(file_name)
+            return
+        fm = self.fm
+        try:
+            figure = run_file_task(
+                f"Opening {os.path.basename(file_name)}...",
+                lambda progress: fm.read_figure(file_name, progress=progress),
+            )
+        except FileCancelled:
+            return
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("File Error")
+            msgbox.setText("Failed to open file.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return
+        fm.show_figure(figure, file_name)
+        self.tab_widget.setTabText(
+            self.tab_widget.currentIndex(), file_name.split("/")[-1]
+        )
+
+    def open_project(self, file_name):
+        """Reads a project bundle on a file worker, and opens its figures in tabs."""
+        try:
+            figures = run_file_task(
+                f"Opening {os.path.basename(file_name)}...",
+                lambda progress: figure_io.load_bundle(
+                    file_name,
+                    memory_map=self.preferences.get("memory_map")
+                    and figure_io.CAN_REPLACE_MAPPED,
+                    progress=progress,
+                ),
+            )
+        except FileCancelled:
+            return
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("File Error")
+            msgbox.setText("Failed to open project.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return
+        for figure, metadata in figures:
+            self.new_file()
+            self.fm.show_figure(figure, None)
+            # The figure file the tab was saved to, if any, may have changed since
+            # the project was saved, so it is always written in full
+            self.fm.file_name = metadata.get("file_name")
+            if metadata.get("unsaved"):
+                self.fm.mark_unsaved()
+            elif self.fm.file_name is not None:
+                self.fm.set_label(self.fm.file_name.split("/")[-1])
+
+    def save_project(self):
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getOpenFileName(
-            self, "Open File", "", "Figure Files (*.pkl)", options=options
+        file_name, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Project",
+            "",
+            "FigureForge Project (*.ffproj)",
+            options=options,
         )
-        if file_name:
-            self.fm.file_name = file_name
-            try:
-                self.fm.load_figure(self.fm.file_name)
-            except Exception as e:
-                msgbox = QMessageBox()
-                msgbox.setIcon(QMessageBox.Critical)
-                msgbox.setWindowTitle("File Error")
-                msgbox.setText("Failed to open file.")
-                msgbox.setInformativeText(str(e))
-                msgbox.exec_()
-                return
-            tab_title = (
-                self.fm.file_name.split("/")[-1]
-                if self.fm.file_name is not None
-                else "New Figure"
+        if not file_name:
+            return
+        if not os.path.splitext(file_name)[1]:
+            file_name += figure_io.BUNDLE_EXTENSION
+        figure_managers = list(self.figure_managers)
+        compression = self.preferences.get("compression")
+        if compression == "none":
+            compression = None
+
+        def task(progress):
+            snapshots = [
+                (
+                    fm.take_snapshot(progress),
+                    {"file_name": fm.file_name, "unsaved": fm.unsaved_changes},
+                )
+                for fm in figure_managers
+            ]
+            figure_io.write_bundle(snapshots, file_name, progress, compression)
+
+        try:
+            run_file_task(f"Saving {os.path.basename(file_name)}...", task)
+        except FileCancelled:
+            return
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("File Error")
+            msgbox.setText("Failed to save project.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+
+    def write_figure(self, file_name, compact=False):
+        """
+        Writes the current figure on a file worker. Returns whether it was saved.
+        """
+        fm = self.fm
+        try:
+            full = run_file_task(
+                f"Saving {os.path.basename(file_name)}...",
+                lambda progress: fm.write_figure(file_name, compact, progress),
             )
-            self.tab_widget.setTabText(self.tab_widget.currentIndex(), tab_title)
+        except FileCancelled:
+            return False
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("File Error")
+            msgbox.setText("Failed to save file.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return False
+        fm.mark_saved(file_name, full)
+        return True
 
     def save_file(self):
         if self.fm.file_name is None:
             self.save_as_file()
-        else:
-            self.fm.save_figure(self.fm.file_name)
+            return
+        if not self.write_figure(self.fm.file_name):
+            return
         self.update_recent_files()
         self.tab_widget.setTabText(
             self.tab_widget.currentIndex(),
@@ -296,21 +503,130 @@ class MainWindow(QMainWindow):
 
     def save_as_file(self):
         options = QFileDialog.Options()
-        file_name, _ = QFileDialog.getSaveFileName(
-            self, "Save File", "", "Figure Files (*.pkl)", options=options
+        file_name, selected_filter = QFileDialog.getSaveFileName(
+            self,
+            "Save File",
+            "",
+            "Figure Files (*.pkl);;FigureForge Container (*.ffig)",
+            options=options,
         )
-        if file_name:
-            self.fm.file_name = file_name
-            self.fm.save_figure(self.fm.file_name)
-        self.update_recent_files()
+        if file_name and not os.path.splitext(file_name)[1]:
+            file_name += ".ffig" if "*.ffig" in selected_filter else ".pkl"
+        if file_name and self.write_figure(file_name):
+            self.update_recent_files()
+            self.tab_widget.setTabText(
+                self.tab_widget.currentIndex(), file_name.split("/")[-1]
+            )
+
+    def compact_file(self):
+        if self.fm.file_name is None:
+            self.save_as_file()
+        else:
+            self.write_figure(self.fm.file_name, compact=True)
 
     def export_figure(self):
-        old_dpi = self.fm.figure.get_dpi()
-        ExportFigureDialog(self.preferences, self.fm.figure)
+        fm = self.fm
+        try:
+            # Export a snapshot, so that the figure can be edited meanwhile, and so
+            # that the dialog's preview leaves its dpi and size alone
+            blocks = fm.take_snapshot()
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("Export Error")
+            msgbox.setText("Failed to export figure.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return
+        dialog = ExportFigureDialog(self.preferences, blocks)
+        if dialog.result() == QDialog.Accepted:
+            self.start_export(
+                blocks, dialog.file_name, dialog.targets, dialog.open_file
+            )
+
+    def start_export(self, blocks, file_name, targets, open_file=False):
+        """Exports a figure snapshot to export targets on a file worker, in the
+        background."""
+        worker = FileWorker(self)
+        ExportProgressDialog(
+            f"Exporting {os.path.basename(file_name)}...", worker, self
+        )
+        cache = None
+        if self.preferences.get("export_cache_size"):
+            cache = ExportCache(
+                max_size=self.preferences.get("export_cache_size") * 1024 * 1024
+            )
+        worker.finished.connect(lambda: self.on_export_finished(worker, open_file))
+        worker.start(
+            lambda progress: export.export_targets(
+                figure_io.restore(blocks), file_name, targets, progress, cache
+            )
+        )
+
+    def export_pages(self):
+        """Exports every open figure as the pages of one PDF, in the order of the
+        tabs, on a file worker in the background."""
+        options = QFileDialog.Options()
+        file_name, _ = QFileDialog.getSaveFileName(
+            self, "Export All to PDF", "", "PDF Files (*.pdf)", options=options
+        )
+        if not file_name:
+            return
+        try:
+            # The snapshots share the data of the figures, so taking them all up
+            # front costs little; each is restored only when its page is exported
+            snapshots = [fm.take_snapshot() for fm in self.figure_managers]
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("Export Error")
+            msgbox.setText("Failed to export figures.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return
+        worker = FileWorker(self)
+        ExportProgressDialog(
+            f"Exporting {os.path.basename(file_name)}...", worker, self
+        )
+        worker.finished.connect(lambda: self.on_export_finished(worker, False))
+        worker.start(
+            lambda progress: [
+                export.export_pages(
+                    (figure_io.restore(blocks) for blocks in snapshots),
+                    file_name,
+                    len(snapshots),
+                    progress,
+                )
+            ]
+        )
+
+    def on_export_finished(self, worker, open_file):
+        worker.deleteLater()
+        if worker.cancelled:
+            self.statusBar().showMessage("Export cancelled.", 5000)
+            return
+        if worker.error is not None:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("Export Error")
+            msgbox.setText("Failed to export figure.")
+            msgbox.setInformativeText(str(worker.error))
+            msgbox.exec_()
+            return
+        files = worker.result
+        if len(files) == 1:
+            message = f"Exported figure to {files[0]}"
+            opened = files[0]
+        else:
+            directory = os.path.dirname(files[0]) or os.curdir
+            message = f"Exported {len(files)} files to {directory}"
+            opened = directory
+        self.statusBar().showMessage(message, 10000)
+        QApplication.alert(self)
+        if open_file:
+            QDesktopServices.openUrl(QUrl.fromLocalFile(opened))
         if self.preferences.get("debug"):
-            print("Exported figure")
-        self.fm.figure.set_dpi(old_dpi)
-        self.fm.canvas.draw()
+            print(f"Exported figure to {', '.join(files)}")
 
     def load_plugins(self, reload=False):
         self.splash.showMessage("Loading Plugins...", Qt.AlignBottom | Qt.AlignLeft)
@@ -419,14 +735,31 @@ class MainWindow(QMainWindow):
                 self.plugin_menu.actions()[len(self.plugin_menu.actions()) - 3]
             )
 
+    def edit_preferences(self):
+        """Shows the preferences, and applies them to the open figures once they
+        are saved."""
+        dialog = PreferencesDialog(self.preferences, self)
+        if dialog.result() == QDialog.Accepted:
+            for fm in self.figure_managers:
+                fm.apply_preferences()
+
     def run_plugin(self, plugin_class):
         selected_obj = self.fm.selected_obj
         if selected_obj:
             plugin = plugin_class()
-            plugin.run(selected_obj)
-            self.fm.canvas.draw()
-            self.fm.unsaved_changes = True
-            self.fm.fe.build_tree(self.fm.figure, selected_obj)
+            with self.fm.batch():
+                layout = layout_state(self.fm.figure)
+                plugin.run(selected_obj)
+                # Plugin changes cannot be journaled, so the next save is a full one
+                self.fm.journal.invalidate()
+                # Plugins may change anything, but the layout is only recomputed
+                # if they changed what it depends on
+                if layout_state(self.fm.figure) != layout:
+                    self.fm.relayout()
+                else:
+                    self.fm.request_redraw(self.fm.get_axes(selected_obj))
+                self.fm.mark_unsaved()
+                self.fm.refresh_tree(selected_obj)
 
     def reload_plugins(self):
         actions = self.plugin_menu.actions()
@@ -454,34 +787,138 @@ class MainWindow(QMainWindow):
         NewPluginDialog(new_plugin_filename, plugin_dir)
 
     def copy_figure(self):
-        buf = BytesIO()
-        self.fm.figure.savefig(buf, format="png")
-        buf.seek(0)
-        image = QPixmap()
-        image.loadFromData(buf.getvalue(), "PNG")
+        """Copies the figure to the clipboard, rendered from a snapshot on a file
+        worker in the background. The image is built from the Agg renderer's
+        buffer, at the copy_dpi preference, and SVG or PDF data is added if set in
+        the copy_vector preference."""
+        try:
+            blocks = self.fm.take_snapshot()
+        except Exception as e:
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("Copy Error")
+            msgbox.setText("Failed to copy figure.")
+            msgbox.setInformativeText(str(e))
+            msgbox.exec_()
+            return
+        dpi = self.preferences.get("copy_dpi") or "figure"
+        vector = self.preferences.get("copy_vector")
+
+        def task(progress):
+            figure = figure_io.restore(blocks)
+            data = None
+            if vector in VECTOR_MIME_TYPES:
+                stream = BytesIO()
+                figure.savefig(stream, format=vector, dpi=dpi)
+                data = stream.getvalue()
+            return export.render_image(figure, dpi), data
+
+        # A copy still in progress is superseded by this one
+        worker = FileWorker(self)
+        self.copy_worker = worker
+        worker.finished.connect(lambda: self.on_copy_finished(worker, vector))
+        worker.start(task)
+        self.statusBar().showMessage("Copying figure...")
+
+    def on_copy_finished(self, worker, vector):
+        worker.deleteLater()
+        if worker is not self.copy_worker:
+            return
+        self.copy_worker = None
+        if worker.error is not None:
+            self.statusBar().clearMessage()
+            msgbox = QMessageBox()
+            msgbox.setIcon(QMessageBox.Critical)
+            msgbox.setWindowTitle("Copy Error")
+            msgbox.setText("Failed to copy figure.")
+            msgbox.setInformativeText(str(worker.error))
+            msgbox.exec_()
+            return
+        image, data = worker.result
+        height, width = image.shape[:2]
+        mime_data = QMimeData()
+        # Refers to the rendering rather than copying it, so the rendering is kept
+        # until the clipboard is next set
+        mime_data.setImageData(
+            QImage(image, width, height, image.strides[0], QImage.Format_RGBA8888)
+        )
+        if data is not None:
+            mime_data.setData(VECTOR_MIME_TYPES[vector], data)
+        QApplication.clipboard().setMimeData(mime_data)
+        self.clipboard_image = image
+        self.statusBar().showMessage(f"Copied figure ({width} × {height} px)", 5000)
+        if self.preferences.get("debug"):
+            print(f"Copied figure at {width} x {height} px, with {vector} data")
 
-        clipboard = QApplication.clipboard()
-        clipboard.setPixmap(image)
-        buf.close()
+    def show_slowest_artists(self):
+        if not self.fm.profiling:
+            self.profile_action.setChecked(True)
+        DrawProfileDialog(self.fm)
 
     def get_recent_files(self):
+        """Lists the recent files, with the previews read for them before. The
+        previews of files that are new or have changed since are read on a file
+        worker, so that slow drives do not hold up the menu, and shown once read."""
         self.open_recent_menu.clear()
+        self.recent_actions = {}
         for file in self.preferences.get("recent_files"):
-            action = QAction(file, self)
+            # Owned by the menu, so that clearing it deletes them
+            action = QAction(file, self.open_recent_menu)
             action.triggered.connect(lambda _, file=file: self.open_recent_file(file))
             self.open_recent_menu.addAction(action)
+            self.recent_actions[file] = action
+            self.show_recent_preview(file)
+        if self.recent_preview_worker is not None:
+            return
+        files = list(self.recent_actions)
+        cached = {file: mtime for file, (mtime, _) in self.recent_previews.items()}
+
+        def task(progress):
+            previews = {}
+            for file in files:
+                try:
+                    mtime = os.stat(file).st_mtime_ns
+                    if cached.get(file) != mtime:
+                        # Only the header of the file is read, however large the
+                        # figure
+                        previews[file] = (mtime, figure_io.read_preview(file))
+                except OSError:
+                    previews[file] = (None, None)
+            return previews
+
+        worker = FileWorker(self)
+        self.recent_preview_worker = worker
+        worker.finished.connect(lambda: self.on_recent_previews_read(worker))
+        worker.start(task)
+
+    def on_recent_previews_read(self, worker):
+        worker.deleteLater()
+        self.recent_preview_worker = None
+        if worker.error is not None:
+            return
+        self.recent_previews.update(worker.result)
+        for file in worker.result:
+            if file in self.recent_actions:
+                self.show_recent_preview(file)
+
+    def show_recent_preview(self, file):
+        """Shows the preview of a recent file on its action, if it has been read."""
+        action = self.recent_actions[file]
+        _, preview = self.recent_previews.get(file, (None, None))
+        if preview is None:
+            action.setIcon(QIcon())
+            action.setToolTip("")
+            action.setText(file)
+            return
+        action.setIcon(QIcon(preview_pixmap(preview)))
+        action.setToolTip(preview_text(preview))
+        if preview["title"]:
+            action.setText(f"{preview['title']} ({file})")
 
     def open_recent_file(self, file):
         if not self.check_for_save(self.fm):
             return
-        self.fm.file_name = file
-        self.fm.load_figure(self.fm.file_name)
-        tab_title = (
-            self.fm.file_name.split("/")[-1]
-            if self.fm.file_name is not None
-            else "New Figure"
-        )
-        self.tab_widget.setTabText(self.tab_widget.currentIndex(), tab_title)
+        self.open_figure(file)
 
     def update_recent_files(self):
         recent_files = self.preferences.get("recent_files")
@@ -492,7 +929,6 @@ class MainWindow(QMainWindow):
                 recent_files.pop()
         recent_files.insert(0, self.fm.file_name)
         self.preferences.set("recent_files", recent_files)
-        self.get_recent_files()
 
         print(f"Updated recent files: {recent_files}")
 
@@ -503,13 +939,16 @@ class MainWindow(QMainWindow):
             self.pi = self.fm.pi
             self.left_splitter.replaceWidget(0, self.fe)
             self.left_splitter.replaceWidget(1, self.pi)
+            self.profile_action.blockSignals(True)
+            self.profile_action.setChecked(self.fm.profiling)
+            self.profile_action.blockSignals(False)
         except AttributeError:
             pass
 
     def close_tab(self, index):
         if not self.check_for_save(self.figure_managers[index]):
             return
-        self.figure_managers.pop(index)
+        self.autosaver.discard(self.figure_managers.pop(index))
         self.tab_widget.removeTab(index)
 
     def quit(self):
@@ -523,6 +962,7 @@ class MainWindow(QMainWindow):
             if not self.check_for_save(fm):
                 event.ignore()
                 return
+        self.autosaver.clear()
         event.accept()
 
     def check_for_save(self, fm):
@@ -12,15 +12,20 @@ from PySide6.QtWidgets import (
     QFileDialog,
     QCheckBox,
     QComboBox,
+    QSpinBox,
     QHBoxLayout,
     QFormLayout,
     QDialogButtonBox,
+    QPlainTextEdit,
 )
 
 import qdarktheme
 
 from FigureForge.__init__ import CURRENT_DIR
 from FigureForge import __version__
+from FigureForge import export
+from FigureForge import figure_io
+from FigureForge.export_cache import ExportCache
 
 
 class Preferences:
@@ -40,6 +45,29 @@ class Preferences:
             "show_welcome": True,
             "recent_files": [],
             "check_for_updates": True,
+            "redraw_interval": 50,
+            "redraw_max_delay": 250,
+            "blit_edits": True,
+            "cache_axes": True,
+            "background_rendering": True,
+            "level_of_detail": True,
+            "lod_threshold": 100000,
+            "collection_raster": True,
+            "raster_threshold": 100000,
+            "progressive_steps": [25],
+            "freeze_layout": True,
+            "memory_map": figure_io.CAN_REPLACE_MAPPED,
+            "incremental_saves": True,
+            "autosave_interval": 60,
+            "compression": "none",
+            "export_profiles": {
+                "Publication": export.parse_targets(
+                    "png@150, png@300, png@600, pdf, svg"
+                )
+            },
+            "export_cache_size": 1024,
+            "copy_dpi": 0,
+            "copy_vector": "none",
         }
         self.preferences = self.load_preferences()
 
@@ -141,6 +169,172 @@ class PreferencesDialog(QDialog):
         self.debug_checkbox.setChecked(self.preferences.get("debug"))
         form_layout.addRow(QLabel("Debug Mode:"), self.debug_checkbox)
 
+        self.redraw_interval_spinbox = QSpinBox(self)
+        self.redraw_interval_spinbox.setRange(0, 2000)
+        self.redraw_interval_spinbox.setSuffix(" ms")
+        self.redraw_interval_spinbox.setValue(self.preferences.get("redraw_interval"))
+        self.redraw_interval_spinbox.setToolTip(
+            "Edits made within this window are merged into a single redraw."
+        )
+        form_layout.addRow(QLabel("Redraw Delay:"), self.redraw_interval_spinbox)
+
+        self.background_rendering_checkbox = QCheckBox(self)
+        self.background_rendering_checkbox.setChecked(
+            self.preferences.get("background_rendering")
+        )
+        self.background_rendering_checkbox.setToolTip(
+            "Render figures on a background thread to keep the window responsive."
+        )
+        form_layout.addRow(
+            QLabel("Background Rendering:"), self.background_rendering_checkbox
+        )
+
+        self.progressive_steps_edit = QLineEdit(self)
+        self.progressive_steps_edit.setText(
+            ", ".join(str(step) for step in self.preferences.get("progressive_steps"))
+        )
+        self.progressive_steps_edit.setToolTip(
+            "Resolutions, in percent, at which opened figures are shown while the "
+            "full resolution render is in progress. Leave empty to disable."
+        )
+        form_layout.addRow(
+            QLabel("Progressive Steps (%):"), self.progressive_steps_edit
+        )
+
+        self.freeze_layout_checkbox = QCheckBox(self)
+        self.freeze_layout_checkbox.setChecked(self.preferences.get("freeze_layout"))
+        self.freeze_layout_checkbox.setToolTip(
+            "Only recompute the layout when a property that affects it changes. "
+            "Use Edit > Relayout to recompute it manually."
+        )
+        form_layout.addRow(QLabel("Freeze Layout:"), self.freeze_layout_checkbox)
+
+        self.memory_map_checkbox = QCheckBox(self)
+        self.memory_map_checkbox.setChecked(self.preferences.get("memory_map"))
+        self.memory_map_checkbox.setToolTip(
+            "Map the data of .ffig files into memory when opening them, so that it "
+            "is only read from disk as it is needed."
+        )
+        if not figure_io.CAN_REPLACE_MAPPED:
+            # Files could not be saved over while their figures are open
+            self.memory_map_checkbox.setChecked(False)
+            self.memory_map_checkbox.setEnabled(False)
+            self.memory_map_checkbox.setToolTip(
+                "Not available on Windows, which cannot save over mapped files."
+            )
+        form_layout.addRow(QLabel("Memory-Map Figure Files:"), self.memory_map_checkbox)
+
+        self.incremental_saves_checkbox = QCheckBox(self)
+        self.incremental_saves_checkbox.setChecked(
+            self.preferences.get("incremental_saves")
+        )
+        self.incremental_saves_checkbox.setToolTip(
+            "Save edits to an existing file by appending them to a journal next to "
+            "it. Use File > Compact to fold the journal into the file."
+        )
+        form_layout.addRow(
+            QLabel("Incremental Saves:"), self.incremental_saves_checkbox
+        )
+
+        self.autosave_interval_spinbox = QSpinBox(self)
+        self.autosave_interval_spinbox.setRange(0, 3600)
+        self.autosave_interval_spinbox.setSuffix(" s")
+        self.autosave_interval_spinbox.setSpecialValueText("Off")
+        self.autosave_interval_spinbox.setValue(
+            self.preferences.get("autosave_interval")
+        )
+        self.autosave_interval_spinbox.setToolTip(
+            "Save figures with unsaved changes in the background at this interval, "
+            "so that they can be recovered if FigureForge does not close properly."
+        )
+        form_layout.addRow(QLabel("Autosave Interval:"), self.autosave_interval_spinbox)
+
+        self.compression_combo = QComboBox(self)
+        self.compression_combo.addItems(["none", "gzip", "bz2", "lzma"])
+        self.compression_combo.setCurrentText(self.preferences.get("compression"))
+        self.compression_combo.setToolTip(
+            "Compress figure files when saving them. Smaller files are slower to "
+            "save and open, and compressed .ffig files cannot be memory-mapped."
+        )
+        form_layout.addRow(QLabel("Compression:"), self.compression_combo)
+
+        self.export_profiles_edit = QPlainTextEdit(self)
+        self.export_profiles_edit.setPlainText(
+            "\n".join(
+                f"{name}: {export.format_targets(targets)}"
+                for name, targets in self.preferences.get("export_profiles").items()
+            )
+        )
+        self.export_profiles_edit.setFixedHeight(80)
+        self.export_profiles_edit.setToolTip(
+            "One profile per line, as Name: format@dpi:WIDTHxHEIGHT, ... with the "
+            "DPI and size in inches optional, such as Slides: png@150:10x5.625, pdf"
+        )
+        form_layout.addRow(QLabel("Export Profiles:"), self.export_profiles_edit)
+
+        self.export_cache_size_spinbox = QSpinBox(self)
+        self.export_cache_size_spinbox.setRange(0, 1_000_000)
+        self.export_cache_size_spinbox.setSuffix(" MB")
+        self.export_cache_size_spinbox.setSpecialValueText("Off")
+        self.export_cache_size_spinbox.setValue(
+            self.preferences.get("export_cache_size")
+        )
+        self.export_cache_size_spinbox.setToolTip(
+            "Keep up to this much of recent exports, so that exporting a figure "
+            "that has not changed since with the same settings copies the earlier "
+            "export instead of rendering it again."
+        )
+        export_cache_layout = QHBoxLayout()
+        export_cache_layout.addWidget(self.export_cache_size_spinbox)
+        clear_export_cache_button = QPushButton("Clear")
+        clear_export_cache_button.clicked.connect(self.clear_export_cache)
+        export_cache_layout.addWidget(clear_export_cache_button)
+        form_layout.addRow(QLabel("Export Cache:"), export_cache_layout)
+
+        self.copy_dpi_spinbox = QSpinBox(self)
+        self.copy_dpi_spinbox.setRange(0, 2400)
+        self.copy_dpi_spinbox.setSuffix(" DPI")
+        self.copy_dpi_spinbox.setSpecialValueText("Figure")
+        self.copy_dpi_spinbox.setValue(self.preferences.get("copy_dpi"))
+        self.copy_dpi_spinbox.setToolTip(
+            "The resolution to copy figures to the clipboard at, or Figure for the "
+            "DPI of each figure."
+        )
+        form_layout.addRow(QLabel("Copy DPI:"), self.copy_dpi_spinbox)
+
+        self.copy_vector_combo = QComboBox(self)
+        self.copy_vector_combo.addItems(["none", "svg", "pdf"])
+        self.copy_vector_combo.setCurrentText(self.preferences.get("copy_vector"))
+        self.copy_vector_combo.setToolTip(
+            "Also put the figure on the clipboard in this vector format, for "
+            "applications that paste it. Copying takes longer for large figures."
+        )
+        form_layout.addRow(QLabel("Copy Vector Format:"), self.copy_vector_combo)
+
+        self.level_of_detail_checkbox = QCheckBox(self)
+        self.level_of_detail_checkbox.setChecked(
+            self.preferences.get("level_of_detail")
+        )
+        self.level_of_detail_checkbox.setToolTip(
+            "Preview lines with very many points from reduced data. "
+            "Saved and exported figures always use the full data."
+        )
+        form_layout.addRow(
+            QLabel("Simplify Large Lines:"), self.level_of_detail_checkbox
+        )
+
+        self.collection_raster_checkbox = QCheckBox(self)
+        self.collection_raster_checkbox.setChecked(
+            self.preferences.get("collection_raster")
+        )
+        self.collection_raster_checkbox.setToolTip(
+            "Preview scatter plots with very many markers from a cached image. "
+            "Saved and exported figures always draw every marker."
+        )
+        form_layout.addRow(
+            QLabel("Rasterize Large Scatter Plots:"), self.collection_raster_checkbox
+        )
+
         button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         button_box.accepted.connect(self.save_preferences)
         button_box.rejected.connect(self.reject)
@@ -164,6 +358,9 @@ class PreferencesDialog(QDialog):
         if file:
             self.plugin_requirements_edit.setText(file)
 
+    def clear_export_cache(self):
+        ExportCache().clear()
+
     def save_preferences(self):
         self.preferences.set("plugin_directory", self.plugin_directory_edit.text())
         self.preferences.set(
@@ -171,4 +368,43 @@ class PreferencesDialog(QDialog):
         )
         self.preferences.set("theme", self.theme_combo.currentText())
         self.preferences.set("debug", self.debug_checkbox.isChecked())
+        self.preferences.set("redraw_interval", self.redraw_interval_spinbox.value())
+        self.preferences.set(
+            "background_rendering", self.background_rendering_checkbox.isChecked()
+        )
+        self.preferences.set(
+            "progressive_steps",
+            [
+                int(step)
+                for step in re.findall(r"\d+", self.progressive_steps_edit.text())
+                if 0 < int(step) < 100
+            ],
+        )
+        self.preferences.set("freeze_layout", self.freeze_layout_checkbox.isChecked())
+        self.preferences.set("memory_map", self.memory_map_checkbox.isChecked())
+        self.preferences.set(
+            "incremental_saves", self.incremental_saves_checkbox.isChecked()
+        )
+        self.preferences.set(
+            "autosave_interval", self.autosave_interval_spinbox.value()
+        )
+        self.preferences.set("compression", self.compression_combo.currentText())
+        export_profiles = {}
+        for line in self.export_profiles_edit.toPlainText().splitlines():
+            name, _, targets = line.partition(":")
+            targets = export.parse_targets(targets)
+            if name.strip() and targets:
+                export_profiles[name.strip()] = targets
+        self.preferences.set("export_profiles", export_profiles)
+        self.preferences.set(
+            "export_cache_size", self.export_cache_size_spinbox.value()
+        )
+        self.preferences.set("copy_dpi", self.copy_dpi_spinbox.value())
+        self.preferences.set("copy_vector", self.copy_vector_combo.currentText())
+        self.preferences.set(
+            "level_of_detail", self.level_of_detail_checkbox.isChecked()
+        )
+        self.preferences.set(
+            "collection_raster", self.collection_raster_checkbox.isChecked()
+        )
         self.accept()
@@ -0,0 +1,258 @@
+import threading
+from operator import methodcaller
+
+import numpy as np
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import RendererAgg
+
+from FigureForge.rendering.render_worker import make_cancellable, RenderCancelled
+
+
+class Layer:
+    """
+    A group of figure-level artists that are rendered together and cached as one
+    raster.
+
+    Attributes:
+        artists (list): The artists in the layer, in draw order.
+        axes (Axes): The Axes the layer renders, or None for a figure-level layer.
+        raster (np.ndarray): The cropped RGBA raster, or None if it must be rendered.
+        offset (tuple): The (row, column) of the raster's top-left pixel.
+    """
+
+    def __init__(self, artists, axes=None) -> None:
+        self.artists = artists
+        self.axes = axes
+        self.raster = None
+        self.offset = (0, 0)
+
+
+class AxesRasterCache:
+    """
+    Renders a figure as a stack of layers, one per Axes, and keeps each layer's
+    raster so that edits only re-render the Axes they touch.
+
+    A full render runs the layout engine and renders every layer into a scratch
+    buffer; each raster is cropped to the pixels the layer actually covers. After
+    that, `mark_dirty` flags the Axes containing an edited artist, and a render
+    re-renders only the dirty Axes before compositing all layers.
+
+    `render_buffer` may run on a render worker thread while the GUI thread keeps
+    marking Axes dirty; the dirty state is guarded by a lock, and the Axes a
+    cancelled render did not finish are marked dirty again.
+
+    Attributes:
+        canvas (FigureCanvas): The canvas to render to.
+        layers (list): The cached layers, in draw order.
+        dirty (set): The Axes whose layers must be re-rendered.
+        valid (bool): Whether the cached layers can be reused at all.
+    """
+
+    def __init__(self, canvas) -> None:
+        """
+        Initializes a new instance of the AxesRasterCache class.
+
+        Args:
+            canvas (FigureCanvas): The canvas to render to.
+        """
+        self.canvas = canvas
+        self.layers = []
+        self.dirty = set()
+        self.valid = False
+        self._key = None
+        self._lock = threading.Lock()
+
+    def invalidate(self) -> None:
+        """
+        Discards all cached layers, so that the next render is a full render.
+        """
+        with self._lock:
+            self.valid = False
+            self.dirty = set()
+
+    def mark_dirty(self, artist) -> None:
+        """
+        Marks the Axes containing an artist, and the Axes sharing an axis with it, as
+        needing to be re-rendered. Artists that do not belong to an Axes of the
+        figure invalidate the whole cache.
+
+        Args:
+            artist: The artist that changed.
+        """
+        ax = self._figure_axes(artist)
+        if ax is None:
+            self.invalidate()
+            return
+        with self._lock:
+            self.dirty.add(ax)
+            for shared in (ax.get_shared_x_axes(), ax.get_shared_y_axes()):
+                self.dirty.update(shared.get_siblings(ax))
+
+    def render(self) -> None:
+        """
+        Renders the figure into the canvas on the calling thread.
+        """
+        renderer = self.canvas.get_renderer()
+        if not self.canvas.figure.get_visible():
+            self.invalidate()
+            self.canvas.draw()
+            return
+        buffer = self.render_buffer(renderer.width, renderer.height, renderer.dpi)
+        np.asarray(renderer.buffer_rgba())[...] = buffer
+        self.canvas.update()
+
+    def render_buffer(self, width, height, dpi, cancelled=None) -> np.ndarray:
+        """
+        Re-renders the dirty layers (or all layers, if the cache is invalid) and
+        composites them into a new buffer.
+
+        Args:
+            width (int): The width of the buffer in pixels.
+            height (int): The height of the buffer in pixels.
+            dpi (float): The resolution to render at.
+            cancelled (threading.Event): An event that cancels the render, if given.
+
+        Returns:
+            The composited RGBA buffer.
+        """
+        with self._lock:
+            dirty, self.dirty = self.dirty, set()
+            valid, self.valid = self.valid, True
+
+        scratch = RendererAgg(width, height, dpi)
+        if cancelled is not None:
+            make_cancellable(scratch, cancelled)
+        try:
+            if not valid or self._key != self._layout_key(width, height, dpi):
+                self._build_layers(scratch)
+            for layer in self.layers:
+                if layer.raster is None or layer.axes in dirty:
+                    self._render_layer(layer, scratch)
+        except RenderCancelled:
+            with self._lock:
+                self.dirty |= dirty
+                self.valid = self.valid and valid
+            raise
+
+        buffer = np.zeros((height, width, 4), np.uint8)
+        self._composite(buffer)
+        self.canvas.figure.stale = False
+        return buffer
+
+    def _build_layers(self, renderer) -> None:
+        """
+        Runs the layout engine and splits the figure's children into layers: the
+        figure patch, one layer per Axes, and one layer per run of other artists.
+        """
+        figure = self.canvas.figure
+        engine = figure.get_layout_engine()
+        if figure.axes and engine is not None:
+            try:
+                engine.execute(figure)
+            except ValueError:
+                # ValueError can occur when resizing a window.
+                pass
+
+        layers = [Layer([figure.patch])]
+        for artist in self._draw_order(figure):
+            if isinstance(artist, Axes):
+                layers.append(Layer([artist], artist))
+            elif layers[-1].axes is None:
+                layers[-1].artists.append(artist)
+            else:
+                layers.append(Layer([artist]))
+        self.layers = layers
+        self._key = self._layout_key(renderer.width, renderer.height, renderer.dpi)
+
+    def _render_layer(self, layer, scratch) -> None:
+        """
+        Renders a layer into the scratch buffer and caches the cropped result.
+        """
+        scratch.clear()
+        for artist in layer.artists:
+            artist.draw(scratch)
+        buffer = np.asarray(scratch.buffer_rgba())
+        coverage = buffer[..., 3] > 0
+        rows = np.flatnonzero(coverage.any(axis=1))
+        columns = np.flatnonzero(coverage.any(axis=0))
+        if rows.size == 0:
+            layer.raster = buffer[:0, :0].copy()
+            layer.offset = (0, 0)
+            return
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = columns[0], columns[-1] + 1
+        layer.raster = buffer[top:bottom, left:right].copy()
+        layer.offset = (top, left)
+
+    def _composite(self, target) -> None:
+        """
+        Composites the cached layers, in order, into the target RGBA buffer.
+        """
+        for layer in self.layers:
+            if layer.raster.size == 0:
+                continue
+            top, left = layer.offset
+            height, width = layer.raster.shape[:2]
+            region = target[top : top + height, left : left + width]
+            region[...] = _over(layer.raster, region)
+
+    def _layout_key(self, width, height, dpi) -> tuple:
+        figure = self.canvas.figure
+        return (
+            width,
+            height,
+            dpi,
+            tuple(id(artist) for artist in self._draw_order(figure)),
+        )
+
+    def _draw_order(self, figure) -> list:
+        """
+        Returns the children of the figure in the order that `Figure.draw` draws
+        them, excluding the figure patch.
+        """
+        children = figure.get_children()
+        children.remove(figure.patch)
+        return sorted(
+            (c for c in children if not c.get_animated()),
+            key=methodcaller("get_zorder"),
+        )
+
+    def _figure_axes(self, artist):
+        """
+        Returns the top-level Axes of the figure that is, or contains, an artist, or
+        None.
+        """
+        children = self.canvas.figure.get_children()
+        figure_axes = [c for c in children if isinstance(c, Axes)]
+        ax = getattr(artist, "axes", None)
+        if not isinstance(ax, Axes):
+            ax = None
+        if ax in figure_axes:
+            return ax
+        for candidate in figure_axes:
+            if _contains(candidate, ax if ax is not None else artist):
+                return candidate
+        return None
+
+
+def _contains(parent, artist) -> bool:
+    for child in parent.get_children():
+        if child is artist or _contains(child, artist):
+            return True
+    return False
+
+
+def _over(source, destination) -> np.ndarray:
+    """
+    Composites a straight-alpha RGBA source over a straight-alpha RGBA destination,
+    as Agg does when drawing onto the destination directly.
+    """
+    src = source.astype(np.float32) / 255
+    dst = destination.astype(np.float32) / 255
+    src_alpha = src[..., 3:]
+    dst_alpha = dst[..., 3:] * (1 - src_alpha)
+    alpha = src_alpha + dst_alpha
+    rgb = src[..., :3] * src_alpha + dst[..., :3] * dst_alpha
+    rgb = np.divide(rgb, alpha, out=np.zeros_like(rgb), where=alpha > 0)
+    result = np.concatenate([rgb, alpha], axis=-1)
+    return np.round(result * 255).astype(np.uint8)
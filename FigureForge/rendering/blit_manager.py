@@ -0,0 +1,176 @@
+from operator import methodcaller
+
+from matplotlib.axes import Axes
+
+
+class BlitManager:
+    """
+    Redraws an edited artist on top of a cached background instead of re-rendering
+    the whole figure.
+
+    The background is captured by drawing the figure once with the edited artist
+    (and everything drawn on top of it) marked as animated, which excludes those
+    artists from the draw without affecting the layout. Subsequent edits restore the
+    background and draw only the excluded artists, so stacking order is preserved.
+    The background is discarded whenever anything else draws the canvas.
+
+    Attributes:
+        canvas (FigureCanvas): The canvas to blit to.
+        background: The cached background region, or None if there is none.
+        artist: The artist the background was captured for.
+        artists (list): The artists that are redrawn on top of the background.
+    """
+
+    def __init__(self, canvas) -> None:
+        """
+        Initializes a new instance of the BlitManager class.
+
+        Args:
+            canvas (FigureCanvas): The canvas to blit to.
+        """
+        self.canvas = canvas
+        self.background = None
+        self.artist = None
+        self.artists = []
+        self.cid = None
+        self._callbacks = None
+        self._capturing = False
+
+    def connect(self) -> None:
+        """
+        Connects to the draw events of the canvas' current figure. Must be called
+        again whenever the figure's state is replaced, as its callback registry is
+        replaced with it.
+        """
+        # Connected once per registry, as the figure's state may be replaced by
+        # state that shares it
+        if self.canvas.callbacks is not self._callbacks:
+            self._callbacks = self.canvas.callbacks
+            self.cid = self.canvas.mpl_connect("draw_event", self.on_draw)
+        self.invalidate()
+
+    def on_draw(self, event) -> None:
+        """
+        Discards the cached background when the canvas is drawn by anything else.
+        """
+        if not self._capturing:
+            self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Discards the cached background.
+        """
+        self.background = None
+        self.artist = None
+        self.artists = []
+
+    def can_blit(self, artist) -> bool:
+        """
+        Returns whether an artist can be redrawn on its own.
+
+        Only artists that live inside an Axes (but not Axes themselves) qualify;
+        edits to figure-level artists fall back to a full draw.
+        """
+        ax = getattr(artist, "axes", None)
+        if not isinstance(ax, Axes) or isinstance(artist, Axes):
+            return False
+        if ax not in self.canvas.figure.get_children():
+            return False
+        return self._find_child(ax, artist) in self._draw_order(ax)
+
+    def blit(self, artist) -> None:
+        """
+        Redraws an artist (and the artists on top of it) over the cached background,
+        capturing the background first if needed.
+
+        Args:
+            artist: The artist to redraw.
+        """
+        if self.background is None or self.artist is not artist:
+            self.capture(artist)
+        renderer = self.canvas.get_renderer()
+        self.canvas.restore_region(self.background)
+        for a in self.artists:
+            a.draw(renderer)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    def capture(self, artist) -> None:
+        """
+        Draws the figure without the artist and the artists drawn on top of it, and
+        caches the result as the background.
+
+        Args:
+            artist: The artist to capture the background for.
+        """
+        self.artists = self._artists_above(artist)
+        animated = [a.get_animated() for a in self.artists]
+        for a in self.artists:
+            a.set_animated(True)
+        self._capturing = True
+        try:
+            self.canvas.draw()
+        finally:
+            self._capturing = False
+            for a, was_animated in zip(self.artists, animated):
+                a.set_animated(was_animated)
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self.artist = artist
+
+    def _artists_above(self, artist) -> list:
+        """
+        Returns the artists that must be redrawn when `artist` changes, in draw
+        order: the top-level Axes child containing it, the Axes children drawn after
+        it, and the figure-level artists drawn after the Axes that could overlap it.
+        """
+        ax = artist.axes
+        children = self._draw_order(ax)
+        artists = children[children.index(self._find_child(ax, artist)) :]
+
+        figure = self.canvas.figure
+        siblings = figure.get_children()
+        siblings.remove(figure.patch)
+        siblings = sorted(
+            (s for s in siblings if not s.get_animated()),
+            key=methodcaller("get_zorder"),
+        )
+        # Tick labels and annotations can extend beyond the Axes' own extent
+        renderer = self.canvas.get_renderer()
+        extent = ax.get_tightbbox(renderer)
+        for sibling in siblings[siblings.index(ax) + 1 :]:
+            if isinstance(sibling, Axes) and not sibling.get_tightbbox(
+                renderer
+            ).overlaps(extent):
+                continue
+            artists.append(sibling)
+        return artists
+
+    def _draw_order(self, ax) -> list:
+        """
+        Returns the children of `ax` in the order that `Axes.draw` draws them,
+        excluding the Axes patch.
+        """
+        children = ax.get_children()
+        children.remove(ax.patch)
+        if not (ax.axison and ax.get_frame_on()):
+            children = [c for c in children if c not in ax.spines.values()]
+        if not ax.axison:
+            children = [c for c in children if c not in (ax.xaxis, ax.yaxis)]
+        return sorted(
+            (c for c in children if not c.get_animated()),
+            key=methodcaller("get_zorder"),
+        )
+
+    def _find_child(self, ax, artist):
+        """
+        Returns the direct child of `ax` that is, or contains, `artist`.
+        """
+        for child in ax.get_children():
+            if child is artist or self._contains(child, artist):
+                return child
+        return None
+
+    def _contains(self, parent, artist) -> bool:
+        for child in parent.get_children():
+            if child is artist or self._contains(child, artist):
+                return True
+        return False
@@ -0,0 +1,134 @@
+import weakref
+
+import numpy as np
+from matplotlib.collections import PathCollection
+from matplotlib.backends.backend_agg import RendererAgg
+
+from FigureForge.rendering.draw_override import DrawOverride
+
+
+class CollectionRaster(DrawOverride):
+    """
+    Draws PathCollections with very many markers from a cached image in preview
+    renders.
+
+    The first draw of a large collection renders it on its own into a scratch buffer
+    and keeps the cropped result; later draws paste that image instead of drawing
+    every marker again. The image is regenerated when the collection's offsets,
+    sizes, colors or line widths change, or when the view limits, the size of the
+    Axes or the resolution change.
+
+    The image only replaces the collection inside `apply`, so exports and saved
+    files always draw every marker.
+
+    Attributes:
+        threshold (int): The number of markers above which a collection is cached.
+    """
+
+    def __init__(self, threshold=100_000) -> None:
+        """
+        Initializes a new instance of the CollectionRaster class.
+
+        Args:
+            threshold (int): The number of markers above which a collection is
+                cached.
+        """
+        super().__init__()
+        self.threshold = threshold
+        self._cache = weakref.WeakKeyDictionary()
+
+    def _select(self, figure):
+        return [
+            collection
+            for ax in figure.axes
+            for collection in ax.collections
+            if isinstance(collection, PathCollection)
+            and len(collection.get_offsets()) >= self.threshold
+            and not collection.get_path_effects()
+        ]
+
+    def _draw(self, collection, renderer) -> None:
+        """
+        Draws a collection from its cached image, rendering the image if needed.
+        """
+        if not collection.get_visible():
+            return
+        state = self._state(collection, renderer)
+        cached = self._cache.get(collection)
+        if cached is None or not _same(cached[0], state):
+            cached = (state, *self._rasterize(collection, renderer))
+            self._cache[collection] = cached
+        _, image, left, bottom = cached
+        if image.size:
+            gc = renderer.new_gc()
+            collection._set_gc_clip(gc)
+            gc.set_alpha(1.0)
+            renderer.draw_image(gc, left, bottom, image)
+            gc.restore()
+        collection.stale = False
+
+    def _state(self, collection, renderer) -> tuple:
+        """
+        Returns everything the cached image of a collection depends on. Arrays are
+        compared by identity, since matplotlib replaces them when they are set.
+        """
+        ax = collection.axes
+        if collection.get_array() is not None:
+            # Mapped colors are recomputed on every draw, so compare their inputs
+            norm = collection.norm
+            colors = (
+                collection.get_array(),
+                collection.get_cmap(),
+                type(norm),
+                norm.vmin,
+                norm.vmax,
+                collection._original_facecolor,
+                collection._original_edgecolor,
+            )
+        else:
+            colors = (collection.get_facecolor(), collection.get_edgecolor())
+        return (
+            collection.get_offsets(),
+            collection.get_sizes(),
+            *colors,
+            tuple(np.atleast_1d(collection.get_linewidth())),
+            collection.get_alpha(),
+            collection.get_paths(),
+            tuple(ax.viewLim.bounds),
+            tuple(ax.bbox.bounds),
+            ax.get_xscale(),
+            ax.get_yscale(),
+            (renderer.width, renderer.height, renderer.dpi),
+        )
+
+    def _rasterize(self, collection, renderer) -> tuple:
+        """
+        Renders a collection on its own and returns the cropped image, bottom row
+        first as `draw_image` expects, along with the display coordinates of its
+        bottom-left corner.
+        """
+        scratch = RendererAgg(int(renderer.width), int(renderer.height), renderer.dpi)
+        type(collection).draw(collection, scratch)
+        buffer = np.asarray(scratch.buffer_rgba())
+        coverage = buffer[..., 3] > 0
+        rows = np.flatnonzero(coverage.any(axis=1))
+        columns = np.flatnonzero(coverage.any(axis=0))
+        if rows.size == 0:
+            return buffer[:0, :0].copy(), 0, 0
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = columns[0], columns[-1] + 1
+        image = buffer[top:bottom, left:right][::-1].copy()
+        return image, left, buffer.shape[0] - bottom
+
+
+def _same(a, b) -> bool:
+    """
+    Returns whether two cache states are equal, comparing arrays by identity.
+    """
+    for x, y in zip(a, b):
+        if isinstance(x, (np.ndarray, list)) or isinstance(y, (np.ndarray, list)):
+            if x is not y:
+                return False
+        elif x != y:
+            return False
+    return True
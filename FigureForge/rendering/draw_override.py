@@ -0,0 +1,74 @@
+import threading
+from contextlib import contextmanager
+
+
+class DrawOverride:
+    """
+    Replaces how some artists of a figure draw themselves, but only inside the
+    `apply` context. Subclasses choose the artists in `_select` and draw them in
+    `_draw`.
+
+    While the context is entered, the selected artists get an instance `draw`
+    method, which is removed again when the last context exits. Contexts may be
+    nested and entered from several threads; only draws made on a thread inside the
+    context are overridden, so an export running on another thread at the same time
+    draws the artists normally.
+    """
+
+    def __init__(self) -> None:
+        self._artists = []
+        self._depth = 0
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    @contextmanager
+    def apply(self, figure):
+        """
+        A context in which the selected artists of the figure draw through `_draw`.
+
+        Args:
+            figure (Figure): The figure being rendered.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._install(figure)
+            self._depth += 1
+        self._local.depth = getattr(self._local, "depth", 0) + 1
+        try:
+            yield
+        finally:
+            self._local.depth -= 1
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._uninstall()
+
+    def _install(self, figure) -> None:
+        self._artists = list(self._select(figure))
+        for artist in self._artists:
+            artist.draw = lambda renderer, artist=artist: self._dispatch(
+                artist, renderer
+            )
+
+    def _uninstall(self) -> None:
+        for artist in self._artists:
+            artist.__dict__.pop("draw", None)
+        self._artists = []
+
+    def _dispatch(self, artist, renderer) -> None:
+        if getattr(self._local, "depth", 0):
+            self._draw(artist, renderer)
+        else:
+            type(artist).draw(artist, renderer)
+
+    def _select(self, figure):
+        """
+        Returns the artists of the figure whose drawing is overridden.
+        """
+        raise NotImplementedError
+
+    def _draw(self, artist, renderer) -> None:
+        """
+        Draws an artist in place of its own `draw` method.
+        """
+        raise NotImplementedError
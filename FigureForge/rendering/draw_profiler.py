@@ -0,0 +1,155 @@
+import time
+from contextlib import contextmanager
+
+from FigureForge.rendering.draw_override import DrawOverride
+
+
+class DrawTime:
+    """
+    The time an artist took to draw during a profiled render.
+
+    Attributes:
+        calls (int): The number of times the artist was drawn.
+        self_time (float): The time spent in the artist's own draw method, excluding
+            the draws of other profiled artists it made, in seconds.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.self_time = 0.0
+
+
+class DrawProfiler(DrawOverride):
+    """
+    Times the `draw` call of every artist of a figure during a render.
+
+    Each artist's self time excludes the time spent drawing the artists it draws in
+    turn. The total time of an artist is its self time plus the total times of its
+    children, as returned by `get_children`, so that the cost of every branch of the
+    figure adds up to the cost of the whole figure.
+
+    Attributes:
+        times (dict): The DrawTime of every artist drawn in the last profiled render.
+        elapsed (float): The wall time of the last profiled render, in seconds.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes a new instance of the DrawProfiler class.
+        """
+        super().__init__()
+        self.times = {}
+        self.elapsed = 0.0
+        self._stack = []
+        self._totals = {}
+
+    @contextmanager
+    def profile(self, figure):
+        """
+        A context in which every draw of an artist of the figure is timed. The
+        results of any earlier profile are discarded.
+
+        Args:
+            figure (Figure): The figure to profile.
+        """
+        self.times = {}
+        self._totals = {}
+        self._stack = []
+        start = time.perf_counter()
+        with self.apply(figure):
+            yield
+        self.elapsed = time.perf_counter() - start
+
+    def _select(self, figure):
+        return list(_descendants(figure))
+
+    def _draw(self, artist, renderer) -> None:
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            type(artist).draw(artist, renderer)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            draw_time = self.times.setdefault(artist, DrawTime())
+            draw_time.calls += 1
+            draw_time.self_time += elapsed - children
+
+    def self_time(self, artist) -> float:
+        """
+        Returns the self time of an artist in the last profile, in seconds.
+        """
+        draw_time = self.times.get(artist)
+        return draw_time.self_time if draw_time is not None else 0.0
+
+    def total_time(self, artist) -> float:
+        """
+        Returns the total time of an artist and its children in the last profile, in
+        seconds.
+        """
+        if artist not in self._totals:
+            self._totals[artist] = self.self_time(artist) + sum(
+                self.total_time(child) for child in artist.get_children()
+            )
+        return self._totals[artist]
+
+    def slowest(self, n=None) -> list:
+        """
+        Returns the artists with the largest self times in the last profile.
+
+        Args:
+            n (int): The number of artists to return, or None for all of them.
+
+        Returns:
+            A list of (artist, DrawTime) tuples, slowest first.
+        """
+        ranked = sorted(
+            self.times.items(), key=lambda item: item[1].self_time, reverse=True
+        )
+        return ranked if n is None else ranked[:n]
+
+    def to_dict(self, figure) -> dict:
+        """
+        Returns the last profile as a JSON-serializable dict, with one nested entry
+        per artist following the `get_children` hierarchy. Times are in
+        milliseconds.
+
+        Args:
+            figure (Figure): The profiled figure.
+        """
+        return {
+            "elapsed_ms": self.elapsed * 1000,
+            "size_inches": [float(v) for v in figure.get_size_inches()],
+            "dpi": float(figure.dpi),
+            "root": self._entry(figure, "Figure"),
+        }
+
+    def _entry(self, artist, path) -> dict:
+        draw_time = self.times.get(artist)
+        children = []
+        counts = {}
+        for child in artist.get_children():
+            name = child.__class__.__name__
+            index = counts.get(name, 0)
+            counts[name] = index + 1
+            children.append(self._entry(child, f"{path}/{name}[{index}]"))
+        return {
+            "path": path,
+            "class": artist.__class__.__name__,
+            "label": str(artist.get_label() or ""),
+            "calls": draw_time.calls if draw_time is not None else 0,
+            "self_ms": self.self_time(artist) * 1000,
+            "total_ms": self.total_time(artist) * 1000,
+            "children": children,
+        }
+
+
+def _descendants(artist):
+    """
+    Yields an artist and all of its descendants, depth first.
+    """
+    yield artist
+    for child in artist.get_children():
+        yield from _descendants(child)
@@ -0,0 +1,44 @@
+from FigureForge.rendering.draw_override import DrawOverride
+
+
+class ExportProgress(DrawOverride):
+    """
+    Follows the progress of an export by counting the artists of the figure as
+    they are drawn.
+
+    savefig offers no progress reports of its own, so every artist of the figure
+    reports the number of artists drawn so far and the total through a callback
+    before it draws. The callback may raise an exception to cancel the export.
+
+    Attributes:
+        done (int): The number of artists drawn so far.
+        total (int): The number of artists of the figure.
+    """
+
+    def __init__(self, progress) -> None:
+        """
+        Initializes a new instance of the ExportProgress class.
+
+        Args:
+            progress (callable): Called with `done` and `total` before every draw.
+        """
+        super().__init__()
+        self.done = 0
+        self.total = 0
+        self._progress = progress
+
+    def _select(self, figure):
+        artists = []
+        stack = list(figure.get_children())
+        while stack:
+            artist = stack.pop()
+            artists.append(artist)
+            stack.extend(artist.get_children())
+        self.total = len(artists)
+        return artists
+
+    def _draw(self, artist, renderer) -> None:
+        # Layouts such as bbox_inches="tight" draw the figure more than once
+        self._progress(min(self.done, self.total), self.total)
+        type(artist).draw(artist, renderer)
+        self.done += 1
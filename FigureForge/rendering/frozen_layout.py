@@ -0,0 +1,160 @@
+import threading
+from contextlib import contextmanager
+
+
+class FrozenLayout:
+    """
+    Reuses the Axes positions computed by a figure's layout engine across draws,
+    instead of running the engine on every draw.
+
+    Inside `apply`, the layout engine only runs when the layout has been marked
+    stale, when the size or dpi of the figure has changed, or when the Axes have
+    been moved since the last run (for example by an export that ran the layout at
+    another resolution). Otherwise the Axes keep their current positions.
+
+    Attributes:
+        stale (bool): Whether the layout must be recomputed on the next draw.
+        per_dpi (bool): Whether the layout is recomputed when only the dpi has
+            changed. The layout hardly depends on the dpi, so exports at several
+            resolutions can share it.
+    """
+
+    def __init__(self, per_dpi=True) -> None:
+        """
+        Initializes a new instance of the FrozenLayout class.
+
+        Args:
+            per_dpi (bool): Whether to recompute the layout when the dpi changes.
+        """
+        self.stale = True
+        self.per_dpi = per_dpi
+        self._key = None
+        self._positions = None
+        self._engine = None
+        self._depth = 0
+        self._lock = threading.RLock()
+
+    def invalidate(self) -> None:
+        """
+        Marks the layout as stale, so that the next draw recomputes it.
+        """
+        self.stale = True
+
+    @contextmanager
+    def apply(self, figure):
+        """
+        A context in which the figure's layout engine only runs when needed.
+        Contexts may be nested.
+
+        Args:
+            figure (Figure): The figure being rendered.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._install(figure)
+            self._depth += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._uninstall()
+
+    def _install(self, figure) -> None:
+        engine = figure.get_layout_engine()
+        if engine is None or "execute" in engine.__dict__:
+            return
+        engine.execute = lambda fig, engine=engine: self._execute(engine, fig)
+        self._engine = engine
+
+    def _uninstall(self) -> None:
+        if self._engine is not None:
+            self._engine.__dict__.pop("execute", None)
+            self._engine = None
+
+    def _execute(self, engine, figure) -> None:
+        """
+        Runs the layout engine if the layout may have changed since it last ran.
+        """
+        key = (
+            tuple(figure.get_size_inches()),
+            figure.dpi if self.per_dpi else None,
+            id(engine),
+            len(figure.axes),
+        )
+        if self.stale or key != self._key or self._positions != _positions(figure):
+            type(engine).execute(engine, figure)
+            self.stale = False
+            self._key = key
+            self._positions = _positions(figure)
+
+
+def _positions(figure) -> list:
+    return [tuple(ax.get_position(original=False).bounds) for ax in figure.axes]
+
+
+def layout_state(figure) -> tuple:
+    """
+    Returns what the layout of a figure depends on, short of rendering it: the
+    size, dpi and layout engine of the figure, its titles, subfigures and legends,
+    and the Axes with their positions, titles, axis labels, ticks, view limits,
+    scales and legends. Changes that leave it alone, such as to the data or colors
+    of artists, do not need the layout to be recomputed.
+
+    Args:
+        figure (Figure): The figure.
+
+    Returns:
+        A tuple that compares equal for figures laid out alike.
+    """
+    state = [
+        tuple(figure.get_size_inches()),
+        figure.dpi,
+        id(figure.get_layout_engine()),
+        len(figure.subfigs),
+        tuple(map(id, figure.legends)),
+    ]
+    for text in (figure._suptitle, figure._supxlabel, figure._supylabel):
+        state.append(_text_state(text))
+    for ax in figure.axes:
+        state.append(
+            (
+                id(ax),
+                ax.get_visible(),
+                ax.get_position(original=True).bounds,
+                ax.get_aspect(),
+                ax.viewLim.bounds,
+                id(ax.legend_),
+                _text_state(ax.title),
+                _text_state(ax._left_title),
+                _text_state(ax._right_title),
+            )
+        )
+        for axis in ax._axis_map.values():
+            state.append(
+                (
+                    axis.get_visible(),
+                    axis.get_scale(),
+                    _text_state(axis.label),
+                    id(axis.major.locator),
+                    id(axis.major.formatter),
+                    id(axis.minor.locator),
+                    id(axis.minor.formatter),
+                    repr(axis._major_tick_kw),
+                    repr(axis._minor_tick_kw),
+                )
+            )
+    return tuple(state)
+
+
+def _text_state(text) -> tuple:
+    if text is None:
+        return None
+    return (
+        text.get_visible(),
+        text.get_text(),
+        text.get_fontsize(),
+        text.get_rotation(),
+        text.get_position(),
+    )
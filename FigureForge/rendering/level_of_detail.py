@@ -0,0 +1,219 @@
+import copy
+import weakref
+
+import numpy as np
+from matplotlib.colors import to_rgba
+
+from FigureForge.rendering.draw_override import DrawOverride
+
+# Line2D attributes that describe the (decimated) data rather than the style
+DATA_ATTRIBUTES = {
+    "_xorig",
+    "_yorig",
+    "_x",
+    "_y",
+    "_xy",
+    "_x_filled",
+    "_path",
+    "_transformed_path",
+    "_invalidx",
+    "_invalidy",
+    "_subslice",
+    "ind_offset",
+    "stale_callback",
+    "_stale",
+    "draw",
+}
+
+# The number of bins each pixel column is decimated in. A pixel column crossed by
+# very many points is covered across its whole width, which only four points per
+# column draw too thinly.
+SUBCOLUMNS = 8
+
+
+class LevelOfDetail(DrawOverride):
+    """
+    Draws Line2D artists with very many points from a decimated copy of their data
+    in preview renders.
+
+    For every eighth of a pixel column of the Axes, only the first, lowest, highest
+    and last point are kept, which draws nearly the same pixels as the full data
+    while the cost of a draw depends on the width of the Axes rather than on the
+    number of points. Only the antialiased edges of densely filled columns differ
+    slightly. The decimated data is computed once per line and view, and reused
+    until the data, the view limits or the size of the Axes change.
+
+    Lines with markers, non-default draw or line styles, NaNs or unsorted x data
+    are always drawn in full, as are translucent lines and lines with path effects
+    or sketch parameters, where the overlap of the dropped segments shows.
+
+    Decimation only applies inside `apply`, so exports and saved files always use
+    the full data.
+
+    Attributes:
+        threshold (int): The number of points above which a line is decimated.
+    """
+
+    def __init__(self, threshold=100_000) -> None:
+        """
+        Initializes a new instance of the LevelOfDetail class.
+
+        Args:
+            threshold (int): The number of points above which a line is decimated.
+        """
+        super().__init__()
+        self.threshold = threshold
+        self._cache = weakref.WeakKeyDictionary()
+        self._eligible = weakref.WeakKeyDictionary()
+
+    def _select(self, figure):
+        return [
+            line
+            for ax in figure.axes
+            for line in ax.get_lines()
+            if self._is_eligible(line)
+        ]
+
+    def _is_eligible(self, line) -> bool:
+        """
+        Returns whether a line can be drawn from decimated data.
+        """
+        x, y = line.get_xdata(orig=True), line.get_ydata(orig=True)
+        if np.size(x) < self.threshold or np.shape(x) != np.shape(y):
+            return False
+        if line.get_marker() not in ("None", "", " ", None):
+            return False
+        if line.get_drawstyle() != "default" or line.get_markevery() is not None:
+            return False
+        if line.get_linestyle() not in ("-", "solid"):
+            return False
+        if line.get_transform() != line.axes.transData:
+            return False
+        alpha = line.get_alpha()
+        if (alpha is not None and alpha < 1) or to_rgba(line.get_color())[3] < 1:
+            return False
+        if line.get_path_effects() or line.get_sketch_params() is not None:
+            return False
+
+        # Sortedness and NaNs are checked once per data array
+        key = (id(x), id(y))
+        cached = self._eligible.get(line)
+        if cached is None or cached[0] != key:
+            try:
+                x = np.asarray(x, dtype=float)
+                y = np.asarray(y, dtype=float)
+            except (TypeError, ValueError):
+                eligible = False
+            else:
+                eligible = bool(
+                    x.ndim == 1
+                    and np.isfinite(x).all()
+                    and np.isfinite(y).all()
+                    and (x[1:] >= x[:-1]).all()
+                )
+            cached = (key, eligible)
+            self._eligible[line] = cached
+        return cached[1]
+
+    def _draw(self, line, renderer) -> None:
+        """
+        Draws a line from its decimated data, styled like the line itself.
+        """
+        proxy = self._get_proxy(line)
+        for name, value in list(line.__dict__.items()):
+            if name not in DATA_ATTRIBUTES:
+                proxy.__dict__[name] = value
+        proxy.draw(renderer)
+
+    def _get_proxy(self, line):
+        """
+        Returns a copy of the line holding its decimated data for the current view,
+        computing the decimation if it is not cached.
+        """
+        ax = line.axes
+        x, y = line.get_xdata(orig=True), line.get_ydata(orig=True)
+        key = (
+            id(x),
+            id(y),
+            tuple(ax.viewLim.bounds),
+            tuple(ax.bbox.bounds),
+            ax.get_xscale(),
+            ax.get_yscale(),
+        )
+        cached = self._cache.get(line)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+        xd, yd = decimate(np.asarray(x, dtype=float), np.asarray(y, dtype=float), ax)
+        proxy = copy.copy(line)
+        proxy.__dict__.pop("draw", None)
+        proxy.stale_callback = None
+        proxy.set_data(xd, yd)
+        self._cache[line] = (key, proxy)
+        return proxy
+
+
+def decimate(x, y, ax):
+    """
+    Reduces sorted line data to the first, lowest, highest and last point of every
+    SUBCOLUMNS-th of a pixel column of an Axes, plus the nearest point on either
+    side of the view.
+
+    Args:
+        x (np.ndarray): The sorted x data.
+        y (np.ndarray): The y data.
+        ax (Axes): The Axes the line is drawn in.
+
+    Returns:
+        The decimated x and y data.
+    """
+    bbox = ax.bbox
+    columns = max(int(np.ceil(bbox.width)), 1) * SUBCOLUMNS
+    edges = bbox.x0 + np.arange(columns + 1, dtype=float) / SUBCOLUMNS
+    points = np.column_stack([edges, np.full_like(edges, bbox.y0)])
+    data_edges = ax.transData.inverted().transform(points)[:, 0]
+    if data_edges[0] > data_edges[-1]:
+        # Inverted x axis
+        data_edges = data_edges[::-1]
+
+    bounds = np.searchsorted(x, data_edges)
+    first, last = bounds[0], bounds[-1]
+    starts = np.unique(bounds[:-1])
+    starts = starts[starts < last]
+
+    x_parts = [x[max(first - 1, 0) : first]]
+    y_parts = [y[max(first - 1, 0) : first]]
+    if starts.size:
+        ends = np.append(starts[1:], last)
+        view = slice(starts[0], last)
+        offsets = starts - starts[0]
+        counts = ends - starts
+        lows = np.minimum.reduceat(y[view], offsets)
+        highs = np.maximum.reduceat(y[view], offsets)
+        low_index = _first_match(y[view] == np.repeat(lows, counts), offsets)
+        high_index = _first_match(y[view] == np.repeat(highs, counts), offsets)
+
+        # Keep the extremes in the order they occur, so the decimated line does not
+        # double back on itself within a column
+        indices = np.column_stack(
+            [
+                offsets,
+                np.minimum(low_index, high_index),
+                np.maximum(low_index, high_index),
+                ends - 1 - starts[0],
+            ]
+        ).ravel()
+        x_parts.append(x[view][indices])
+        y_parts.append(y[view][indices])
+    x_parts.append(x[last : last + 1])
+    y_parts.append(y[last : last + 1])
+    return np.concatenate(x_parts), np.concatenate(y_parts)
+
+
+def _first_match(mask, offsets) -> np.ndarray:
+    """
+    Returns the index of the first True value of `mask` in each of the runs that
+    start at `offsets`. Every run must contain a True value.
+    """
+    matches = np.flatnonzero(mask)
+    return matches[np.searchsorted(matches, offsets)]
@@ -0,0 +1,30 @@
+from contextlib import nullcontext
+
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+
+
+class PreviewCanvas(FigureCanvas):
+    """
+    The canvas of the editor. Every draw of the canvas, including the draws Qt
+    triggers on resize, runs inside the preview context of its FigureManager, which
+    may substitute cheaper stand-ins for expensive artists. Saving and exporting
+    draw through FigureCanvasAgg directly and are not affected.
+
+    Attributes:
+        preview (callable): Returns the context manager to draw in.
+    """
+
+    def __init__(self, figure, preview=nullcontext) -> None:
+        """
+        Initializes a new instance of the PreviewCanvas class.
+
+        Args:
+            figure (Figure): The figure to display.
+            preview (callable): Returns the context manager to draw in.
+        """
+        super().__init__(figure)
+        self.preview = preview
+
+    def draw(self) -> None:
+        with self.preview():
+            super().draw()
@@ -0,0 +1,74 @@
+from PySide6.QtCore import QObject, QTimer
+
+
+class RedrawScheduler(QObject):
+    """
+    Coalesces bursts of redraw requests into a single deferred render.
+
+    Every call to `request` restarts a short single-shot timer, so a burst of
+    edits (e.g. typing into the Property Inspector) results in one render once the
+    burst has been quiet for `interval` milliseconds. A second timer, which is not
+    restarted, guarantees that a sustained burst still renders at least every
+    `max_delay` milliseconds. Whatever happens, the last request is always followed
+    by a render; `flush` performs a pending render immediately.
+
+    Attributes:
+        callback (callable): Called with no arguments to perform the render.
+        interval (int): The coalescing window in milliseconds.
+        max_delay (int): The longest a pending render may be postponed, in ms.
+    """
+
+    def __init__(self, callback, interval=50, max_delay=250, parent=None) -> None:
+        """
+        Initializes a new instance of the RedrawScheduler class.
+
+        Args:
+            callback (callable): The function that performs the render.
+            interval (int): The coalescing window in milliseconds.
+            max_delay (int): The longest a pending render may be postponed, in ms.
+            parent (QObject): The parent object.
+        """
+        super().__init__(parent)
+        self.callback = callback
+        self.interval = interval
+        self.max_delay = max_delay
+
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.timeout.connect(self._render)
+
+        self.deadline_timer = QTimer(self)
+        self.deadline_timer.setSingleShot(True)
+        self.deadline_timer.timeout.connect(self._render)
+
+    @property
+    def pending(self) -> bool:
+        """Whether a render has been requested but not yet performed."""
+        return self.debounce_timer.isActive() or self.deadline_timer.isActive()
+
+    def request(self) -> None:
+        """
+        Requests a render. The render is deferred until the coalescing window has
+        passed without further requests, or until `max_delay` has elapsed.
+        """
+        if not self.deadline_timer.isActive():
+            self.deadline_timer.start(max(self.max_delay, self.interval))
+        self.debounce_timer.start(self.interval)
+
+    def flush(self) -> None:
+        """
+        Performs the pending render immediately, if there is one.
+        """
+        if self.pending:
+            self._render()
+
+    def cancel(self) -> None:
+        """
+        Discards the pending render, if there is one.
+        """
+        self.debounce_timer.stop()
+        self.deadline_timer.stop()
+
+    def _render(self) -> None:
+        self.cancel()
+        self.callback()
@@ -0,0 +1,180 @@
+import threading
+
+import numpy as np
+from PySide6.QtCore import QObject, Signal, Qt
+from matplotlib.backends.backend_agg import RendererAgg
+
+
+# Renderer methods that check for cancellation before drawing
+CANCELLABLE_METHODS = (
+    "draw_path",
+    "draw_markers",
+    "draw_path_collection",
+    "draw_image",
+    "draw_text",
+    "draw_gouraud_triangles",
+    "draw_quad_mesh",
+)
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render that has been superseded by a newer one."""
+
+
+def make_cancellable(renderer, cancelled) -> None:
+    """
+    Makes a renderer raise RenderCancelled from its next drawing primitive once an
+    event is set, so that a render can be abandoned part way through.
+
+    Args:
+        renderer (RendererAgg): The renderer to make cancellable.
+        cancelled (threading.Event): The event that cancels the render.
+    """
+    for name in CANCELLABLE_METHODS:
+        method = getattr(renderer, name)
+
+        def checked(*args, _method=method, **kwargs):
+            if cancelled.is_set():
+                raise RenderCancelled()
+            return _method(*args, **kwargs)
+
+        setattr(renderer, name, checked)
+
+
+def render_figure(figure, width, height, dpi, cancelled=None) -> np.ndarray:
+    """
+    Renders a figure into a new Agg buffer.
+
+    Args:
+        figure (Figure): The figure to render.
+        width (int): The width of the buffer in pixels.
+        height (int): The height of the buffer in pixels.
+        dpi (float): The resolution to render at.
+        cancelled (threading.Event): An event that cancels the render, if given.
+
+    Returns:
+        The rendered RGBA buffer.
+    """
+    renderer = RendererAgg(width, height, dpi)
+    if cancelled is not None:
+        make_cancellable(renderer, cancelled)
+    figure.draw(renderer)
+    return np.asarray(renderer.buffer_rgba()).copy()
+
+
+def render_scaled(figure, width, height, dpi, scale) -> np.ndarray:
+    """
+    Renders a figure at a fraction of its resolution, then scales the result up to
+    the full size.
+
+    The figure's dpi is changed for the duration of the render, so this must run on
+    the GUI thread and nothing else may draw the figure at the same time.
+
+    Args:
+        figure (Figure): The figure to render.
+        width (int): The full width of the buffer in pixels.
+        height (int): The full height of the buffer in pixels.
+        dpi (float): The full resolution.
+        scale (float): The fraction of the full resolution to render at.
+
+    Returns:
+        The rendered RGBA buffer, at the full size.
+    """
+    original_dpi = figure.dpi
+    figure.set_dpi(dpi * scale)
+    try:
+        buffer = render_figure(
+            figure,
+            max(round(width * scale), 1),
+            max(round(height * scale), 1),
+            dpi * scale,
+        )
+    finally:
+        figure.set_dpi(original_dpi)
+    rows = np.arange(height) * buffer.shape[0] // height
+    columns = np.arange(width) * buffer.shape[1] // width
+    return buffer[rows[:, None], columns]
+
+
+class RenderWorker(QObject):
+    """
+    Runs renders on a background thread so that the GUI stays responsive while
+    large figures render.
+
+    Renders run one at a time, in the order they were submitted. Submitting a render
+    cancels the previous one, and only the result of the most recent render is
+    delivered through the `rendered` signal, on the GUI thread.
+
+    Signals:
+        rendered: Emitted with the job ID and RGBA buffer of a finished render.
+        failed: Emitted with the job ID and error message of a failed render.
+    """
+
+    rendered = Signal(int, object)
+    failed = Signal(int, str)
+    _finished = Signal(int, object, str)
+
+    def __init__(self, parent=None) -> None:
+        """
+        Initializes a new instance of the RenderWorker class.
+        """
+        super().__init__(parent)
+        self.job_id = 0
+        self.active = 0
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._finished.connect(self._on_finished, Qt.QueuedConnection)
+
+    @property
+    def busy(self) -> bool:
+        """Whether a submitted render has not been delivered yet."""
+        return self.active > 0
+
+    def submit(self, render) -> int:
+        """
+        Cancels the current render and starts a new one.
+
+        Args:
+            render (callable): Called on the worker thread with a threading.Event
+                that is set when the render is cancelled. Returns the RGBA buffer.
+
+        Returns:
+            The ID of the new job.
+        """
+        self.cancel()
+        self.job_id += 1
+        self.active += 1
+        self._cancelled = threading.Event()
+        thread = threading.Thread(
+            target=self._run, args=(self.job_id, render, self._cancelled), daemon=True
+        )
+        thread.start()
+        return self.job_id
+
+    def cancel(self) -> None:
+        """
+        Cancels the current render, if there is one.
+        """
+        self._cancelled.set()
+
+    def _run(self, job_id, render, cancelled) -> None:
+        result = None
+        error = ""
+        with self._lock:
+            if not cancelled.is_set():
+                try:
+                    result = render(cancelled)
+                except RenderCancelled:
+                    pass
+                except Exception as e:
+                    error = str(e) or e.__class__.__name__
+        self._finished.emit(job_id, result, error)
+
+    def _on_finished(self, job_id, result, error) -> None:
+        self.active -= 1
+        if job_id != self.job_id:
+            return
+        if error:
+            self.failed.emit(job_id, error)
+        elif result is not None:
+            self.rendered.emit(job_id, result)
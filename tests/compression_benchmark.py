@@ -0,0 +1,82 @@
+"""
+Compares the size of figure files and the time taken to save and open them with each
+compression codec, for a few typical figures.
+
+Run with `python tests/compression_benchmark.py`.
+"""
+
+import os
+import time
+import tempfile
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+from FigureForge import figure_io
+
+CODECS = [None] + list(figure_io.COMPRESSIONS)
+
+
+def measurement_figure():
+    """A long noisy time series, as recorded by an instrument."""
+    rng = np.random.default_rng(0)
+    fig, ax = plt.subplots()
+    t = np.linspace(0, 100, 500_000)
+    ax.plot(t, np.sin(t) + rng.normal(0, 0.1, t.size))
+    ax.set_xlabel("Time (s)")
+    return fig
+
+
+def simulation_figure():
+    """Smooth model curves, which compress well."""
+    fig, axs = plt.subplots(2, 2)
+    x = np.linspace(0, 10, 100_000)
+    for i, ax in enumerate(axs.flat):
+        for k in range(4):
+            ax.plot(x, np.exp(-x / (k + 1)) * np.cos((i + 1) * x))
+    return fig
+
+
+def image_figure():
+    """A quantized image with a colorbar."""
+    rng = np.random.default_rng(1)
+    fig, ax = plt.subplots()
+    image = np.round(rng.random((1000, 1000)).cumsum(axis=0) / 10)
+    fig.colorbar(ax.imshow(image))
+    return fig
+
+
+def benchmark(figure, directory):
+    print(
+        f"{'codec':>6} {'size (MB)':>10} {'ratio':>6} {'save (s)':>9} {'open (s)':>9}"
+    )
+    base_size = None
+    for codec in CODECS:
+        file_name = os.path.join(directory, f"{codec}.ffig")
+        start = time.perf_counter()
+        figure_io.save_figure(figure, file_name, compression=codec)
+        save_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        plt.close(figure_io.load_figure(file_name))
+        load_time = time.perf_counter() - start
+
+        size = os.path.getsize(file_name)
+        base_size = base_size or size
+        print(
+            f"{codec or 'none':>6} {size / 1e6:>10.1f} {base_size / size:>6.2f} "
+            f"{save_time:>9.2f} {load_time:>9.2f}"
+        )
+        os.remove(file_name)
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for make_figure in [measurement_figure, simulation_figure, image_figure]:
+            print(f"\n{make_figure.__name__}: {make_figure.__doc__}")
+            figure = make_figure()
+            benchmark(figure, directory)
+            plt.close(figure)
@@ -0,0 +1,28 @@
+"""
+Tests of exporting figure files from the command line.
+
+    python -m pytest tests/test_batch_export.py
+"""
+
+import os
+
+from FigureForge.batch_export import output_names
+
+
+def test_files_of_the_same_name_are_told_apart():
+    files = [
+        os.path.join("a", "fig.ffig"),
+        os.path.join("b", "fig.ffig"),
+        os.path.join("b", "other.ffig"),
+    ]
+    assert output_names(files) == {file: "fig" for file in files[:2]} | {
+        files[2]: "other"
+    }
+    assert output_names(files, "out") == {
+        files[0]: "a-fig",
+        files[1]: "b-fig",
+        files[2]: "other",
+    }
+    # Named by their extension too when their paths only differ by it
+    files = [os.path.join("a", "fig.ffig"), os.path.join("a", "fig.pkl")]
+    assert output_names(files) == {files[0]: "fig-ffig", files[1]: "fig-pkl"}
@@ -0,0 +1,102 @@
+"""
+Tests of reading and writing figure files.
+
+    python -m pytest tests/test_figure_io.py
+"""
+
+import io
+import os
+
+import numpy as np
+import pytest
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from FigureForge import figure_io
+
+
+def data_figure(y):
+    figure = Figure()
+    figure.add_subplot().plot(np.arange(y.size), y)
+    return figure
+
+
+def test_overwriting_a_mapped_file(tmp_path):
+    file_name = str(tmp_path / "figure.ffig")
+    old = np.linspace(0, 1, 100_000)
+    figure_io.save_figure(data_figure(old), file_name)
+    mapped = figure_io.load_figure(file_name, memory_map=True)
+    new = old[::-1].copy()
+
+    if not figure_io.CAN_REPLACE_MAPPED:
+        with pytest.raises(PermissionError):
+            figure_io.save_figure(data_figure(new), file_name)
+        # The file is left as it was, without the temporary file
+        assert os.listdir(tmp_path) == ["figure.ffig"]
+        return
+
+    figure_io.save_figure(data_figure(new), file_name)
+    assert os.listdir(tmp_path) == ["figure.ffig"]
+    # The mapped figure still views the file it was read from
+    assert np.array_equal(mapped.axes[0].lines[0].get_ydata(), old)
+    reloaded = figure_io.load_figure(file_name, memory_map=True)
+    assert np.array_equal(reloaded.axes[0].lines[0].get_ydata(), new)
+    # Saving the mapped figure itself over its own file
+    figure_io.save_figure(mapped, file_name)
+    reloaded = figure_io.load_figure(file_name)
+    assert np.array_equal(reloaded.axes[0].lines[0].get_ydata(), old)
+
+
+def laid_out_figure(layout):
+    figure = Figure(layout=layout)
+    line_axes, image_axes = figure.subplots(1, 2)
+    line_axes.plot(np.linspace(0, 1e6, 1000), label="line")
+    line_axes.scatter([1e5, 2e5], [3e5, 4e5], c=[0, 1], label="points")
+    line_axes.set_xlabel("x")
+    line_axes.legend()
+    line_axes.annotate(
+        "peak",
+        xy=(500, 5e5),
+        xytext=(100, 9e5),
+        arrowprops=dict(arrowstyle="->", connectionstyle="arc3,rad=0.5"),
+    )
+    line_axes.annotate(
+        "end",
+        xy=(999, 1e6),
+        xytext=(0.5, 0.2),
+        textcoords="axes fraction",
+        arrowprops=dict(facecolor="black", shrink=0.05),
+        bbox=dict(boxstyle="round"),
+    )
+    line_axes.inset_axes([0.6, 0.6, 0.3, 0.3]).plot([1, 2])
+    image = image_axes.imshow(np.arange(100.0).reshape(10, 10))
+    image_axes.set_title("image")
+    figure.colorbar(image)
+    return figure
+
+
+@pytest.mark.parametrize("layout", ["constrained", "tight", None])
+def test_digest_is_stable(layout):
+    figure = laid_out_figure(layout)
+    canvas = FigureCanvasAgg(figure)
+    digest = figure_io.digest(figure)
+
+    canvas.draw()
+    assert figure_io.digest(figure) == digest
+    canvas.draw()
+    assert figure_io.digest(figure) == digest
+    assert figure_io.digest(figure_io.restore(figure_io.snapshot(figure))) == digest
+    figure.savefig(io.BytesIO(), dpi=300)
+    assert figure_io.digest(figure) == digest
+    figure.set_size_inches(8, 3)
+    canvas.draw()
+    figure.set_size_inches(6.4, 4.8)
+    canvas.draw()
+    assert figure_io.digest(figure) == digest
+
+    figure.axes[0].set_title("edited")
+    assert figure_io.digest(figure) != digest
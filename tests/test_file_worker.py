@@ -0,0 +1,73 @@
+"""
+Tests of opening figure files on a file worker, as the GUI does.
+
+    python -m pytest tests/test_file_worker.py
+"""
+
+import os
+import pickle
+import threading
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("QtAgg")
+
+import matplotlib.pyplot as plt
+from PySide6.QtWidgets import QApplication
+
+from FigureForge import figure_io
+from FigureForge.file_worker import FileWorker
+from FigureForge.figure_manager import read_figure
+
+
+def open_on_worker(file_name):
+    app = QApplication.instance() or QApplication([])
+    worker = FileWorker()
+    threads = []
+
+    def task(progress):
+        threads.append(threading.current_thread())
+        return read_figure(file_name, progress=progress)
+
+    worker.start(task)
+    assert worker.wait(30)
+    app.processEvents()
+    assert worker.error is None
+    assert threads[0] is not threading.main_thread()
+    return worker.result
+
+
+def test_pyplot_figure_is_not_registered_with_pyplot(tmp_path):
+    app = QApplication.instance() or QApplication([])
+    figure = plt.figure()
+    plt.plot(np.arange(10))
+    file_name = str(tmp_path / "pyplot.pkl")
+    with open(file_name, "wb") as f:
+        pickle.dump(figure, f)
+    plt.close(figure)
+    windows = set(app.topLevelWidgets())
+
+    for _ in range(3):
+        opened = open_on_worker(file_name)
+        assert type(opened) is type(figure)
+        assert len(opened.axes[0].lines) == 1
+
+    # No pyplot manager, and so no window on the worker thread, was created
+    assert plt.get_fignums() == []
+    assert set(app.topLevelWidgets()) == windows
+
+
+def test_pyplot_figure_in_container_is_not_registered(tmp_path):
+    figure = plt.figure()
+    plt.plot(np.arange(10_000))
+    # Saved while pyplot manages it, so its state asks to be restored to pyplot
+    file_name = str(tmp_path / "pyplot.ffig")
+    figure_io.save_figure(figure, file_name)
+    plt.close(figure)
+
+    opened = open_on_worker(file_name)
+    assert len(opened.axes[0].lines[0].get_xdata()) == 10_000
+    assert plt.get_fignums() == []
@@ -0,0 +1,74 @@
+"""
+Compares preview renders of long lines drawn from decimated data with renders of
+the full data.
+
+    python -m pytest tests/test_level_of_detail.py
+"""
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import matplotlib.patheffects as path_effects
+
+from FigureForge.rendering.level_of_detail import LevelOfDetail
+
+# The most a decimated render may differ from the full render: the share of the
+# pixels of the Axes that differ by more than TOLERANCE levels in any channel
+TOLERANCE = 64
+MAX_DIFFERING = 0.005
+
+
+def render(figure, level_of_detail=None) -> np.ndarray:
+    canvas = FigureCanvasAgg(figure)
+    if level_of_detail is None:
+        canvas.draw()
+    else:
+        with level_of_detail.apply(figure):
+            canvas.draw()
+    return np.asarray(canvas.buffer_rgba()).astype(int)
+
+
+def line_figure(y, **kwargs):
+    figure = Figure(figsize=(6.4, 4.8), dpi=100)
+    ax = figure.add_subplot()
+    ax.plot(np.linspace(0, 100, y.size), y, **kwargs)
+    return figure
+
+
+def differing(figure, level_of_detail) -> float:
+    difference = np.abs(render(figure) - render(figure, level_of_detail)).max(-1)
+    ax = figure.axes[0]
+    return np.count_nonzero(difference > TOLERANCE) / (ax.bbox.width * ax.bbox.height)
+
+
+def test_decimated_render_matches_full_render():
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 100, 1_000_000)
+    for y in (
+        np.sin(x),
+        np.sin(x) + rng.standard_normal(x.size) * 0.1,
+        np.cumsum(rng.standard_normal(x.size)),
+    ):
+        figure = line_figure(y, linewidth=2)
+        level_of_detail = LevelOfDetail()
+        assert len(level_of_detail._select(figure)) == 1
+        assert differing(figure, level_of_detail) < MAX_DIFFERING
+
+
+def test_translucent_and_styled_lines_are_drawn_in_full():
+    rng = np.random.default_rng(0)
+    y = rng.standard_normal(1_000_000)
+    for kwargs in (
+        {"alpha": 0.5},
+        {"color": (0, 0, 1, 0.5)},
+        {"linestyle": "--"},
+        {"path_effects": [path_effects.withStroke(linewidth=4, foreground="w")]},
+    ):
+        figure = line_figure(y, **kwargs)
+        level_of_detail = LevelOfDetail()
+        assert level_of_detail._select(figure) == []
+        assert (render(figure) == render(figure, level_of_detail)).all()